@@ -12,11 +12,14 @@ if not os.environ.get("VERCEL"):
 from flask import Flask
 from werkzeug.middleware.proxy_fix import ProxyFix
 from flask_cors import CORS
-from flask_session import Session
 from flask_migrate import Migrate
 from dotenv import load_dotenv
 from .extensions import db
-from .socketio_instance import socketio
+from .socketio_instance import socketio, message_queue_options
+from .broadcast import broadcaster
+from .write_behind import message_writer
+from .search import ensure_search_index
+from .sessions import init_sessions
 from .urls import setup_routes
 
 load_dotenv()
@@ -70,9 +73,7 @@ def create_app():
             "pool_pre_ping": True,
         }
 
-    # Session config (use SQLAlchemy backed by Supabase Postgres)
-    app.config["SESSION_TYPE"] = "sqlalchemy"
-    app.config["SESSION_SQLALCHEMY"] = db
+    # Session config; storage is picked by SESSION_BACKEND in init_sessions (default: SQLAlchemy)
     app.config["SESSION_PERMANENT"] = True
     app.config["PERMANENT_SESSION_LIFETIME"] = 3600
     app.config["SESSION_USE_SIGNER"] = True
@@ -87,17 +88,34 @@ def create_app():
 
     db.init_app(app)
     Migrate(app, db)
-    Session(app)
+    init_sessions(app)
 
     # Auto-create tables (tolerate transient pool errors on cold start)
     with app.app_context():
         try:
             db.create_all()
+            ensure_search_index()
         except Exception as e:
             app.logger.warning("db.create_all() skipped: %s", e)
 
-    # Socket.IO: init for both local and Vercel (HTTP-triggered emits still work)
-    socketio.init_app(app, cors_allowed_origins="*", async_mode="eventlet" if not os.environ.get("VERCEL") else "threading")
+    # Socket.IO: init for both local and Vercel (HTTP-triggered emits still work).
+    # With SOCKETIO_MESSAGE_QUEUE set, emits fan out through Redis so rooms work across workers.
+    socketio.init_app(
+        app,
+        cors_allowed_origins="*",
+        async_mode="eventlet" if not os.environ.get("VERCEL") else "threading",
+        **message_queue_options(),
+    )
+
+    # Optional coalescing of chat broadcasts: BROADCAST_FLUSH_INTERVAL_MS=0 sends each message
+    # immediately; >0 batches a room's messages into one `group_messages` frame per window.
+    broadcaster.configure(
+        flush_interval=int(os.getenv("BROADCAST_FLUSH_INTERVAL_MS", "0")) / 1000.0,
+        max_batch=int(os.getenv("BROADCAST_MAX_BATCH", "50")),
+    )
+
+    # Optional write-behind batching of Socket.IO chat inserts (CHAT_WRITE_BEHIND=1)
+    message_writer.init_app(app)
 
     # Register routes
     setup_routes(app)
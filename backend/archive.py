@@ -0,0 +1,96 @@
+# archive.py
+#
+# Moves cold chat history from `messages` into `messages_archive` in chunked batches,
+# so the hot table and its indexes stay small. get_messages pages into the archive
+# transparently once a client scrolls past the hot range.
+from datetime import datetime, timedelta
+
+from .extensions import db
+from .models import Message, MessageArchive
+
+ARCHIVE_COLUMNS = ("id", "group_id", "user_id", "content", "created_at")
+
+
+def archive_boundary(cutoff):
+    """Lowest message id that must stay hot: the first message created at/after cutoff.
+
+    Archiving only ids below it keeps the archive a strict prefix of the id space even
+    when created_at and id disagree (e.g. backdated seed data).
+    """
+    first_recent = db.session.query(db.func.min(Message.id)).filter(Message.created_at >= cutoff).scalar()
+    if first_recent is not None:
+        return first_recent
+    newest = db.session.query(db.func.max(Message.id)).scalar()
+    return (newest or 0) + 1
+
+
+def archive_messages(older_than_days, batch_size=1000, max_batches=None):
+    """Archive messages older than `older_than_days`; returns the number of rows moved.
+
+    Each batch is its own transaction, so the job can be interrupted and resumed.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    boundary = archive_boundary(cutoff)
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        ids = [
+            row.id
+            for row in db.session.query(Message.id)
+            .filter(Message.id < boundary)
+            .order_by(Message.id.asc())
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+
+        columns = [getattr(Message, name) for name in ARCHIVE_COLUMNS]
+        db.session.execute(
+            db.insert(MessageArchive).from_select(
+                list(ARCHIVE_COLUMNS), db.select(*columns).where(Message.id.in_(ids))
+            )
+        )
+        # Archived rows keep their ids, so their search index entries stay valid.
+        Message.query.filter(Message.id.in_(ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+        moved += len(ids)
+        batches += 1
+    return moved
+
+
+def messages_before(group_id, before_id, limit):
+    """Up to `limit` messages older than before_id (None = newest), newest first,
+    continuing into the archive when the hot table runs out."""
+    query = Message.query.filter(Message.group_id == group_id)
+    if before_id is not None:
+        query = query.filter(Message.id < before_id)
+    rows = query.order_by(Message.id.desc()).limit(limit).all()
+    if len(rows) < limit:
+        lower = rows[-1].id if rows else before_id
+        archived = MessageArchive.query.filter(MessageArchive.group_id == group_id)
+        if lower is not None:
+            archived = archived.filter(MessageArchive.id < lower)
+        rows += archived.order_by(MessageArchive.id.desc()).limit(limit - len(rows)).all()
+    return rows
+
+
+def messages_after(group_id, after_id, limit):
+    """Up to `limit` messages newer than after_id, oldest first, starting in the archive."""
+    rows = (
+        MessageArchive.query
+        .filter(MessageArchive.group_id == group_id, MessageArchive.id > after_id)
+        .order_by(MessageArchive.id.asc())
+        .limit(limit)
+        .all()
+    )
+    if len(rows) < limit:
+        lower = rows[-1].id if rows else after_id
+        rows += (
+            Message.query
+            .filter(Message.group_id == group_id, Message.id > lower)
+            .order_by(Message.id.asc())
+            .limit(limit - len(rows))
+            .all()
+        )
+    return rows
@@ -0,0 +1,69 @@
+# broadcast.py
+import threading
+
+from .socketio_instance import socketio
+
+
+class RoomBroadcaster:
+    """Send chat messages to Socket.IO group rooms exactly once each.
+
+    With flush_interval == 0 (the default) every message is emitted straight
+    away as a single `group_message` event. With flush_interval > 0, messages
+    for the same room are held for up to flush_interval seconds, or until
+    max_batch of them are waiting, and then go out together as one
+    `group_messages` frame: {"group_id": ..., "messages": [...]}. A window that
+    only caught one message still goes out as a plain `group_message`.
+    """
+
+    def __init__(self, sio, flush_interval=0.0, max_batch=50):
+        self.sio = sio
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending = {}  # room -> list of payloads
+        self._lock = threading.Lock()
+        self._flusher_started = False
+
+    def configure(self, flush_interval=None, max_batch=None):
+        if flush_interval is not None:
+            self.flush_interval = max(0.0, float(flush_interval))
+        if max_batch is not None:
+            self.max_batch = max(1, int(max_batch))
+
+    def publish(self, room, payload):
+        if self.flush_interval <= 0:
+            self.sio.emit("group_message", payload, room=room)
+            return
+
+        ready = None
+        with self._lock:
+            batch = self._pending.setdefault(room, [])
+            batch.append(payload)
+            if len(batch) >= self.max_batch:
+                ready = self._pending.pop(room)
+            if not self._flusher_started:
+                self._flusher_started = True
+                self.sio.start_background_task(self._run_flusher)
+
+        if ready:
+            self._emit_batch(room, ready)
+
+    def flush(self):
+        """Send everything that is currently waiting."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for room, batch in pending.items():
+            self._emit_batch(room, batch)
+
+    def _emit_batch(self, room, batch):
+        if len(batch) == 1:
+            self.sio.emit("group_message", batch[0], room=room)
+        else:
+            self.sio.emit("group_messages", {"group_id": room, "messages": batch}, room=room)
+
+    def _run_flusher(self):
+        while True:
+            self.sio.sleep(self.flush_interval)
+            self.flush()
+
+
+broadcaster = RoomBroadcaster(socketio)
@@ -0,0 +1,197 @@
+# catalog.py
+#
+# Cached group catalog for discover_groups. The catalog is the user-independent part of
+# discovery (every group with its member count and avatar preview), ordered by group id.
+#
+#   Local layer:  each worker keeps the last catalog it built or fetched, for CATALOG_CACHE_TTL seconds.
+#   Shared layer: with CATALOG_CACHE_URL=redis://..., workers share the encoded catalog and a
+#                 generation counter. invalidate_catalog() bumps the generation, so every worker
+#                 drops its local copy on its next read instead of waiting out the TTL.
+import os
+import threading
+import time
+from bisect import bisect_left
+
+import msgspec
+
+from .cache import register_stats
+from .extensions import db
+from .models import Group, GroupMember, User
+from .schemas import GroupCatalogEntry, member_out
+from .versions import CATALOG_KEY, current_version
+
+DISCOVER_PREVIEW_SIZE = 5
+
+_GENERATION_KEY = "catalog:generation"
+_DATA_KEY = "catalog:data:{}:{}"  # generation, version
+
+
+def member_previews(group_ids, size=DISCOVER_PREVIEW_SIZE):
+    """First `size` members (by join order) of each group in one windowed query."""
+    if not group_ids:
+        return {}
+    ranked = (
+        db.select(
+            GroupMember.group_id,
+            GroupMember.user_id,
+            db.func.row_number().over(
+                partition_by=GroupMember.group_id, order_by=GroupMember.id
+            ).label("position"),
+        )
+        .where(GroupMember.group_id.in_(group_ids))
+        .subquery()
+    )
+    rows = db.session.execute(
+        db.select(ranked.c.group_id, User.id, User.name, User.email, User.picture)
+        .join(User, User.id == ranked.c.user_id)
+        .where(ranked.c.position <= size)
+        .order_by(ranked.c.group_id, ranked.c.position)
+    ).all()
+    previews = {group_id: [] for group_id in group_ids}
+    for row in rows:
+        previews[row.group_id].append(member_out(row))
+    return previews
+
+
+def find_entry(catalog, group_id):
+    """Binary-search a catalog (ordered by id) for one group; None if it is not there."""
+    i = bisect_left(catalog, group_id, key=lambda e: e.id)
+    if i < len(catalog) and catalog[i].id == group_id:
+        return catalog[i]
+    return None
+
+
+def load_catalog():
+    """Build the catalog from the database: one aggregated query plus one preview query."""
+    creator = db.aliased(User)
+    rows = db.session.execute(
+        db.select(
+            Group.id,
+            Group.name,
+            Group.description,
+            creator.email.label("created_by"),
+            db.func.count(GroupMember.id).label("member_count"),
+        )
+        .outerjoin(creator, creator.id == Group.creator_id)
+        .outerjoin(GroupMember, GroupMember.group_id == Group.id)
+        .group_by(Group.id, Group.name, Group.description, creator.email)
+        .order_by(Group.id)
+    ).all()
+    previews = member_previews([row.id for row in rows])
+    return [
+        GroupCatalogEntry(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            created_by=row.created_by,
+            member_count=row.member_count,
+            member_preview=previews[row.id],
+        )
+        for row in rows
+    ]
+
+
+class CatalogCache:
+    def __init__(self, ttl=60, url=None):
+        self.name = "discovery_catalog"
+        self.ttl = ttl
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._redis = None
+        self._generation = 0  # used when there is no shared layer
+        self._entry = None  # (generation, expires_at, catalog, version)
+        self._lock = threading.Lock()
+        self._decoder = msgspec.json.Decoder(list[GroupCatalogEntry])
+        self._encoder = msgspec.json.Encoder()
+        if url:
+            import redis
+
+            self._redis = redis.Redis.from_url(url)
+        register_stats(self)
+
+    def _current_generation(self):
+        if self._redis is None:
+            return self._generation
+        return int(self._redis.get(_GENERATION_KEY) or 0)
+
+    def get(self, loader=load_catalog, version=None):
+        """Return the catalog, rebuilding it with `loader()` only when no layer has it.
+
+        `version` is the catalog version from versions.py when the caller knows it; a local
+        copy built at another version is not reused even if it has not expired.
+        """
+        generation = self._current_generation()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry
+            if (entry is not None and entry[0] == generation and entry[1] > now
+                    and (version is None or entry[3] == version)):
+                self.hits += 1
+                return entry[2]
+
+        catalog = None
+        if self._redis is not None:
+            data = self._redis.get(_DATA_KEY.format(generation, version))
+            if data is not None:
+                catalog = self._decoder.decode(data)
+                with self._lock:
+                    self.shared_hits += 1
+
+        if catalog is None:
+            catalog = loader()
+            with self._lock:
+                self.misses += 1
+            if self._redis is not None:
+                self._redis.set(_DATA_KEY.format(generation, version), self._encoder.encode(catalog), ex=self.ttl)
+
+        with self._lock:
+            self._entry = (generation, now + self.ttl, catalog, version)
+        return catalog
+
+    def invalidate(self):
+        """Call after committing any change to groups, memberships or creators."""
+        with self._lock:
+            self.invalidations += 1
+            self._entry = None
+            self._generation += 1
+        if self._redis is not None:
+            self._redis.incr(_GENERATION_KEY)
+
+    def clear(self):
+        with self._lock:
+            self._entry = None
+
+    def stats(self):
+        total = self.hits + self.shared_hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entry[2]) if self._entry else 0,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round((self.hits + self.shared_hits) / total, 4) if total else None,
+        }
+
+
+catalog_cache = CatalogCache(
+    ttl=int(os.getenv("CATALOG_CACHE_TTL", "60")),
+    url=os.getenv("CATALOG_CACHE_URL"),
+)
+
+
+def get_catalog(version=None):
+    """The catalog at `version`, by default the committed catalog version.
+
+    Never an older local copy, so a group created or joined on another worker is
+    visible as soon as it commits.
+    """
+    if version is None:
+        version = current_version(CATALOG_KEY)
+    return catalog_cache.get(version=version)
+
+
+def invalidate_catalog():
+    catalog_cache.invalidate()
@@ -0,0 +1,72 @@
+# changes.py
+#
+# Change tracking behind /api/sync. Every write that a client would otherwise
+# have to re-poll for appends a ChangeLog row in the same transaction; clients
+# hold the id of the last row they saw as their sync token. Recording a change
+# also bumps the version counters that conditional GETs are validated against.
+#
+# A token is only safe if ids become visible in id order. Postgres hands out ids before
+# commit, so on Postgres every transaction that logs a change takes one advisory lock
+# first and holds it until it commits: a lower id can never commit after a higher one.
+# (SQLite has one writer at a time, which gives the same order.) Record changes as the
+# last write before committing, so the lock is held only briefly.
+from .extensions import db
+from .models import ChangeLog
+from .versions import CATALOG_KEY, bump_versions, group_key
+
+MESSAGE_CREATED = "message_created"
+MESSAGE_DELETED = "message_deleted"
+COMPLETION_CREATED = "completion_created"
+MEMBER_JOINED = "member_joined"
+MEMBER_LEFT = "member_left"
+GROUP_DELETED = "group_deleted"
+
+# Kinds that change the discovery catalog (member counts, previews, the group list)
+CATALOG_KINDS = {MEMBER_JOINED, MEMBER_LEFT, GROUP_DELETED}
+
+
+# pg_advisory_xact_lock key for change_log inserts
+_CHANGE_LOG_LOCK = 0x6368616E
+
+
+def _lock_change_log():
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(db.text("SELECT pg_advisory_xact_lock(:key)"), {"key": _CHANGE_LOG_LOCK})
+
+
+def _version_keys(rows):
+    keys = set()
+    for group_id, kind in rows:
+        keys.add(group_key(group_id))
+        if kind in CATALOG_KINDS:
+            keys.add(CATALOG_KEY)
+    return keys
+
+
+def record_change(group_id, kind, entity_id=None, user_id=None):
+    """Log one change and bump the versions it touches; returns {key: new version}."""
+    _lock_change_log()
+    db.session.add(ChangeLog(group_id=group_id, kind=kind, entity_id=entity_id, user_id=user_id))
+    return bump_versions(_version_keys([(group_id, kind)]))
+
+
+def record_changes(rows):
+    """Bulk form of record_change: rows are dicts with the same keys."""
+    rows = list(rows)
+    if rows:
+        _lock_change_log()
+        db.session.execute(db.insert(ChangeLog), rows)
+        return bump_versions(_version_keys((row["group_id"], row["kind"]) for row in rows))
+    return {}
+
+
+def record_group_deleted(group_id, member_ids):
+    """Log a group deletion once per former member.
+
+    The group's memberships go in the same transaction, so /api/sync can only reach
+    former members through rows addressed to them by user_id.
+    """
+    record_changes([
+        {"group_id": group_id, "kind": GROUP_DELETED, "entity_id": None, "user_id": user_id}
+        for user_id in (member_ids or [None])
+    ])
@@ -0,0 +1,65 @@
+# completions.py
+#
+# Recording a habit completion. The user_activity row goes in with a single
+# INSERT ... ON CONFLICT DO NOTHING RETURNING against the unique index on
+# (user_id, group_id, completed_date): a second tap on the same day, even a concurrent
+# one, inserts nothing and returns no row. Only a real insert goes on to the derived
+# writes (leaderboard counters, change log), all in the caller's transaction.
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from sqlalchemy.exc import IntegrityError
+
+from . import changes
+from .changes import record_change
+from .extensions import db
+from .member_stats import record_completion
+from .models import UserActivity
+
+
+class Completion(NamedTuple):
+    id: int
+    completed_at: datetime
+    stats: Any  # the member's group_member_stats row after this completion
+
+
+def _insert_once(values):
+    """Insert a user_activity row unless that day is already recorded; returns (id, completed_at) or None."""
+    table = UserActivity.__table__
+    dialect = db.engine.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = (
+            insert(table)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["user_id", "group_id", "completed_date"])
+            .returning(table.c.id, table.c.completed_at)
+        )
+        return db.session.execute(stmt).first()
+    try:
+        with db.session.begin_nested():
+            return db.session.execute(db.insert(table).values(**values).returning(table.c.id, table.c.completed_at)).first()
+    except IntegrityError:
+        return None
+
+
+def add_completion(group_id, user_id, completed_date, completed_at=None):
+    """Record a completion; returns a Completion, or None if the day was already recorded.
+
+    Does not commit. Streaks are updated in place only for completions dated on or after the
+    member's latest one; see streaks.recompute_streaks() for backfills.
+    """
+    row = _insert_once({
+        "user_id": user_id,
+        "group_id": group_id,
+        "completed_date": completed_date,
+        "completed_at": completed_at or datetime.utcnow(),
+    })
+    if row is None:
+        return None
+    stats = record_completion(group_id, user_id, completed_date)
+    record_change(group_id, changes.COMPLETION_CREATED, entity_id=row.id, user_id=user_id)
+    return Completion(row.id, row.completed_at, stats)
@@ -0,0 +1,484 @@
+# leaderboard_store.py
+#
+# Selectable store for completion-count leaderboards (LEADERBOARD_BACKEND):
+#   database  read group_member_stats on every request (default)
+#   redis     one sorted set per group at LEADERBOARD_REDIS_URL, scored by completion count,
+#             plus a hash of each member's streak fields; complete_activity does a ZINCRBY
+#   local     the same structure in this process's memory (an indexable skip list): a stand-in
+#             for Redis in development and tests; not shared between workers
+#
+# Either store answers a top-N page and the caller's own rank in O(log n + N) without touching
+# the database. A group is loaded from group_member_stats the first time it is read, and
+# increments are only applied to groups that are loaded. Anything that deletes stats rows
+# (leaves, deletions, rebuilds) invalidates the group, and the next read reloads it.
+# A read-triggered load takes a token first (start_load) and installs its rows only if no
+# increment or invalidation touched the group in between (finish_load); otherwise the rows
+# may predate that write, and the read falls back to the database instead.
+# Ties are ordered by user id, the same as the database ordering.
+# rebuild_leaderboards() reloads groups eagerly and check_leaderboards() reports drift.
+import os
+import random
+import threading
+from datetime import date
+from typing import NamedTuple, Optional
+
+import msgspec
+
+from .extensions import db
+from .models import Group, GroupMemberStats
+
+LEADERBOARD_BACKENDS = ("database", "redis", "local")
+
+_GROUPS_KEY = "leaderboard:groups"  # set of loaded group ids
+_SCORES_KEY = "leaderboard:{}"  # group id -> sorted set of members by completion count
+_DETAILS_KEY = "leaderboard:{}:details"  # group id -> hash of member -> encoded Details
+_LOADING_KEY = "leaderboard:{}:loading"  # group id -> token of the load in progress
+_LOADING_TTL = 60  # seconds; a reader that dies mid-load cannot block later loads for longer
+
+# Sorted-set members are encoded so that Redis's reverse-lexicographic order for equal scores
+# puts the lower user id first.
+_MEMBER_CEILING = 10**12
+
+
+class Details(NamedTuple):
+    last_completed: Optional[date]
+    current_streak: int
+    longest_streak: int
+    streak_start: Optional[date]
+
+
+class Standing(NamedTuple):
+    rank: int
+    user_id: int
+    completion_count: int
+    last_completed: Optional[date]
+    current_streak: int
+    longest_streak: int
+    streak_start: Optional[date]
+
+
+def _standing(rank, user_id, score, details):
+    return Standing(rank, user_id, int(score), *details)
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, height):
+        self.key = key
+        self.next = [None] * height
+        self.width = [1] * height  # positions skipped by each forward link
+
+
+class SkipList:
+    """Sorted keys with O(log n) insert, remove, rank and positional lookup."""
+
+    _MAX_HEIGHT = 16
+    _P = 0.25
+
+    def __init__(self, keys=()):
+        self._head = _Node(None, self._MAX_HEIGHT)
+        self._size = 0
+        for key in keys:
+            self.insert(key)
+
+    def __len__(self):
+        return self._size
+
+    def _path(self, key):
+        """Last node before `key` on every level, and the position of each."""
+        chain = [None] * self._MAX_HEIGHT
+        positions = [0] * self._MAX_HEIGHT
+        node, position = self._head, 0
+        for level in reversed(range(self._MAX_HEIGHT)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+            positions[level] = position
+        return chain, positions
+
+    def insert(self, key):
+        chain, positions = self._path(key)
+        position = positions[0]
+        height = 1
+        while height < self._MAX_HEIGHT and random.random() < self._P:
+            height += 1
+        node = _Node(key, height)
+        for level in range(height):
+            before = chain[level]
+            skipped = position - positions[level]
+            node.next[level] = before.next[level]
+            node.width[level] = before.width[level] - skipped
+            before.next[level] = node
+            before.width[level] = skipped + 1
+        for level in range(height, self._MAX_HEIGHT):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        chain, _ = self._path(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        for level in range(self._MAX_HEIGHT):
+            before = chain[level]
+            if before.next[level] is node:
+                before.width[level] += node.width[level] - 1
+                before.next[level] = node.next[level]
+            else:
+                before.width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key):
+        """0-based position of `key`; KeyError if it is not present."""
+        chain, positions = self._path(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        return positions[0]
+
+    def slice(self, start, stop=None):
+        """Keys at positions start..stop-1, found in O(log n) and then walked."""
+        stop = self._size if stop is None else min(stop, self._size)
+        if start >= stop:
+            return []
+        node, position = self._head, 0
+        for level in reversed(range(self._MAX_HEIGHT)):
+            while node.next[level] is not None and position + node.width[level] <= start + 1:
+                position += node.width[level]
+                node = node.next[level]
+        keys = []
+        while node is not None and len(keys) < stop - start:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class _Board:
+    __slots__ = ("order", "scores", "details")
+
+    def __init__(self, rows):
+        self.scores = {user_id: score for user_id, score, _ in rows}
+        self.details = {user_id: details for user_id, _, details in rows}
+        self.order = SkipList((-score, user_id) for user_id, score in self.scores.items())
+
+
+class LocalLeaderboardStore:
+    name = "local"
+
+    def __init__(self):
+        self._boards = {}
+        self._loading = {}  # group_id -> token of the load in progress
+        self._lock = threading.Lock()
+
+    def load(self, group_id, rows):
+        """Replace a group's board with (user_id, completion_count, Details) rows."""
+        board = _Board(list(rows))
+        with self._lock:
+            self._boards[group_id] = board
+
+    def start_load(self, group_id):
+        """Token for finish_load(); call before reading the rows to load."""
+        token = object()
+        with self._lock:
+            self._loading[group_id] = token
+        return token
+
+    def finish_load(self, group_id, token, rows):
+        """Load rows unless a write reached the group since start_load(); returns whether it did."""
+        board = _Board(list(rows))
+        with self._lock:
+            if self._loading.get(group_id) is not token:
+                return False
+            del self._loading[group_id]
+            self._boards[group_id] = board
+            return True
+
+    def increment(self, group_id, user_id, details):
+        """Count one completion if the group is loaded; returns whether it was."""
+        with self._lock:
+            self._loading.pop(group_id, None)
+            board = self._boards.get(group_id)
+            if board is None:
+                return False
+            score = board.scores.get(user_id, 0)
+            if score:
+                board.order.remove((-score, user_id))
+            board.order.insert((-(score + 1), user_id))
+            board.scores[user_id] = score + 1
+            board.details[user_id] = details
+            return True
+
+    def page(self, group_id, user_id, offset=0, limit=None):
+        """(total, [Standing], the caller's Standing or None), or None if the group is not loaded."""
+        with self._lock:
+            board = self._boards.get(group_id)
+            if board is None:
+                return None
+            stop = None if limit is None else offset + limit
+            entries = [
+                _standing(offset + i + 1, uid, -negated, board.details[uid])
+                for i, (negated, uid) in enumerate(board.order.slice(offset, stop))
+            ]
+            me = None
+            score = board.scores.get(user_id)
+            if score is not None:
+                me = _standing(board.order.rank((-score, user_id)) + 1, user_id, score, board.details[user_id])
+            return len(board.order), entries, me
+
+    def snapshot(self, group_id):
+        """{user_id: (completion_count, Details)} for a loaded group, else None."""
+        with self._lock:
+            board = self._boards.get(group_id)
+            if board is None:
+                return None
+            return {uid: (score, board.details[uid]) for uid, score in board.scores.items()}
+
+    def loaded_groups(self):
+        with self._lock:
+            return list(self._boards)
+
+    def invalidate(self, group_ids):
+        with self._lock:
+            for group_id in group_ids:
+                self._loading.pop(group_id, None)
+                self._boards.pop(group_id, None)
+
+
+class RedisLeaderboardStore:
+    name = "redis"
+
+    # Increment only groups that are loaded, so a partial set is never mistaken for a full one;
+    # otherwise cancel any load in progress, whose rows may predate this completion.
+    _INCREMENT = """
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 0 then
+  redis.call('DEL', KEYS[4])
+  return 0
+end
+redis.call('ZINCRBY', KEYS[2], 1, ARGV[2])
+redis.call('HSET', KEYS[3], ARGV[2], ARGV[3])
+return 1
+"""
+
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._watch_error = redis.WatchError
+        self._increment = self._redis.register_script(self._INCREMENT)
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder(Details)
+
+    @staticmethod
+    def _member(user_id):
+        return f"{_MEMBER_CEILING - user_id:012d}"
+
+    @staticmethod
+    def _user_id(member):
+        return _MEMBER_CEILING - int(member)
+
+    def _queue_load(self, pipe, group_id, rows):
+        pipe.delete(_SCORES_KEY.format(group_id), _DETAILS_KEY.format(group_id))
+        if rows:
+            pipe.zadd(_SCORES_KEY.format(group_id), {self._member(uid): score for uid, score, _ in rows})
+            pipe.hset(_DETAILS_KEY.format(group_id),
+                      mapping={self._member(uid): self._encoder.encode(details) for uid, _, details in rows})
+        pipe.sadd(_GROUPS_KEY, group_id)
+
+    def load(self, group_id, rows):
+        pipe = self._redis.pipeline()  # MULTI: readers never see a half-loaded group
+        self._queue_load(pipe, group_id, list(rows))
+        pipe.execute()
+
+    def start_load(self, group_id):
+        token = os.urandom(8).hex()
+        self._redis.set(_LOADING_KEY.format(group_id), token, ex=_LOADING_TTL)
+        return token
+
+    def finish_load(self, group_id, token, rows):
+        rows = list(rows)
+        loading_key = _LOADING_KEY.format(group_id)
+        with self._redis.pipeline() as pipe:
+            try:
+                # WATCH: an increment or invalidation deleting the token aborts the MULTI below
+                pipe.watch(loading_key)
+                current = pipe.get(loading_key)
+                if current is None or current.decode() != token:
+                    return False
+                pipe.multi()
+                self._queue_load(pipe, group_id, rows)
+                pipe.delete(loading_key)
+                pipe.execute()
+            except self._watch_error:
+                return False
+        return True
+
+    def increment(self, group_id, user_id, details):
+        return bool(self._increment(
+            keys=[_GROUPS_KEY, _SCORES_KEY.format(group_id), _DETAILS_KEY.format(group_id),
+                  _LOADING_KEY.format(group_id)],
+            args=[group_id, self._member(user_id), self._encoder.encode(details)],
+        ))
+
+    def page(self, group_id, user_id, offset=0, limit=None):
+        key = _SCORES_KEY.format(group_id)
+        member = self._member(user_id)
+        stop = -1 if limit is None else offset + limit - 1
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.sismember(_GROUPS_KEY, group_id)
+        pipe.zcard(key)
+        pipe.zrevrange(key, offset, stop, withscores=True)
+        pipe.zrevrank(key, member)
+        pipe.zscore(key, member)
+        loaded, total, top, my_rank, my_score = pipe.execute()
+        if not loaded:
+            return None
+
+        members = [m for m, _ in top]
+        if my_rank is not None:
+            members.append(member)
+        encoded = self._redis.hmget(_DETAILS_KEY.format(group_id), members) if members else []
+        if any(data is None for data in encoded):
+            return None  # invalidated or reloaded between the two round trips
+        details = [self._decoder.decode(data) for data in encoded]
+        entries = [
+            _standing(offset + i + 1, self._user_id(m), score, details[i])
+            for i, (m, score) in enumerate(top)
+        ]
+        me = None if my_rank is None else _standing(my_rank + 1, user_id, my_score, details[-1])
+        return total, entries, me
+
+    def snapshot(self, group_id):
+        pipe = self._redis.pipeline()
+        pipe.sismember(_GROUPS_KEY, group_id)
+        pipe.zrange(_SCORES_KEY.format(group_id), 0, -1, withscores=True)
+        pipe.hgetall(_DETAILS_KEY.format(group_id))
+        loaded, scores, details = pipe.execute()
+        if not loaded:
+            return None
+        return {
+            self._user_id(m): (int(score), self._decoder.decode(details[m]) if m in details else None)
+            for m, score in scores
+        }
+
+    def loaded_groups(self):
+        return [int(group_id) for group_id in self._redis.smembers(_GROUPS_KEY)]
+
+    def invalidate(self, group_ids):
+        group_ids = list(group_ids)
+        if not group_ids:
+            return
+        pipe = self._redis.pipeline()
+        pipe.srem(_GROUPS_KEY, *group_ids)
+        for group_id in group_ids:
+            pipe.delete(_SCORES_KEY.format(group_id), _DETAILS_KEY.format(group_id), _LOADING_KEY.format(group_id))
+        pipe.execute()
+
+
+def create_store(backend, url=None):
+    if backend not in LEADERBOARD_BACKENDS:
+        raise ValueError(f"LEADERBOARD_BACKEND must be one of {', '.join(LEADERBOARD_BACKENDS)}, got {backend!r}")
+    if backend == "redis":
+        return RedisLeaderboardStore(url or "redis://127.0.0.1:6379/0")
+    if backend == "local":
+        return LocalLeaderboardStore()
+    return None
+
+
+# None with the database backend
+leaderboard_store = create_store(
+    os.getenv("LEADERBOARD_BACKEND", "database"),
+    os.getenv("LEADERBOARD_REDIS_URL"),
+)
+
+
+def _stats_rows(group_ids):
+    """{group_id: [(user_id, completion_count, Details)]} from group_member_stats."""
+    rows = {group_id: [] for group_id in group_ids}
+    result = db.session.execute(
+        db.select(
+            GroupMemberStats.group_id,
+            GroupMemberStats.user_id,
+            GroupMemberStats.completion_count,
+            GroupMemberStats.last_completed,
+            GroupMemberStats.current_streak,
+            GroupMemberStats.longest_streak,
+            GroupMemberStats.streak_start,
+        ).where(GroupMemberStats.group_id.in_(group_ids))
+    )
+    for row in result:
+        rows[row.group_id].append((
+            row.user_id,
+            row.completion_count,
+            Details(row.last_completed, row.current_streak, row.longest_streak, row.streak_start),
+        ))
+    return rows
+
+
+def leaderboard_page(group_id, user_id, offset=0, limit=None):
+    """(total, [Standing], the caller's Standing or None) from the store, loading the group if needed.
+
+    Only for the completion-count ranking; returns None with the database backend, or when
+    a completion raced the load (the caller reads the database instead).
+    """
+    if leaderboard_store is None:
+        return None
+    page = leaderboard_store.page(group_id, user_id, offset, limit)
+    if page is None:
+        token = leaderboard_store.start_load(group_id)
+        if not leaderboard_store.finish_load(group_id, token, _stats_rows([group_id])[group_id]):
+            return None
+        page = leaderboard_store.page(group_id, user_id, offset, limit)
+    return page
+
+
+def record_leaderboard_completion(group_id, user_id, stats):
+    """Call after committing a completion, with the stats row add_completion() returned."""
+    if leaderboard_store is not None:
+        leaderboard_store.increment(group_id, user_id, Details(
+            stats.last_completed, stats.current_streak, stats.longest_streak, stats.streak_start,
+        ))
+
+
+def invalidate_leaderboards(group_ids):
+    """Call after committing any change that deletes or rewrites these groups' stats rows."""
+    if leaderboard_store is not None:
+        leaderboard_store.invalidate(group_ids)
+
+
+def rebuild_leaderboards(group_ids=None):
+    """Load groups (all of them by default) into the store from the database.
+
+    Returns (groups, rows) loaded.
+    """
+    if leaderboard_store is None:
+        return 0, 0
+    if group_ids is None:
+        group_ids = list(db.session.scalars(db.select(Group.id)))
+    rows = _stats_rows(group_ids)
+    for group_id in group_ids:
+        leaderboard_store.load(group_id, rows[group_id])
+    return len(group_ids), sum(len(r) for r in rows.values())
+
+
+def check_leaderboards(group_ids=None):
+    """Compare loaded groups (all of them by default) with the database.
+
+    Returns {group_id: number of members whose count or streak fields differ}, listing
+    only groups that drifted.
+    """
+    if leaderboard_store is None:
+        return {}
+    if group_ids is None:
+        group_ids = leaderboard_store.loaded_groups()
+    snapshots = {group_id: leaderboard_store.snapshot(group_id) for group_id in group_ids}
+    snapshots = {group_id: snap for group_id, snap in snapshots.items() if snap is not None}
+    expected = _stats_rows(list(snapshots))
+    drift = {}
+    for group_id, snapshot in snapshots.items():
+        fresh = {uid: (score, details) for uid, score, details in expected[group_id]}
+        count = sum(1 for uid in snapshot.keys() | fresh.keys() if snapshot.get(uid) != fresh.get(uid))
+        if count:
+            drift[group_id] = count
+    return drift
@@ -0,0 +1,115 @@
+# member_stats.py
+#
+# Materialized leaderboard counters. group_member_stats holds one row per (group, user)
+# with at least one completion: the number of user_activity rows and the latest
+# completed_date. complete_activity bumps it in the same transaction as the insert, and
+# every path that deletes user_activity rows deletes the matching stats rows, so a
+# leaderboard is one indexed ordered read however old the group is. The same rows carry
+# each member's streaks (streaks.py).
+# rebuild_member_stats() recomputes rows from user_activity and reports any drift.
+from .extensions import db
+from .models import GroupMemberStats, UserActivity
+from .streaks import recompute_streaks, streak_insert_values, streak_update_values
+
+
+def _returned(table):
+    return (
+        table.c.completion_count,
+        table.c.last_completed,
+        table.c.current_streak,
+        table.c.longest_streak,
+        table.c.streak_start,
+    )
+
+
+def record_completion(group_id, user_id, completed_date):
+    """Count one new completion as part of the current transaction; returns the updated stats row.
+
+    Streaks are updated in place for completions dated on or after the member's latest one;
+    follow a backdated completion with recompute_streaks(pairs=[(group_id, user_id)]).
+    """
+    table = GroupMemberStats.__table__
+    latest = db.case(
+        (table.c.last_completed >= completed_date, table.c.last_completed),
+        else_=completed_date,
+    )
+    dialect = db.engine.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(
+            group_id=group_id, user_id=user_id, completion_count=1, last_completed=completed_date,
+            **streak_insert_values(completed_date),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.group_id, table.c.user_id],
+            set_={
+                "completion_count": table.c.completion_count + 1,
+                "last_completed": latest,
+                **streak_update_values(table, completed_date),
+            },
+        )
+        return db.session.execute(stmt.returning(*_returned(table))).first()
+    updated = db.session.execute(
+        db.update(table)
+        .where(table.c.group_id == group_id, table.c.user_id == user_id)
+        .values(
+            completion_count=table.c.completion_count + 1,
+            last_completed=latest,
+            **streak_update_values(table, completed_date),
+        )
+    )
+    if updated.rowcount == 0:
+        db.session.execute(db.insert(table).values(
+            group_id=group_id, user_id=user_id, completion_count=1, last_completed=completed_date,
+            **streak_insert_values(completed_date),
+        ))
+    return db.session.execute(
+        db.select(*_returned(table)).where(table.c.group_id == group_id, table.c.user_id == user_id)
+    ).first()
+
+
+def _aggregate(group_ids=None):
+    query = db.select(
+        UserActivity.group_id,
+        UserActivity.user_id,
+        db.func.count(UserActivity.id).label("completion_count"),
+        db.func.max(UserActivity.completed_date).label("last_completed"),
+    ).group_by(UserActivity.group_id, UserActivity.user_id)
+    if group_ids is not None:
+        query = query.where(UserActivity.group_id.in_(group_ids))
+    return query
+
+
+def rebuild_member_stats(group_ids=None):
+    """Recompute stats from user_activity (for all groups, or just `group_ids`).
+
+    Returns (rows written, rows that were missing, stale or orphaned beforehand).
+    The caller commits.
+    """
+    db.session.flush()
+    current = db.select(
+        GroupMemberStats.group_id,
+        GroupMemberStats.user_id,
+        GroupMemberStats.completion_count,
+        GroupMemberStats.last_completed,
+    )
+    if group_ids is not None:
+        current = current.where(GroupMemberStats.group_id.in_(group_ids))
+    before = {(r.group_id, r.user_id): (r.completion_count, r.last_completed) for r in db.session.execute(current)}
+    fresh = {(r.group_id, r.user_id): (r.completion_count, r.last_completed) for r in db.session.execute(_aggregate(group_ids))}
+    drift = sum(1 for key in before.keys() | fresh.keys() if before.get(key) != fresh.get(key))
+
+    delete = db.delete(GroupMemberStats)
+    if group_ids is not None:
+        delete = delete.where(GroupMemberStats.group_id.in_(group_ids))
+    db.session.execute(delete, execution_options={"synchronize_session": False})
+    db.session.execute(
+        db.insert(GroupMemberStats).from_select(
+            ["group_id", "user_id", "completion_count", "last_completed"], _aggregate(group_ids)
+        )
+    )
+    recompute_streaks(group_ids)
+    return len(fresh), drift
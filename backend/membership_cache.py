@@ -0,0 +1,54 @@
+# membership_cache.py
+#
+# Per-user set of joined group ids, used to authorize chat reads and writes without a
+# query per message. A cached "member" answer is trusted until the entry expires or is
+# invalidated (join, leave, group/user deletion). A "not a member" answer is always
+# re-checked against the database first, so a join made on another worker never shows
+# up here as a spurious 403.
+import os
+
+from .cache import TTLCache
+from .extensions import db
+from .models import GroupMember
+
+# user_id -> frozenset of group ids
+_memberships = TTLCache(
+    "user_memberships",
+    ttl=int(os.getenv("MEMBERSHIP_CACHE_TTL", "60")),
+    maxsize=int(os.getenv("MEMBERSHIP_CACHE_SIZE", "10000")),
+)
+
+
+def _load(user_id):
+    group_ids = frozenset(db.session.scalars(
+        db.select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+    ))
+    _memberships.set(user_id, group_ids)
+    return group_ids
+
+
+def member_group_ids(user_id):
+    group_ids = _memberships.get(user_id)
+    if group_ids is None:
+        group_ids = _load(user_id)
+    return group_ids
+
+
+def is_member(user_id, group_id):
+    if user_id is None:
+        return False
+    group_ids = _memberships.get(user_id)
+    if group_ids is not None and group_id in group_ids:
+        return True
+    return group_id in _load(user_id)
+
+
+def group_member_ids(group_id):
+    """Members of a group; read these before deleting it so their entries can be invalidated."""
+    return list(db.session.scalars(db.select(GroupMember.user_id).where(GroupMember.group_id == group_id)))
+
+
+def invalidate_memberships(user_ids):
+    """Call after committing any membership change for these users."""
+    for user_id in user_ids:
+        _memberships.delete(user_id)
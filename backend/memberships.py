@@ -0,0 +1,135 @@
+# memberships.py
+#
+# Set-based membership writes for onboarding flows and admin tools. A bulk call checks
+# every (user_id, group_id) pair with three queries, applies all changes in one
+# transaction and reports one result per input pair, in input order.
+from collections import Counter
+
+from sqlalchemy.exc import IntegrityError
+
+from . import changes
+from .catalog import invalidate_catalog
+from .changes import record_changes
+from .extensions import db
+from .leaderboard_store import invalidate_leaderboards
+from .membership_cache import invalidate_memberships
+from .models import Group, GroupMember, GroupMemberStats, GroupReadState, User, UserActivity
+
+BULK_MAX_PAIRS = 1000
+
+JOINED = "joined"
+LEFT = "left"
+ALREADY_MEMBER = "already_member"
+NOT_MEMBER = "not_member"
+IS_CREATOR = "creator"
+USER_NOT_FOUND = "user_not_found"
+GROUP_NOT_FOUND = "group_not_found"
+DUPLICATE = "duplicate"
+
+
+def _pair_filter(model, pairs):
+    return db.tuple_(model.user_id, model.group_id).in_(pairs)
+
+
+def _lookup(pairs):
+    """Existing users, {group_id: creator_id} and existing memberships for the pairs."""
+    user_ids = {user_id for user_id, _ in pairs}
+    group_ids = {group_id for _, group_id in pairs}
+    users = set(db.session.scalars(db.select(User.id).where(User.id.in_(user_ids))))
+    groups = dict(db.session.execute(
+        db.select(Group.id, Group.creator_id).where(Group.id.in_(group_ids))
+    ).all())
+    members = set(db.session.execute(
+        db.select(GroupMember.user_id, GroupMember.group_id).where(_pair_filter(GroupMember, pairs))
+    ).all())
+    return users, groups, members
+
+
+def _classify(pairs, ready_status, check):
+    """Split pairs into (results, pairs to apply); check(pair, groups, members) may veto a pair."""
+    users, groups, members = _lookup(pairs)
+    results, todo, seen = [], [], set()
+    for user_id, group_id in pairs:
+        if (user_id, group_id) in seen:
+            status = DUPLICATE
+        elif user_id not in users:
+            status = USER_NOT_FOUND
+        elif group_id not in groups:
+            status = GROUP_NOT_FOUND
+        else:
+            status = check((user_id, group_id), groups, members) or ready_status
+        seen.add((user_id, group_id))
+        if status == ready_status:
+            todo.append((user_id, group_id))
+        results.append({"user_id": user_id, "group_id": group_id, "status": status})
+    return results, todo
+
+
+def _check_join(pair, groups, members):
+    return ALREADY_MEMBER if pair in members else None
+
+
+def _check_leave(pair, groups, members):
+    if pair not in members:
+        return NOT_MEMBER
+    if groups[pair[1]] == pair[0]:
+        return IS_CREATOR
+    return None
+
+
+def bulk_join(pairs):
+    """Add each (user_id, group_id) membership that does not exist yet; returns per-pair results."""
+    pairs = [(int(u), int(g)) for u, g in pairs]
+    if not pairs:
+        return []
+    for attempt in range(2):
+        results, todo = _classify(pairs, JOINED, _check_join)
+        if not todo:
+            return results
+        try:
+            # One INSERT ... VALUES (...), (...) statement for every new membership.
+            db.session.execute(db.insert(GroupMember.__table__).values([
+                {"user_id": u, "group_id": g} for u, g in todo
+            ]))
+            record_changes([
+                {"group_id": g, "kind": changes.MEMBER_JOINED, "entity_id": None, "user_id": u}
+                for u, g in todo
+            ])
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent join won the unique constraint; re-check and insert the rest.
+            db.session.rollback()
+            if attempt:
+                raise
+            continue
+        invalidate_catalog()
+        invalidate_memberships({u for u, _ in todo})
+        return results
+
+
+def bulk_leave(pairs):
+    """Remove each (user_id, group_id) membership; creators stay. Returns per-pair results."""
+    pairs = [(int(u), int(g)) for u, g in pairs]
+    if not pairs:
+        return []
+    results, todo = _classify(pairs, LEFT, _check_leave)
+    if not todo:
+        return results
+    for model in (UserActivity, GroupMemberStats, GroupReadState, GroupMember):
+        db.session.execute(
+            db.delete(model).where(_pair_filter(model, todo)),
+            execution_options={"synchronize_session": False},
+        )
+    record_changes([
+        {"group_id": g, "kind": changes.MEMBER_LEFT, "entity_id": None, "user_id": u}
+        for u, g in todo
+    ])
+    db.session.commit()
+    invalidate_catalog()
+    invalidate_memberships({u for u, _ in todo})
+    invalidate_leaderboards({g for _, g in todo})
+    return results
+
+
+def summarize(results):
+    return dict(Counter(result["status"] for result in results))
@@ -0,0 +1,167 @@
+# message_buffer.py
+import os
+import threading
+import time
+from collections import OrderedDict, deque, namedtuple
+
+from .cache import register_stats
+
+# Attribute-compatible with Message for serialization, but safe to keep across requests
+BufferedMessage = namedtuple("BufferedMessage", "id group_id user_id content created_at")
+
+
+def buffered(message):
+    return BufferedMessage(message.id, message.group_id, message.user_id, message.content, message.created_at)
+
+
+class _GroupBuffer:
+    __slots__ = ("rows", "complete", "loaded_at", "version")
+
+    def __init__(self, rows, capacity, complete, version=None):
+        self.rows = deque(rows, maxlen=capacity)
+        self.complete = complete  # True when rows hold the group's entire history
+        self.loaded_at = time.monotonic()
+        self.version = version  # group version (versions.py) read before loading, if known
+
+
+class RecentMessageBuffer:
+    """Per-group ring buffer of the newest chat messages, LRU-evicted across groups.
+
+    Serves the newest page of get_messages without touching the database. A group is
+    warmed on its first read; sends append to it and deletes remove from it. Buffers
+    are process-local, so entries older than `ttl` seconds are re-warmed to bound how
+    stale a worker can get when other workers are writing to the same group. Writes pass
+    the group version they committed, which keeps the buffer's version current; a write
+    that skips a version means another writer got in between, and drops the buffer.
+    """
+
+    def __init__(self, capacity=50, max_groups=1000, ttl=30):
+        self.name = "recent_messages"
+        self.capacity = capacity
+        self.max_groups = max_groups
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._groups = OrderedDict()
+        self._loading = {}  # group_id -> True once a write raced the warm-up load
+        self._lock = threading.Lock()
+        register_stats(self)
+
+    def newest(self, group_id, limit, loader, version=None):
+        """Return (rows oldest-first, has_more) for the newest `limit` messages.
+
+        `loader(n)` must return up to n newest Message rows for the group, newest first.
+        Returns None when `limit` is larger than the buffer can ever answer. With a
+        `version`, a buffer warmed at any other group version is re-warmed first, so a
+        response tagged with that version never carries older rows.
+        """
+        if limit > self.capacity:
+            return None
+
+        with self._lock:
+            entry = self._groups.get(group_id)
+            if entry is not None and (
+                (self.ttl and time.monotonic() - entry.loaded_at > self.ttl)
+                or (version is not None and entry.version != version)
+            ):
+                del self._groups[group_id]
+                entry = None
+            if entry is not None and (len(entry.rows) >= limit or entry.complete):
+                self._groups.move_to_end(group_id)
+                self.hits += 1
+                return self._page(entry, limit)
+            self.misses += 1
+            self._loading[group_id] = False
+
+        rows = loader(self.capacity + 1)
+        complete = len(rows) <= self.capacity
+        entry = _GroupBuffer((buffered(m) for m in reversed(rows[: self.capacity])), self.capacity, complete, version)
+        with self._lock:
+            if self._loading.pop(group_id, True):
+                # A write landed while we were loading; serve this read but don't cache it.
+                return self._page(entry, limit)
+            self._groups[group_id] = entry
+            self._groups.move_to_end(group_id)
+            while len(self._groups) > self.max_groups:
+                self._groups.popitem(last=False)
+            return self._page(entry, limit)
+
+    @staticmethod
+    def _page(entry, limit):
+        rows = list(entry.rows)
+        has_more = len(rows) > limit or not entry.complete
+        return rows[-limit:], has_more
+
+    @staticmethod
+    def _advance(entry, version):
+        """Move entry to the group `version` a write committed; False if it missed another write.
+
+        One transaction bumps a group once however many rows it writes, so a batch of
+        messages may pass the version the buffer already holds.
+        """
+        if version is None or entry.version is None:
+            return True
+        if version not in (entry.version, entry.version + 1):
+            return False
+        entry.version = version
+        return True
+
+    def append(self, message, version=None):
+        """Record a newly stored message; a no-op for groups that are not buffered.
+
+        `version` is the group version the write committed (see versions.py), if known.
+        """
+        with self._lock:
+            if message.group_id in self._loading:
+                self._loading[message.group_id] = True
+            entry = self._groups.get(message.group_id)
+            if entry is None:
+                return
+            if (entry.rows and entry.rows[-1].id >= message.id) or not self._advance(entry, version):
+                # Out-of-order arrival (e.g. concurrent writers); let the next read re-warm.
+                del self._groups[message.group_id]
+                return
+            if len(entry.rows) == self.capacity:
+                entry.complete = False
+            entry.rows.append(buffered(message))
+
+    def remove(self, group_id, message_id, version=None):
+        with self._lock:
+            if group_id in self._loading:
+                self._loading[group_id] = True
+            entry = self._groups.get(group_id)
+            if entry is None:
+                return
+            if not self._advance(entry, version):
+                del self._groups[group_id]
+                return
+            kept = [row for row in entry.rows if row.id != message_id]
+            if len(kept) != len(entry.rows):
+                entry.rows = deque(kept, maxlen=self.capacity)
+
+    def drop(self, group_id):
+        with self._lock:
+            if group_id in self._loading:
+                self._loading[group_id] = True
+            self._groups.pop(group_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._groups.clear()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._groups),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else None,
+        }
+
+
+recent_messages = RecentMessageBuffer(
+    capacity=int(os.getenv("CHAT_BUFFER_SIZE", "50")),
+    max_groups=int(os.getenv("CHAT_BUFFER_MAX_GROUPS", "1000")),
+    ttl=int(os.getenv("CHAT_BUFFER_TTL", "30")),
+)
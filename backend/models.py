@@ -10,19 +10,37 @@ from datetime import datetime
 
 class Message(db.Model):
     __tablename__ = "messages"
+    # Keyset pagination in get_messages walks (group_id, id) in both directions
+    __table_args__ = (db.Index("ix_messages_group_id_id", "group_id", "id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     group_id = db.Column(db.Integer, nullable=False)
-    user_name = db.Column(db.String(100), nullable=False)
+    # Author name/picture are resolved from User at read time (see user_cache.py).
+    # Nullable only for legacy rows whose author could not be matched during backfill.
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True, index=True)
     content = db.Column(db.Text, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    user_image = db.Column(db.String, nullable=False)
 
-    def __init__(self, group_id, user_name, content,user_image):
+    def __init__(self, group_id, user_id, content):
         self.group_id = group_id
-        self.user_name = user_name
+        self.user_id = user_id
         self.content = content
-        self.user_image = user_image
+
+class MessageArchive(db.Model):
+    """Cold chat history moved out of `messages` by archive.archive_messages().
+
+    Rows keep their original ids, and archiving always moves a prefix of the id space,
+    so every archived id is lower than every id still in `messages`.
+    """
+    __tablename__ = "messages_archive"
+    __table_args__ = (db.Index("ix_messages_archive_group_id_id", "group_id", "id"),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    group_id = db.Column(db.Integer, nullable=False)
+    user_id = db.Column(db.Integer, nullable=True, index=True)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
 class User(db.Model):
     __tablename__ = "user"
@@ -38,18 +56,18 @@ class Group(db.Model):
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
+    creator_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True, index=True)
 
     # Relationship to GroupMember
     members = db.relationship("GroupMember", back_populates="group", cascade="all, delete-orphan")
+    creator = db.relationship("User")
 
     def to_dict(self):
-        sorted_members = sorted(self.members, key=lambda m: m.id)
-        creator_email = sorted_members[0].user.email if sorted_members else None
         return {
             "id": self.id,
             "name": self.name,
             "description": self.description,
-            "created_by": creator_email,
+            "created_by": self.creator.email if self.creator else None,
             "members": [
                 {
                     "id": member.user.id,
@@ -63,6 +81,7 @@ class Group(db.Model):
 
 class GroupMember(db.Model):
     __tablename__ = "group_members"
+    __table_args__ = (db.UniqueConstraint("user_id", "group_id", name="uq_group_members_user_id_group_id"),)
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
@@ -81,6 +100,12 @@ class GroupMember(db.Model):
         }
 class UserActivity(db.Model):
     __tablename__ = "user_activity"
+    __table_args__ = (
+        # Covers windowed leaderboards (windows.py) as well as date-range reads per group
+        db.Index("ix_user_activity_group_id_completed_date_user_id", "group_id", "completed_date", "user_id"),
+        # One completion per member per group per day; completions.py relies on it
+        db.Index("ix_user_activity_user_id_group_id_completed_date", "user_id", "group_id", "completed_date", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -91,6 +116,51 @@ class UserActivity(db.Model):
     user = db.relationship('User', backref='activities', lazy=True)
     group = db.relationship('Group', backref='activities', lazy=True)
 
+class ChangeLog(db.Model):
+    """Append-only log of group-scoped changes; the id is the /api/sync watermark."""
+    __tablename__ = "change_log"
+    __table_args__ = (db.Index("ix_change_log_group_id_id", "group_id", "id"),)
 
+    id = db.Column(db.Integer, primary_key=True)
+    group_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(32), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=True)
+    user_id = db.Column(db.Integer, nullable=True, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+class GroupReadState(db.Model):
+    """How far each member has read a group's chat; unread = messages with a higher id."""
+    __tablename__ = "group_read_state"
+    __table_args__ = (db.UniqueConstraint("user_id", "group_id", name="uq_group_read_state_user_id_group_id"),)
 
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    group_id = db.Column(db.Integer, db.ForeignKey("group.id"), nullable=False)
+    last_read_message_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+class GroupMemberStats(db.Model):
+    """Per-(group, user) completion totals behind the leaderboards; see member_stats.py."""
+    __tablename__ = "group_member_stats"
+    __table_args__ = (
+        db.UniqueConstraint("group_id", "user_id", name="uq_group_member_stats_group_id_user_id"),
+        db.Index("ix_group_member_stats_group_id_completion_count", "group_id", "completion_count"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    group_id = db.Column(db.Integer, db.ForeignKey("group.id"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    completion_count = db.Column(db.Integer, nullable=False, default=0)
+    last_completed = db.Column(db.Date, nullable=True)
+    # Streaks (see streaks.py)
+    current_streak = db.Column(db.Integer, nullable=False, default=0)
+    longest_streak = db.Column(db.Integer, nullable=False, default=0)
+    streak_start = db.Column(db.Date, nullable=True)
+
+class ResourceVersion(db.Model):
+    """Monotonic version counter per cacheable resource (see versions.py), bumped with each change."""
+    __tablename__ = "resource_versions"
+
+    key = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
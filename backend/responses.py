@@ -0,0 +1,131 @@
+# responses.py
+#
+# Response layer for the polled list endpoints, registered per route in urls.py.
+#
+#   versioned(view, resource)  Conditional GETs. The ETag is derived from the version counters
+#                              of the resources the view reads (versions.py), so a matching
+#                              If-None-Match is answered with 304 after one primary-key lookup,
+#                              before the view runs its queries or serializes anything.
+#   compressed(view)           Compresses large JSON/text bodies with brotli (when the Brotli
+#                              package is installed) or gzip, per the client's Accept-Encoding.
+import gzip
+import hashlib
+import os
+from datetime import date
+from functools import wraps
+
+from flask import Response, make_response, request, session
+
+from .user_cache import current_user_id
+from .versions import CATALOG_KEY, get_versions, group_key, remember_versions
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def group_resource(group_id):
+    return [group_key(group_id)]
+
+
+def catalog_resource():
+    return [CATALOG_KEY]
+
+
+def _etag(view_name, keys, versions, per_user, daily):
+    parts = [view_name, request.query_string.decode("latin-1")]
+    parts += [f"{key}={versions.get(key, (0, None))[0]}" for key in keys]
+    if per_user:
+        parts.append(f"user={current_user_id()}")
+    if daily:
+        parts.append(date.today().isoformat())
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+
+
+def _mark_cacheable(response, tag, versions):
+    # Weak: compression changes the bytes but not the meaning.
+    response.set_etag(tag, weak=True)
+    stamps = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+    if stamps:
+        response.last_modified = max(stamps)
+    # Private (per-session data) and always revalidated, which is what makes the 304s useful.
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+
+def versioned(view, resource, per_user=False, daily=False):
+    """Wrap `view` so it answers If-None-Match from version counters.
+
+    `resource(**view_kwargs)` lists the version keys the view's output depends on.
+    `per_user` adds the caller to the ETag (for responses such as is_member flags) and
+    `daily` adds today's date (for relative fields such as days_ago).
+    """
+
+    @wraps(view)
+    def wrapper(**kwargs):
+        if request.method != "GET" or not session.get("user"):
+            return view(**kwargs)
+
+        keys = resource(**kwargs)
+        versions = get_versions(keys)
+        remember_versions(keys, versions)
+        tag = _etag(view.__name__, keys, versions, per_user, daily)
+
+        if request.if_none_match.contains_weak(tag):
+            response = Response(status=304)
+            _mark_cacheable(response, tag, versions)
+            return response
+
+        response = make_response(view(**kwargs))
+        if response.status_code == 200:
+            _mark_cacheable(response, tag, versions)
+        return response
+
+    return wrapper
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress(response):
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not response.mimetype.startswith(_COMPRESSIBLE_TYPES)
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    if encoding == "br":
+        body = brotli.compress(body, quality=min(COMPRESS_LEVEL, 11))
+    else:
+        body = gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def compressed(view):
+    @wraps(view)
+    def wrapper(**kwargs):
+        return _compress(make_response(view(**kwargs)))
+
+    return wrapper
@@ -0,0 +1,109 @@
+# schemas.py
+#
+# Response schemas for the large list endpoints. Views build these structs and return
+# json_response(...), which encodes straight to bytes with msgspec instead of going
+# through jsonify's dict-walking encoder. Field names match the JSON the frontend
+# already consumes; datetimes and dates encode as ISO 8601 exactly like isoformat().
+from datetime import date, datetime
+from typing import List, Optional
+
+import msgspec
+from flask import Response
+
+_encoder = msgspec.json.Encoder()
+
+
+class MessageOut(msgspec.Struct):
+    id: Optional[int]
+    user_id: Optional[int]
+    user: str
+    message: str
+    created_at: Optional[datetime]
+    user_image: str
+
+
+class SearchResultOut(MessageOut):
+    score: float
+
+
+class MemberOut(msgspec.Struct):
+    id: int
+    name: str
+    email: str
+    user_image: Optional[str]
+
+
+class GroupInfoOut(msgspec.Struct):
+    id: int
+    name: str
+    description: Optional[str]
+    created_by: Optional[str]
+    member_count: int
+
+
+class GroupCatalogEntry(GroupInfoOut):
+    member_preview: List[MemberOut]
+
+
+class GroupSummaryOut(GroupInfoOut):
+    is_member: bool
+    member_preview: List[MemberOut]
+
+
+class GroupSearchResultOut(GroupSummaryOut):
+    score: float
+
+
+class DashboardGroupOut(GroupSummaryOut):
+    completed_today: bool
+    streak: int
+    rank: Optional[int]
+    completion_count: int
+    unread_count: int
+
+
+class LeaderboardEntryOut(msgspec.Struct):
+    rank: int
+    user_id: int
+    user_name: str
+    user_picture: Optional[str]
+    completion_count: int
+    last_completed: Optional[date]
+    current_streak: int
+    longest_streak: int
+    streak_start: Optional[date]
+
+
+class ActivityOut(msgspec.Struct):
+    user_name: str
+    user_email: str
+    user_picture: Optional[str]
+    completed_date: date
+    days_ago: int
+
+
+class CompletionOut(msgspec.Struct):
+    id: int
+    group_id: int
+    user_id: int
+    user_name: str
+    user_picture: Optional[str]
+    completed_date: date
+    completed_at: datetime
+
+
+class AdminUserOut(msgspec.Struct):
+    id: int
+    name: str
+    email: str
+    picture: Optional[str]
+    group_count: int
+
+
+def member_out(user):
+    return MemberOut(id=user.id, name=user.name, email=user.email, user_image=user.picture)
+
+
+def json_response(payload, status=200):
+    """Encode structs (or dicts/lists containing them) into a JSON Response."""
+    return Response(_encoder.encode(payload), status=status, mimetype="application/json")
@@ -0,0 +1,210 @@
+# search.py
+#
+# Full-text indexes over chat messages and over group names/descriptions.
+#   SQLite:   FTS5 tables (messages_fts, groups_fts) keyed by row id, kept in sync by the views.
+#   Postgres: GIN indexes on to_tsvector('english', ...), maintained by Postgres itself.
+# Message search covers archived history too: archived rows keep their ids (and so their
+# messages_fts rows), and on Postgres messages_archive has its own GIN index.
+import re
+
+from sqlalchemy import text
+
+from .extensions import db
+
+SQLITE_FTS_TABLE = "messages_fts"
+POSTGRES_FTS_INDEX = "ix_messages_content_fts"
+POSTGRES_ARCHIVE_FTS_INDEX = "ix_messages_archive_content_fts"
+SQLITE_GROUPS_FTS_TABLE = "groups_fts"
+POSTGRES_GROUPS_FTS_INDEX = "ix_group_search_fts"
+# Must match the indexed expression exactly for Postgres to use the index.
+_POSTGRES_GROUP_DOCUMENT = "to_tsvector('english', g.name || ' ' || coalesce(g.description, ''))"
+
+
+def _dialect():
+    return db.engine.dialect.name
+
+
+def _sqlite_table_exists(name):
+    return db.session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": name},
+    ).first() is not None
+
+
+def ensure_search_index():
+    """Create the full-text indexes if they do not exist yet (backfilling them on SQLite)."""
+    dialect = _dialect()
+    if dialect == "sqlite":
+        if not _sqlite_table_exists(SQLITE_FTS_TABLE):
+            db.session.execute(text(
+                f"CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5("
+                "content, group_id UNINDEXED, tokenize = 'porter unicode61')"
+            ))
+            rebuild_search_index()
+        if not _sqlite_table_exists(SQLITE_GROUPS_FTS_TABLE):
+            db.session.execute(text(
+                f"CREATE VIRTUAL TABLE {SQLITE_GROUPS_FTS_TABLE} USING fts5("
+                "name, description, tokenize = 'porter unicode61')"
+            ))
+            rebuild_group_search_index()
+        db.session.commit()
+    elif dialect == "postgresql":
+        db.session.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {POSTGRES_FTS_INDEX} ON messages "
+            "USING GIN (to_tsvector('english', content))"
+        ))
+        db.session.execute(text(
+            f"CREATE INDEX IF NOT EXISTS {POSTGRES_ARCHIVE_FTS_INDEX} ON messages_archive "
+            "USING GIN (to_tsvector('english', content))"
+        ))
+        db.session.execute(text(
+            f'CREATE INDEX IF NOT EXISTS {POSTGRES_GROUPS_FTS_INDEX} ON "group" '
+            "USING GIN (to_tsvector('english', name || ' ' || coalesce(description, '')))"
+        ))
+        db.session.commit()
+
+
+def rebuild_search_index():
+    """Re-index every message and group (SQLite only; Postgres indexes are derived from the tables)."""
+    if _dialect() != "sqlite":
+        return
+    db.session.execute(text(f"DELETE FROM {SQLITE_FTS_TABLE}"))
+    db.session.execute(text(
+        f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, content, group_id) "
+        "SELECT id, content, group_id FROM messages "
+        "UNION ALL SELECT id, content, group_id FROM messages_archive"
+    ))
+    if _sqlite_table_exists(SQLITE_GROUPS_FTS_TABLE):
+        rebuild_group_search_index()
+
+
+def rebuild_group_search_index():
+    if _dialect() != "sqlite":
+        return
+    db.session.execute(text(f"DELETE FROM {SQLITE_GROUPS_FTS_TABLE}"))
+    db.session.execute(text(
+        f"INSERT INTO {SQLITE_GROUPS_FTS_TABLE} (rowid, name, description) "
+        'SELECT id, name, coalesce(description, \'\') FROM "group"'
+    ))
+
+
+def index_message(message):
+    """Add a flushed Message to the index, in the caller's transaction."""
+    index_message_rows([{"id": message.id, "content": message.content, "group_id": message.group_id}])
+
+
+def index_message_rows(rows):
+    """Bulk form of index_message; rows are dicts with id, content and group_id."""
+    if _dialect() != "sqlite" or not rows:
+        return
+    db.session.execute(
+        text(f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, content, group_id) VALUES (:id, :content, :group_id)"),
+        rows,
+    )
+
+
+def unindex_messages(message_ids):
+    if _dialect() != "sqlite" or not message_ids:
+        return
+    db.session.execute(
+        text(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = :id"),
+        [{"id": message_id} for message_id in message_ids],
+    )
+
+
+def unindex_group(group_id):
+    if _dialect() != "sqlite":
+        return
+    db.session.execute(
+        text(f"DELETE FROM {SQLITE_FTS_TABLE} WHERE group_id = :group_id"),
+        {"group_id": group_id},
+    )
+
+
+def index_group(group):
+    """Add a flushed Group's name and description to the index, in the caller's transaction."""
+    if _dialect() != "sqlite":
+        return
+    db.session.execute(
+        text(f"INSERT INTO {SQLITE_GROUPS_FTS_TABLE} (rowid, name, description) VALUES (:id, :name, :description)"),
+        {"id": group.id, "name": group.name, "description": group.description or ""},
+    )
+
+
+def unindex_groups(group_ids):
+    """Drop groups from the group search index (unindex_group drops a group's messages)."""
+    if _dialect() != "sqlite" or not group_ids:
+        return
+    db.session.execute(
+        text(f"DELETE FROM {SQLITE_GROUPS_FTS_TABLE} WHERE rowid = :id"),
+        [{"id": group_id} for group_id in group_ids],
+    )
+
+
+def _fts5_query(q, prefix=False):
+    # Quote every term so user input can never be parsed as FTS5 syntax; terms are ANDed.
+    terms = re.findall(r"\w+", q)
+    suffix = "*" if prefix else ""
+    return " ".join('"' + term + '"' + suffix for term in terms)
+
+
+def search_message_ids(group_id, q, limit, offset):
+    """Return [(message_id, score)] best match first; higher score is better.
+
+    Ids may belong to `messages` or `messages_archive`.
+    """
+    if _dialect() == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return []
+        rows = db.session.execute(
+            text(
+                f"SELECT rowid AS id, -bm25({SQLITE_FTS_TABLE}) AS score FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH :match AND group_id = :group_id "
+                "ORDER BY score DESC, id DESC LIMIT :limit OFFSET :offset"
+            ),
+            {"match": match, "group_id": group_id, "limit": limit, "offset": offset},
+        ).all()
+    else:
+        hits = " UNION ALL ".join(
+            "SELECT m.id AS id, ts_rank_cd(to_tsvector('english', m.content), query) AS score "
+            f"FROM {table} m, plainto_tsquery('english', :q) query "
+            "WHERE m.group_id = :group_id AND to_tsvector('english', m.content) @@ query"
+            for table in ("messages", "messages_archive")
+        )
+        rows = db.session.execute(
+            text(f"SELECT id, score FROM ({hits}) hits ORDER BY score DESC, id DESC LIMIT :limit OFFSET :offset"),
+            {"q": q, "group_id": group_id, "limit": limit, "offset": offset},
+        ).all()
+    return [(row.id, float(row.score)) for row in rows]
+
+
+def search_group_ids(q, limit):
+    """Return up to `limit` [(group_id, score)] by text relevance; terms match as prefixes."""
+    if _dialect() == "sqlite":
+        match = _fts5_query(q, prefix=True)
+        if not match:
+            return []
+        rows = db.session.execute(
+            text(
+                # Name matches weigh three times as much as description matches.
+                f"SELECT rowid AS id, -bm25({SQLITE_GROUPS_FTS_TABLE}, 3.0, 1.0) AS score "
+                f"FROM {SQLITE_GROUPS_FTS_TABLE} WHERE {SQLITE_GROUPS_FTS_TABLE} MATCH :match "
+                "ORDER BY score DESC, id LIMIT :limit"
+            ),
+            {"match": match, "limit": limit},
+        ).all()
+    else:
+        terms = re.findall(r"\w+", q)
+        if not terms:
+            return []
+        rows = db.session.execute(
+            text(
+                f"SELECT g.id AS id, ts_rank_cd({_POSTGRES_GROUP_DOCUMENT}, query) AS score "
+                "FROM \"group\" g, to_tsquery('english', :query) query "
+                f"WHERE {_POSTGRES_GROUP_DOCUMENT} @@ query "
+                "ORDER BY score DESC, g.id LIMIT :limit"
+            ),
+            {"query": " & ".join(term + ":*" for term in terms), "limit": limit},
+        ).all()
+    return [(row.id, float(row.score)) for row in rows]
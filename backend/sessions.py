@@ -0,0 +1,102 @@
+# sessions.py
+#
+# Selectable session storage (SESSION_BACKEND):
+#   sqlalchemy  server-side rows in the app database (default; one read, often a write, per request)
+#   cookie      Flask's signed cookie; no storage round trip, but data is capped at ~4 KB and a
+#               session cannot be revoked server-side before it expires
+#   redis       server-side in Redis at SESSION_REDIS_URL
+#   local       server-side in this process's memory: a stand-in for Redis in development and
+#               tests; sessions are lost on restart and not shared between workers
+#
+# Server-side backends get a short in-process read cache (SESSION_READ_CACHE_TTL seconds) and
+# only re-write an unmodified session to refresh its expiry every SESSION_REFRESH_INTERVAL seconds.
+import copy
+import os
+import warnings
+
+from flask_session import Session
+from sqlalchemy.exc import SAWarning
+
+from .cache import TTLCache
+from .extensions import db
+
+SESSION_BACKENDS = ("sqlalchemy", "cookie", "redis", "local")
+
+
+class _CachedSessionStore:
+    """Mixed in ahead of a Flask-Session interface class to cache reads and throttle refreshes."""
+
+    read_cache = None
+    refreshed = None
+
+    def _retrieve_session_data(self, store_id):
+        data = self.read_cache.get(store_id)
+        if data is None:
+            data = super()._retrieve_session_data(store_id)
+            if data is None:
+                return None
+            self.read_cache.set(store_id, data)
+        # Views may mutate nested values; never hand out the cached object itself.
+        return copy.deepcopy(data)
+
+    def _upsert_session(self, session_lifetime, session, store_id):
+        super()._upsert_session(session_lifetime, session, store_id)
+        self.read_cache.set(store_id, copy.deepcopy(dict(session)))
+        self.refreshed.set(store_id, True)
+
+    def _delete_session(self, store_id):
+        self.read_cache.delete(store_id)
+        self.refreshed.delete(store_id)
+        super()._delete_session(store_id)
+
+    def should_set_storage(self, app, session):
+        if session.modified:
+            return True
+        if not app.config["SESSION_REFRESH_EACH_REQUEST"]:
+            return False
+        return self.refreshed.get(self._get_store_id(session.sid)) is None
+
+
+def _add_read_cache(app, read_ttl, refresh_interval):
+    interface = app.session_interface
+    base = type(interface)
+    interface.__class__ = type(f"Cached{base.__name__}", (_CachedSessionStore, base), {})
+    interface.read_cache = TTLCache("session_reads", ttl=read_ttl, maxsize=10000)
+    interface.refreshed = TTLCache("session_refreshes", ttl=refresh_interval, maxsize=10000)
+
+
+def init_sessions(app, backend=None):
+    backend = (backend or os.getenv("SESSION_BACKEND", "sqlalchemy")).lower()
+    if backend not in SESSION_BACKENDS:
+        raise ValueError(f"SESSION_BACKEND must be one of {', '.join(SESSION_BACKENDS)}, got {backend!r}")
+    app.config["SESSION_BACKEND"] = backend
+
+    if backend == "cookie":
+        # Flask's default SecureCookieSessionInterface, signed with app.secret_key
+        return
+
+    if backend == "sqlalchemy":
+        app.config["SESSION_TYPE"] = "sqlalchemy"
+        app.config["SESSION_SQLALCHEMY"] = db
+        # Flask-Session declares its model on db.Model; drop an earlier app's declaration first.
+        table = db.metadata.tables.get(app.config.get("SESSION_SQLALCHEMY_TABLE", "sessions"))
+        if table is not None:
+            db.metadata.remove(table)
+            warnings.filterwarnings("ignore", "This declarative base already contains a class", SAWarning)
+    elif backend == "redis":
+        import redis
+
+        app.config["SESSION_TYPE"] = "redis"
+        app.config["SESSION_REDIS"] = redis.Redis.from_url(os.getenv("SESSION_REDIS_URL", "redis://127.0.0.1:6379/0"))
+    elif backend == "local":
+        from cachelib import SimpleCache
+
+        app.config["SESSION_TYPE"] = "cachelib"
+        app.config["SESSION_CACHELIB"] = SimpleCache(threshold=10000, default_timeout=0)
+
+    Session(app)
+
+    read_ttl = float(os.getenv("SESSION_READ_CACHE_TTL", "2"))
+    refresh_interval = float(os.getenv("SESSION_REFRESH_INTERVAL", "60"))
+    if backend != "local" and read_ttl > 0:
+        _add_read_cache(app, read_ttl, refresh_interval)
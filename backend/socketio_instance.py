@@ -1,4 +1,68 @@
+import os
+import pickle
+import queue
+import threading
+
 from flask_socketio import SocketIO
+from socketio import PubSubManager
 
 # Initialize SocketIO
 socketio = SocketIO(cors_allowed_origins="*")
+
+
+class LocalPubSubManager(PubSubManager):
+    """In-process stand-in for the Redis message queue.
+
+    Every manager created on the same channel in this process sees the others'
+    emits, the same way separate gunicorn workers do through Redis. Useful for
+    tests and for exercising the multi-worker code path without a Redis server.
+    """
+
+    name = "local"
+    _subscribers = {}  # channel -> list of queues
+    _lock = threading.Lock()
+
+    def __init__(self, url="local://", channel="flask-socketio", write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self._queue = queue.Queue()
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(self._queue)
+
+    def _publish(self, data):
+        payload = pickle.dumps(data)
+        with self._lock:
+            subscribers = list(self._subscribers.get(self.channel, []))
+        for q in subscribers:
+            q.put(payload)
+
+    def _listen(self):
+        while True:
+            yield self._queue.get()
+
+
+_local_managers = {}  # channel -> the process's LocalPubSubManager
+
+
+def message_queue_options():
+    """Build the client-manager kwargs for socketio.init_app from the environment.
+
+    SOCKETIO_MESSAGE_QUEUE:
+      - unset            single process, rooms live in memory (default)
+      - redis://...      fan out through Redis so any worker can reach any room
+      - local://         in-process stand-in (tests / single-box experiments)
+    SOCKETIO_CHANNEL picks the pub/sub channel name (default "flask-socketio").
+
+    The app can be built more than once per process (gunicorn calls create_app() after
+    importing backend.app, which builds one too). A local:// manager is created once per
+    channel and reused, since every one subscribes a queue that only a running server drains.
+    """
+    url = os.getenv("SOCKETIO_MESSAGE_QUEUE")
+    if not url:
+        return {}
+
+    channel = os.getenv("SOCKETIO_CHANNEL", "flask-socketio")
+    if url.startswith("local://"):
+        if channel not in _local_managers:
+            _local_managers[channel] = LocalPubSubManager(url, channel=channel)
+        return {"client_manager": _local_managers[channel]}
+    return {"message_queue": url, "channel": channel}
@@ -0,0 +1,129 @@
+# streaks.py
+#
+# Habit streaks per (group, user), stored on group_member_stats next to the leaderboard
+# counters (member_stats.py):
+#   current_streak  length of the run of consecutive days ending at last_completed
+#   streak_start    first day of that run
+#   longest_streak  longest run ever
+#
+# A completion dated on or after the member's latest one is folded in by SQL CASE
+# expressions inside the completion upsert, in O(1) and without a read. Same-day
+# duplicates leave the streak alone. A completion dated before the latest one (a backfill)
+# can join or split older runs, so it is handled by recompute_streaks(), which rebuilds
+# the affected rows from user_activity. The stored run only counts as the *current*
+# streak while it is still alive, i.e. last_completed is today or yesterday.
+from datetime import timedelta
+
+from .extensions import db
+from .models import GroupMemberStats, UserActivity
+
+RANK_OPTIONS = ("completions", "current_streak", "longest_streak")
+
+
+def streak_runs(dates):
+    """(current run length, its start, longest run) for dates sorted ascending, duplicates allowed."""
+    current, start, longest, previous = 0, None, 0, None
+    for day in dates:
+        if day == previous:
+            continue
+        if previous is not None and day == previous + timedelta(days=1):
+            current += 1
+        else:
+            current, start = 1, day
+        longest = max(longest, current)
+        previous = day
+    return current, start, longest
+
+
+def live_streak(current_streak, last_completed, today):
+    """The stored run if it can still be extended today, else 0."""
+    if last_completed is None or last_completed < today - timedelta(days=1):
+        return 0
+    return current_streak
+
+
+def live_streak_column(today):
+    """SQL form of live_streak() over group_member_stats, for ordering."""
+    return db.case(
+        (GroupMemberStats.last_completed >= today - timedelta(days=1), GroupMemberStats.current_streak),
+        else_=0,
+    )
+
+
+def leaderboard_rank(rank_by, today, partition_by=None):
+    """row_number() over group_member_stats in leaderboard order (one of RANK_OPTIONS).
+
+    Ties go to the lower user id, as in the leaderboard store, so every view of a member's
+    rank agrees.
+    """
+    order = {
+        "completions": [GroupMemberStats.completion_count.desc()],
+        "current_streak": [live_streak_column(today).desc(), GroupMemberStats.completion_count.desc()],
+        "longest_streak": [GroupMemberStats.longest_streak.desc(), GroupMemberStats.completion_count.desc()],
+    }[rank_by]
+    return db.func.row_number().over(partition_by=partition_by, order_by=[*order, GroupMemberStats.user_id])
+
+
+def streak_insert_values(completed_date):
+    return {"current_streak": 1, "longest_streak": 1, "streak_start": completed_date}
+
+
+def streak_update_values(table, completed_date):
+    """SET clause for an existing stats row gaining a completion on `completed_date`."""
+    last = table.c.last_completed
+    extends = last == completed_date - timedelta(days=1)
+    restarts = db.or_(last.is_(None), last < completed_date - timedelta(days=1))
+    current = db.case(
+        (extends, table.c.current_streak + 1),
+        (restarts, 1),
+        else_=table.c.current_streak,  # same day again, or a backfill (see recompute_streaks)
+    )
+    return {
+        "current_streak": current,
+        "longest_streak": db.case((current > table.c.longest_streak, current), else_=table.c.longest_streak),
+        "streak_start": db.case((restarts, completed_date), else_=table.c.streak_start),
+    }
+
+
+def recompute_streaks(group_ids=None, pairs=None):
+    """Rebuild streak columns from user_activity for some groups, some (group_id, user_id)
+    pairs, or everything. One ordered scan of the matching activity dates; the caller commits.
+    Returns the number of stats rows updated.
+    """
+    query = (
+        db.select(UserActivity.group_id, UserActivity.user_id, UserActivity.completed_date)
+        .distinct()
+        .order_by(UserActivity.group_id, UserActivity.user_id, UserActivity.completed_date)
+    )
+    if group_ids is not None:
+        query = query.where(UserActivity.group_id.in_(group_ids))
+    if pairs is not None:
+        query = query.where(db.tuple_(UserActivity.group_id, UserActivity.user_id).in_(pairs))
+
+    dates = {}
+    for row in db.session.execute(query):
+        dates.setdefault((row.group_id, row.user_id), []).append(row.completed_date)
+
+    updates = []
+    for (group_id, user_id), days in dates.items():
+        current, start, longest = streak_runs(days)
+        updates.append({
+            "g_id": group_id,
+            "u_id": user_id,
+            "current_streak": current,
+            "longest_streak": longest,
+            "streak_start": start,
+        })
+    if updates:
+        table = GroupMemberStats.__table__
+        db.session.execute(
+            db.update(table)
+            .where(table.c.group_id == db.bindparam("g_id"), table.c.user_id == db.bindparam("u_id"))
+            .values(
+                current_streak=db.bindparam("current_streak"),
+                longest_streak=db.bindparam("longest_streak"),
+                streak_start=db.bindparam("streak_start"),
+            ),
+            updates,
+        )
+    return len(updates)
@@ -2,9 +2,17 @@
 
 from .views import (
     discover_groups,
+    search_groups,
+    get_group_members,
     send_message_to_group,
     get_messages,
+    search_messages,
+    sync,
+    dashboard,
+    mark_group_read,
     join_group,
+    bulk_join_groups,
+    bulk_leave_groups,
     create_group,
     delete_group,
     google_login,
@@ -25,39 +33,69 @@ from .views import (
     admin_list_users,
     admin_delete_group,
     admin_delete_user,
+    admin_cache_stats,
+    admin_bulk_join,
+    admin_bulk_leave,
     secret_tracking,
 )
 
+from .responses import catalog_resource, compressed, group_resource, versioned
+
 def setup_routes(app):
     routes = [
         {"path": "/api/google/login", "view_func": google_login, "methods": ["GET"]},
         {"path": "/api/google/callback", "view_func": google_callback, "methods": ["GET"]},
         {"path": "/api/logout", "view_func": logout, "methods": ["POST"]},
         {"path": "/api/profile", "view_func": profile, "methods": ["GET"]},
-        {"path": "/api/groups/discover", "view_func": discover_groups, "methods": ["GET"]},
+        {"path": "/api/groups/discover", "view_func": discover_groups, "methods": ["GET"],
+         "versioned_by": catalog_resource, "per_user": True, "compress": True},
+        {"path": "/api/groups/search", "view_func": search_groups, "methods": ["GET"], "compress": True},
+        {"path": "/api/groups/<int:group_id>/members", "view_func": get_group_members, "methods": ["GET"], "compress": True},
         {"path": "/api/groups/<int:group_id>/join", "view_func": join_group, "methods": ["POST"]},
+        {"path": "/api/groups/bulk-join", "view_func": bulk_join_groups, "methods": ["POST"]},
+        {"path": "/api/groups/bulk-leave", "view_func": bulk_leave_groups, "methods": ["POST"]},
         {"path": "/api/groups/create", "view_func": create_group, "methods": ["POST"]},
-        {"path": "/api/groups/<int:group_id>/messages", "view_func": get_messages, "methods": ["GET"]},
+        {"path": "/api/groups/<int:group_id>/messages", "view_func": get_messages, "methods": ["GET"],
+         "versioned_by": group_resource, "compress": True},
+        {"path": "/api/groups/<int:group_id>/messages/search", "view_func": search_messages, "methods": ["GET"], "compress": True},
         {"path": "/api/groups/<int:group_id>/send-message", "view_func": send_message_to_group, "methods": ["POST"]},
         {"path": "/api/groups/<int:group_id>/complete", "view_func": complete_activity, "methods": ["POST"]},
-        {"path": "/api/groups/<int:group_id>/leaderboard", "view_func": get_leaderboard, "methods": ["GET"]},
-        {"path": "/api/groups/<int:group_id>/activity", "view_func": get_group_activity, "methods": ["GET"]},
+        {"path": "/api/groups/<int:group_id>/leaderboard", "view_func": get_leaderboard, "methods": ["GET"],
+         "versioned_by": group_resource, "per_user": True, "daily": True, "compress": True},
+        {"path": "/api/groups/<int:group_id>/activity", "view_func": get_group_activity, "methods": ["GET"],
+         "versioned_by": group_resource, "daily": True, "compress": True},
         {"path": "/api/groups/<int:group_id>/check-habit", "view_func": check_habit_completion, "methods": ["GET"]},
         {"path": "/api/groups/<int:group_id>/delete", "view_func": delete_group, "methods": ["DELETE"]},
         {"path": "/api/groups/<int:group_id>/leave", "view_func": leave_group, "methods": ["POST"]},
         {"path": "/api/messages/<int:message_id>/delete", "view_func": delete_message, "methods": ["DELETE"]},
+        {"path": "/api/sync", "view_func": sync, "methods": ["GET"], "compress": True},
+        {"path": "/api/me/dashboard", "view_func": dashboard, "methods": ["GET"], "compress": True},
+        {"path": "/api/groups/<int:group_id>/read", "view_func": mark_group_read, "methods": ["POST"]},
         {"path": "/test", "view_func": test_redis, "methods": ["POST", "GET"]},
         {"path": "/api/add_secret", "view_func": seed_demo_data, "methods": ["GET", "POST"]},
         {"path": "/api/admin/groups", "view_func": admin_list_groups, "methods": ["GET"]},
-        {"path": "/api/admin/users", "view_func": admin_list_users, "methods": ["GET"]},
+        {"path": "/api/admin/users", "view_func": admin_list_users, "methods": ["GET"], "compress": True},
+        {"path": "/api/admin/cache-stats", "view_func": admin_cache_stats, "methods": ["GET"]},
+        {"path": "/api/admin/memberships/bulk-join", "view_func": admin_bulk_join, "methods": ["POST"]},
+        {"path": "/api/admin/memberships/bulk-leave", "view_func": admin_bulk_leave, "methods": ["POST"]},
         {"path": "/api/admin/groups/<int:group_id>", "view_func": admin_delete_group, "methods": ["DELETE"]},
         {"path": "/api/admin/users/<int:user_id>", "view_func": admin_delete_user, "methods": ["DELETE"]},
         {"path": "/api/secret-tracking", "view_func": secret_tracking, "methods": ["GET"]},
     ]
 
+    # Optional per-route response layers (see responses.py):
+    #   versioned_by  resource(**view_args) -> version keys; enables ETag/304 (with per_user, daily)
+    #   compress      gzip/brotli for large bodies
     for route in routes:
+        view_func = route["view_func"]
+        if "versioned_by" in route:
+            view_func = versioned(
+                view_func, route["versioned_by"], per_user=route.get("per_user", False), daily=route.get("daily", False)
+            )
+        if route.get("compress"):
+            view_func = compressed(view_func)
         app.add_url_rule(
             route["path"],
-            view_func=route["view_func"],
+            view_func=view_func,
             methods=route["methods"],
         )
@@ -0,0 +1,73 @@
+# user_cache.py
+import os
+
+from flask import g, session
+
+from .cache import TTLCache
+from .extensions import db
+from .models import User
+
+# user_id -> {"name": ..., "picture": ...}; used to render message authors at read time
+_profiles = TTLCache(
+    "user_profiles",
+    ttl=int(os.getenv("USER_PROFILE_CACHE_TTL", "300")),
+    maxsize=int(os.getenv("USER_PROFILE_CACHE_SIZE", "10000")),
+)
+
+# user_id -> email of users known to still exist; lets authenticated views trust session["user"]["id"]
+_identities = TTLCache(
+    "user_identities",
+    ttl=int(os.getenv("USER_IDENTITY_CACHE_TTL", "300")),
+    maxsize=int(os.getenv("USER_IDENTITY_CACHE_SIZE", "10000")),
+)
+
+
+def _resolve_user_id(user):
+    user_id = user.get("id")
+    if user_id is None:
+        # Session from before ids were stored: look the user up once and upgrade the session.
+        user_id = db.session.scalar(db.select(User.id).where(User.email == user.get("email")))
+        if user_id is None:
+            return None
+        session["user"] = {**user, "id": user_id}
+        _identities.set(user_id, user.get("email"))
+        return user_id
+
+    email = _identities.get(user_id)
+    if email is None:
+        email = db.session.scalar(db.select(User.email).where(User.id == user_id))
+        if email is None:
+            return None
+        _identities.set(user_id, email)
+    # Ids of deleted users can be reused; never hand one to a different account's session.
+    return user_id if email == user.get("email") else None
+
+
+def current_user_id():
+    """Id of the logged-in user (None if logged out or deleted), resolved once per request."""
+    if "user_id" not in g:
+        user = session.get("user")
+        g.user_id = _resolve_user_id(user) if user else None
+    return g.user_id
+
+
+def get_user_profiles(user_ids):
+    """Map user ids to {"name", "picture"}, loading any cache misses in one query."""
+    ids = {uid for uid in user_ids if uid is not None}
+    profiles = _profiles.get_many(ids)
+    missing = ids - profiles.keys()
+    if missing:
+        rows = (
+            db.session.query(User.id, User.name, User.picture)
+            .filter(User.id.in_(missing))
+            .all()
+        )
+        loaded = {row.id: {"name": row.name, "picture": row.picture} for row in rows}
+        _profiles.set_many(loaded)
+        profiles.update(loaded)
+    return profiles
+
+
+def invalidate_user(user_id):
+    _profiles.delete(user_id)
+    _identities.delete(user_id)
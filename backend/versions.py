@@ -0,0 +1,84 @@
+# versions.py
+#
+# Version counters behind the conditional GETs in responses.py. Every write that records a
+# ChangeLog row bumps its group's counter in the same transaction (see changes.py), and
+# membership changes also bump the catalog counter. A counter row is updated rather than
+# appended, so a bump becomes visible exactly when the data it describes commits, and
+# concurrent writers to one group serialize on its row.
+from datetime import datetime
+
+from flask import g
+
+from .extensions import db
+from .models import ResourceVersion
+
+CATALOG_KEY = "catalog"
+
+
+def group_key(group_id):
+    return f"group:{int(group_id)}"
+
+
+def bump_versions(keys):
+    """Increment each key's counter (creating it at 1) as part of the current transaction.
+
+    Returns {key: new version}, which becomes the committed version when the transaction does.
+    """
+    keys = sorted(set(keys))  # fixed lock order across writers
+    if not keys:
+        return {}
+    now = datetime.utcnow()
+    table = ResourceVersion.__table__
+    dialect = db.engine.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values([{"key": key, "version": 1, "updated_at": now} for key in keys])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={"version": table.c.version + 1, "updated_at": now},
+        ).returning(table.c.key, table.c.version)
+        return dict(db.session.execute(stmt).all())
+    for key in keys:
+        updated = db.session.execute(
+            db.update(table).where(table.c.key == key).values(version=table.c.version + 1, updated_at=now)
+        )
+        if updated.rowcount == 0:
+            db.session.execute(db.insert(table).values(key=key, version=1, updated_at=now))
+    return {key: version for key, (version, _) in get_versions(keys).items()}
+
+
+def get_versions(keys):
+    """{key: (version, updated_at)} for the keys that have been bumped at least once."""
+    rows = db.session.execute(
+        db.select(ResourceVersion.key, ResourceVersion.version, ResourceVersion.updated_at)
+        .where(ResourceVersion.key.in_(list(keys)))
+    ).all()
+    return {row.key: (row.version, row.updated_at) for row in rows}
+
+
+def remember_versions(keys, versions):
+    """Stash the versions of `keys` a request was validated against, for known_version()."""
+    g.resource_versions = {key: versions.get(key, (0, None))[0] for key in keys}
+
+
+def known_version(key):
+    """The version of `key` this request already read, or None if it has not read one.
+
+    Process-local caches compare it with the version they were filled at, so they never
+    serve data older than the ETag the response will carry.
+    """
+    versions = g.get("resource_versions")
+    if versions is None:
+        return None
+    return versions.get(key)
+
+
+def current_version(key):
+    """known_version(key) when the request has it, else the committed version (one primary-key read)."""
+    version = known_version(key)
+    if version is None:
+        version = get_versions([key]).get(key, (0, None))[0]
+    return version
@@ -3,18 +3,59 @@
 from flask import redirect, request, jsonify, session
 from flask_socketio import send, join_room, leave_room, emit
 from .socketio_instance import socketio  # Import the SocketIO instance
+from .broadcast import broadcaster
+from .write_behind import message_writer
+from .message_buffer import recent_messages
+from .cache import cache_stats
+from .archive import messages_before, messages_after
+from .catalog import get_catalog, invalidate_catalog, find_entry
+from .memberships import BULK_MAX_PAIRS, bulk_join, bulk_leave, summarize
+from .schemas import (
+    json_response,
+    member_out,
+    GroupInfoOut,
+    GroupSummaryOut,
+    GroupSearchResultOut,
+    DashboardGroupOut,
+    MessageOut,
+    SearchResultOut,
+    LeaderboardEntryOut,
+    ActivityOut,
+    CompletionOut,
+    AdminUserOut,
+)
+from .user_cache import current_user_id, get_user_profiles, invalidate_user
+from .membership_cache import group_member_ids, invalidate_memberships, is_member
+from .member_stats import rebuild_member_stats
+from .completions import add_completion
+from .leaderboard_store import (
+    Standing,
+    invalidate_leaderboards,
+    leaderboard_page,
+    record_leaderboard_completion,
+)
+from .streaks import RANK_OPTIONS, leaderboard_rank, live_streak
+from .windows import window_bounds, windowed_standings
+from .search import index_message, unindex_messages, unindex_group, search_message_ids
+from .search import index_group, unindex_groups, search_group_ids
+from . import changes
+from .changes import record_change, record_changes, record_group_deleted
+from .versions import CATALOG_KEY, bump_versions, group_key, known_version
 from .models import Message
 from .extensions import db
 from oauthlib.oauth2 import WebApplicationClient
 import requests
 import os
 import re
+import math
+import uuid
+from bisect import bisect_right
 from typing import Optional
 from urllib.parse import urlparse, urlunparse
 from .models import Group,GroupMember, User, UserActivity
-from .models import Group, GroupMember, User, UserActivity
-from sqlalchemy.exc import SQLAlchemyError
-from datetime import datetime, date
+from .models import Group, GroupMember, User, UserActivity, ChangeLog, MessageArchive, GroupReadState, GroupMemberStats
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from datetime import datetime, date, timedelta
 
 next_group_id = 1
 
@@ -142,6 +183,7 @@ def google_callback():
 
     # Set session data
     session["user"] = {
+        "id": user.id,
         "name": user.name,
         "email": user.email,
         "picture": user.picture
@@ -198,28 +240,43 @@ def create_group():
 
     if not group_name or not group_description:
         return jsonify({"error": "Group name and description are required"}), 400
+    user_id = current_user_id()
+    if user_id is None:
+        return jsonify({"error": "User not found"}), 404
+
     # Create the group
-    new_group = Group(name=group_name, description=group_description)
+    new_group = Group(name=group_name, description=group_description, creator_id=user_id)
     db.session.add(new_group)
     db.session.flush()  # Flush to get the group ID
-
-    # Find the user in the database
-    user_obj = User.query.filter_by(email=user_email).first()
-    if not user_obj:
-        return jsonify({"error": "User not found"}), 404
+    index_group(new_group)
 
     # Create a GroupMember entry
-    group_member = GroupMember(user_id=user_obj.id, group_id=new_group.id)
+    group_member = GroupMember(user_id=user_id, group_id=new_group.id)
     db.session.add(group_member)
+    record_change(new_group.id, changes.MEMBER_JOINED, user_id=user_id)
 
     # Commit all changes
     db.session.commit()
+    invalidate_catalog()
+    invalidate_memberships([user_id])
 
     return jsonify({
         "message": f"Group '{group_name}' created successfully!",
         "group": new_group.to_dict()
     })
 
+DISCOVER_PAGE_SIZE = 24
+DISCOVER_MAX_PAGE_SIZE = 100
+ROSTER_PAGE_SIZE = 100
+ROSTER_MAX_PAGE_SIZE = 500
+
+
+def _joined_group_ids(user_id):
+    return set(db.session.scalars(
+        db.select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+    ))
+
+
 def discover_groups():
     # Check if the user is logged in
     user = session.get("user")
@@ -227,87 +284,286 @@ def discover_groups():
         return jsonify({"error": "Not logged in"}), 401
 
     try:
-        available_groups = Group.query.all()
-        groups_data = [group.to_dict() for group in available_groups]
+        limit = _int_arg("limit", DISCOVER_PAGE_SIZE, 1, DISCOVER_MAX_PAGE_SIZE)
+        after_id = _int_arg("after_id", 0, 0)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    membership = request.args.get("membership")
+    if membership not in (None, "", "joined", "not_joined"):
+        return jsonify({"error": "membership must be 'joined' or 'not_joined'"}), 400
+
+    try:
+        catalog = get_catalog()
+        joined_ids = _joined_group_ids(current_user_id())
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-    return jsonify({"groups": groups_data})
+    groups_data = []
+    has_more = False
+    for entry in catalog[bisect_right(catalog, after_id, key=lambda e: e.id):]:
+        is_member = entry.id in joined_ids
+        if (membership == "joined" and not is_member) or (membership == "not_joined" and is_member):
+            continue
+        if len(groups_data) == limit:
+            has_more = True
+            break
+        groups_data.append(GroupSummaryOut(
+            id=entry.id,
+            name=entry.name,
+            description=entry.description,
+            created_by=entry.created_by,
+            member_count=entry.member_count,
+            is_member=is_member,
+            member_preview=entry.member_preview,
+        ))
+
+    return json_response({
+        "groups": groups_data,
+        "next_cursor": groups_data[-1].id if has_more else None,
+    })
+
+
+GROUP_SEARCH_PAGE_SIZE = 20
+# Only the best text matches are re-ranked, so latency tracks the candidate count, not the catalog.
+GROUP_SEARCH_CANDIDATES = 200
+GROUP_ACTIVITY_WINDOW_DAYS = 14
+
+
+def _group_search_score(relevance, recent_completions, member_count):
+    # Text relevance decides; activity and size lift it logarithmically so big groups can't drown it.
+    return relevance * (1 + 0.5 * math.log1p(recent_completions) + 0.25 * math.log1p(member_count))
+
+
+def search_groups():
+    """Ranked group search over name and description, paginated with offset/limit."""
+    user = session.get("user")
+    if not user:
+        return jsonify({"error": "Not logged in"}), 401
+
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Query parameter q is required"}), 400
+    try:
+        limit = _int_arg("limit", GROUP_SEARCH_PAGE_SIZE, minimum=1, maximum=DISCOVER_MAX_PAGE_SIZE)
+        offset = _int_arg("offset", 0, minimum=0)
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+
+    candidates = search_group_ids(q, GROUP_SEARCH_CANDIDATES)
+    # Read after the index, at the committed version, so every indexed group is in it
+    catalog = get_catalog()
+    entries = {gid: find_entry(catalog, gid) for gid, _ in candidates}
+    since = date.today() - timedelta(days=GROUP_ACTIVITY_WINDOW_DAYS)
+    recent = dict(
+        db.session.query(UserActivity.group_id, db.func.count(UserActivity.id))
+        .filter(UserActivity.group_id.in_(list(entries)), UserActivity.completed_date >= since)
+        .group_by(UserActivity.group_id)
+        .all()
+    ) if entries else {}
+    joined_ids = _joined_group_ids(current_user_id())
+
+    ranked = sorted(
+        (
+            (_group_search_score(relevance, recent.get(gid, 0), entries[gid].member_count), entries[gid])
+            for gid, relevance in candidates
+            if entries[gid] is not None  # deleted since the index was read
+        ),
+        key=lambda pair: (-pair[0], pair[1].id),
+    )
+    page = ranked[offset:offset + limit]
+    results = [
+        GroupSearchResultOut(
+            id=entry.id,
+            name=entry.name,
+            description=entry.description,
+            created_by=entry.created_by,
+            member_count=entry.member_count,
+            is_member=entry.id in joined_ids,
+            member_preview=entry.member_preview,
+            score=score,
+        )
+        for score, entry in page
+    ]
+
+    return json_response({
+        "query": q,
+        "results": results,
+        "next_offset": offset + limit if len(ranked) > offset + limit else None,
+    })
+
+
+def get_group_members(group_id):
+    user = session.get("user")
+    if not user:
+        return jsonify({"error": "Not logged in"}), 401
+
+    try:
+        limit = _int_arg("limit", ROSTER_PAGE_SIZE, 1, ROSTER_MAX_PAGE_SIZE)
+        after_id = _int_arg("after_id", 0, 0)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    group = db.session.get(Group, group_id)
+    if not group:
+        return jsonify({"error": "Group not found"}), 404
+
+    member_count = db.session.scalar(
+        db.select(db.func.count(GroupMember.id)).where(GroupMember.group_id == group_id)
+    )
+    # Cursor is the membership row id, so pages follow join order.
+    rows = db.session.execute(
+        db.select(GroupMember.id.label("member_id"), User.id, User.name, User.email, User.picture)
+        .join(User, User.id == GroupMember.user_id)
+        .where(GroupMember.group_id == group_id, GroupMember.id > after_id)
+        .order_by(GroupMember.id)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return json_response({
+        "group": GroupInfoOut(
+            id=group.id,
+            name=group.name,
+            description=group.description,
+            created_by=group.creator.email if group.creator else None,
+            member_count=member_count,
+        ),
+        "members": [member_out(row) for row in rows],
+        "next_cursor": rows[-1].member_id if has_more else None,
+    })
 
 def join_group(group_id):
     user_info = session.get("user")
     if not user_info:
         return jsonify({"error": "Not logged in"}), 401
 
-    user_email = user_info.get("email")
-    if not user_email:
-        return jsonify({"error": "Invalid user session"}), 400
-
     try:
-        user = User.query.filter_by(email=user_email).first()
-        if not user:
+        user_id = current_user_id()
+        if user_id is None:
             return jsonify({"error": "User not found"}), 404
 
         group = Group.query.get(group_id)
         if not group:
             return jsonify({"error": "Group not found"}), 404
 
-        existing_membership = GroupMember.query.filter_by(user_id=user.id, group_id=group.id).first()
+        existing_membership = GroupMember.query.filter_by(user_id=user_id, group_id=group.id).first()
         if existing_membership:
             return jsonify({"message": "You are already a member of this group."}), 400
 
-        new_membership = GroupMember(user_id=user.id, group_id=group.id)
+        new_membership = GroupMember(user_id=user_id, group_id=group.id)
         db.session.add(new_membership)
+        record_change(group.id, changes.MEMBER_JOINED, user_id=user_id)
         db.session.commit()
+        invalidate_catalog()
+        invalidate_memberships([user_id])
         db.session.refresh(group)
 
         return jsonify({"message": f"Joined group '{group.name}' successfully!"}), 200
 
+    except IntegrityError:
+        # A concurrent request inserted the same membership first.
+        db.session.rollback()
+        return jsonify({"message": "You are already a member of this group."}), 400
     except SQLAlchemyError as e:
         db.session.rollback()
         return jsonify({"error": "An error occurred while joining the group."}), 500
     except Exception as e:
         return jsonify({"error": "An unexpected error occurred."}), 500
 
-def complete_activity(group_id):
+def _bulk_group_ids():
+    """group_ids from the JSON body of a bulk join/leave; raises ValueError on bad input."""
+    group_ids = (request.get_json(silent=True) or {}).get("group_ids")
+    if not isinstance(group_ids, list) or not group_ids:
+        raise ValueError("group_ids must be a non-empty list")
+    if len(group_ids) > BULK_MAX_PAIRS:
+        raise ValueError(f"At most {BULK_MAX_PAIRS} groups per request")
+    if not all(isinstance(g, int) for g in group_ids):
+        raise ValueError("group_ids must be integers")
+    return group_ids
+
+
+def bulk_join_groups():
+    """Join many groups at once: one transaction, one result per requested group."""
     user = session.get("user")
     if not user:
         return jsonify({"error": "Not logged in"}), 401
 
-    group = Group.query.get(group_id)
-    if not group:
-        return jsonify({"error": "Group not found"}), 404
+    user_id = current_user_id()
+    if user_id is None:
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        group_ids = _bulk_group_ids()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        results = bulk_join([(user_id, group_id) for group_id in group_ids])
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "An error occurred while joining the groups."}), 500
+    return jsonify({"results": results, "summary": summarize(results)})
+
+
+def bulk_leave_groups():
+    """Leave many groups at once; groups the caller created are reported, not left."""
+    user = session.get("user")
+    if not user:
+        return jsonify({"error": "Not logged in"}), 401
+
+    user_id = current_user_id()
+    if user_id is None:
+        return jsonify({"error": "User not found"}), 404
+
+    try:
+        group_ids = _bulk_group_ids()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        results = bulk_leave([(user_id, group_id) for group_id in group_ids])
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "An error occurred while leaving the groups."}), 500
+    return jsonify({"results": results, "summary": summarize(results)})
+
+def complete_activity(group_id):
+    user = session.get("user")
+    if not user:
+        return jsonify({"error": "Not logged in"}), 401
 
     user_email = user["email"]
-    user_obj = User.query.filter_by(email=user_email).first()
-    if not user_obj:
+    user_id = current_user_id()
+    if user_id is None:
         return jsonify({"error": "User not found"}), 404
 
-    today = date.today()
-    existing_record = UserActivity.query.filter_by(
-        user_id=user_obj.id,
-        group_id=group_id,
-        completed_date=today
-    ).first()
+    if not is_member(user_id, group_id):
+        if db.session.get(Group, group_id) is None:
+            return jsonify({"error": "Group not found"}), 404
+        return jsonify({"error": "You are not a member of this group"}), 403
 
-    if existing_record:
+    # One INSERT ... ON CONFLICT DO NOTHING RETURNING; no row back means already done today
+    today = date.today()
+    try:
+        completion = add_completion(group_id, user_id, today)
+    except IntegrityError:
+        # The group was deleted after this worker cached the membership
+        db.session.rollback()
+        return jsonify({"error": "Group not found"}), 404
+    if completion is None:
         return jsonify({"error": "Already completed today"}), 400
-
-    activity = UserActivity(
-        user_id=user_obj.id,
-        group_id=group_id,
-        completed_date=today,
-        completed_at=datetime.utcnow()
-    )
-    db.session.add(activity)
     db.session.commit()
+    record_leaderboard_completion(group_id, user_id, completion.stats)
 
+    name = db.session.scalar(db.select(Group.name).where(Group.id == group_id))
     return jsonify({
-        "message": f"Activity recorded successfully for {group.name}",
+        "message": f"Activity recorded successfully for {name or f'group {group_id}'}",
         "group_id": group_id,
         "user_email": user_email,
         "completed_date": today.isoformat(),
-        "completed_at": activity.completed_at.isoformat()
+        "completed_at": completion.completed_at.isoformat()
     })
 
 def get_leaderboard(group_id):
@@ -315,41 +571,90 @@ def get_leaderboard(group_id):
     if not user:
         return jsonify({"error": "Not logged in"}), 401
 
-    group = Group.query.get(group_id)
-    if not group:
+    rank_by = request.args.get("rank_by") or "completions"
+    if rank_by not in RANK_OPTIONS:
+        return jsonify({"error": f"rank_by must be one of {', '.join(RANK_OPTIONS)}"}), 400
+    try:
+        limit = _int_arg("limit", minimum=1)
+        offset = _int_arg("offset", 0, minimum=0)
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+
+    today = date.today()
+    window = request.args.get("window") or "all"
+    try:
+        bounds = window_bounds(window, today, request.args.get("start"), request.args.get("end"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if bounds is not None and rank_by != "completions":
+        return jsonify({"error": "window only applies to rank_by=completions"}), 400
+
+    if db.session.get(Group, group_id) is None:
         return jsonify({"error": "Group not found"}), 404
 
-    from sqlalchemy import func
-    leaderboard = (
-        db.session.query(
-            User.id.label("user_id"),
-            User.name.label("user_name"),
-            User.picture.label("user_picture"),
-            func.count(UserActivity.id).label("completion_count"),
-            func.max(UserActivity.completed_date).label("last_completed")
+    user_id = current_user_id()
+    # The all-time completion ranking comes from the leaderboard store when one is configured
+    page = None
+    if bounds is not None:
+        page = windowed_standings(group_id, user_id, *bounds, offset, limit)
+    elif rank_by == "completions":
+        page = leaderboard_page(group_id, user_id, offset, limit)
+    if page is not None:
+        total, standings, me = page
+    else:
+        total, standings, me = _leaderboard_from_stats(group_id, user_id, rank_by, today, offset, limit)
+
+    profiles = get_user_profiles([s.user_id for s in standings] + ([me.user_id] if me else []))
+
+    def entry_out(standing):
+        profile = profiles.get(standing.user_id) or {}
+        current = live_streak(standing.current_streak, standing.last_completed, today)
+        return LeaderboardEntryOut(
+            rank=standing.rank,
+            user_id=standing.user_id,
+            user_name=profile.get("name", "Unknown"),
+            user_picture=profile.get("picture"),
+            completion_count=int(standing.completion_count),
+            last_completed=standing.last_completed,
+            current_streak=current,
+            longest_streak=standing.longest_streak,
+            streak_start=standing.streak_start if current else None,
         )
-        .join(UserActivity, User.id == UserActivity.user_id)
-        .filter(UserActivity.group_id == group_id)
-        .group_by(User.id)
-        .order_by(func.count(UserActivity.id).desc())
-        .all()
-    )
-
-    leaderboard_data = []
-    for entry in leaderboard:
-        leaderboard_data.append({
-            "user_id": entry.user_id,
-            "user_name": entry.user_name,
-            "user_picture": entry.user_picture,
-            "completion_count": int(entry.completion_count),
-            "last_completed": entry.last_completed.isoformat() if entry.last_completed else None
-        })
 
-    return jsonify({
+    return json_response({
         "group_id": group_id,
-        "leaderboard": leaderboard_data
+        "rank_by": rank_by,
+        "window": window,
+        "start": bounds[0] if bounds else None,
+        "end": bounds[1] if bounds else None,
+        "total": total,
+        "leaderboard": [entry_out(s) for s in standings],
+        "me": entry_out(me) if me else None,
     })
 
+
+def _leaderboard_from_stats(group_id, user_id, rank_by, today, offset, limit):
+    """(total, [Standing], the caller's Standing or None) ordered in SQL from group_member_stats."""
+    ranked = db.select(
+        leaderboard_rank(rank_by, today).label("rank"),
+        GroupMemberStats.user_id,
+        GroupMemberStats.completion_count,
+        GroupMemberStats.last_completed,
+        GroupMemberStats.current_streak,
+        GroupMemberStats.longest_streak,
+        GroupMemberStats.streak_start,
+    ).where(GroupMemberStats.group_id == group_id).subquery()
+
+    page = db.select(ranked).order_by(ranked.c.rank).offset(offset)
+    if limit is not None:
+        page = page.limit(limit)
+    standings = [Standing(*row) for row in db.session.execute(page)]
+    mine = db.session.execute(db.select(ranked).where(ranked.c.user_id == user_id)).first()
+    total = db.session.scalar(
+        db.select(db.func.count()).select_from(GroupMemberStats).where(GroupMemberStats.group_id == group_id)
+    )
+    return total, standings, Standing(*mine) if mine else None
+
 def get_group_activity(group_id):
     user = session.get("user")
     if not user:
@@ -374,19 +679,19 @@ def get_group_activity(group_id):
         .all()
     )
 
-    data = []
     today = date.today()
-    for record in activity_list:
-        days_ago = (today - record.completed_date).days
-        data.append({
-            "user_name": record.user_name,
-            "user_email": record.user_email,
-            "user_picture": record.user_picture,
-            "completed_date": record.completed_date.isoformat(),
-            "days_ago": days_ago
-        })
+    data = [
+        ActivityOut(
+            user_name=record.user_name,
+            user_email=record.user_email,
+            user_picture=record.user_picture,
+            completed_date=record.completed_date,
+            days_ago=(today - record.completed_date).days,
+        )
+        for record in activity_list
+    ]
 
-    return jsonify({"activity": data})
+    return json_response({"activity": data})
 
 def send_message_to_group(group_id):
     user = session.get("user")
@@ -395,58 +700,379 @@ def send_message_to_group(group_id):
 
     user_picture = user["picture"]
     group_id = int(group_id)  # ensure integer
-    group_id = int(group_id)
     data = request.get_json()
     content = data.get("message")
     if not content:
         return jsonify({"error": "Message is required"}), 400
 
-    new_message = Message(
-        group_id=group_id, 
-        user_name=user["name"], 
-        content=content,
-        user_image=user["picture"]
-    )
+    user_id = current_user_id()
+    if user_id is None:
+        return jsonify({"error": "User not found"}), 404
+    if not is_member(user_id, group_id):
+        return jsonify({"error": "You are not a member of this group"}), 403
+
+    new_message = Message(group_id=group_id, user_id=user_id, content=content)
     db.session.add(new_message)
+    db.session.flush()
+    index_message(new_message)
+    versions = record_change(group_id, changes.MESSAGE_CREATED, entity_id=new_message.id, user_id=user_id)
     db.session.commit()
+    recent_messages.append(new_message, version=versions.get(group_key(group_id)))
 
     payload = {
         "id": new_message.id,
+        "user_id": user_id,
         "user": user["name"],
         "message": content,
         "user_image": user_picture,
         "created_at": new_message.created_at.isoformat(),
     }
-    socketio.emit(
-        "group_message", 
-        {"user": user["name"], "message": content, "user_image": user["picture"]}, 
-        room=group_id
-    )
 
-    # Broadcast to all clients in the group room
-    socketio.emit("group_message", payload, room=group_id)
+    # Broadcast to all clients in the group room (once; may be coalesced)
+    broadcaster.publish(group_id, payload)
 
     return jsonify({"message": "Message sent successfully!", "chat_message": payload})
 
+MESSAGES_PAGE_SIZE = 50
+MESSAGES_MAX_PAGE_SIZE = 200
+
+
+def _int_arg(name, default=None, minimum=None, maximum=None):
+    """Read an optional integer query arg; raises ValueError on junk input."""
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return default
+    value = int(raw)
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    if maximum is not None:
+        value = min(value, maximum)
+    return value
+
+
+def _serialize_messages(rows, scores=None):
+    """Build MessageOut structs (SearchResultOut when `scores` maps id -> rank)."""
+    authors = get_user_profiles(m.user_id for m in rows)
+    data = []
+    for m in rows:
+        author = authors.get(m.user_id) or {}
+        fields = dict(
+            id=m.id,
+            user_id=m.user_id,
+            user=author.get("name", "Unknown"),
+            message=m.content,
+            created_at=m.created_at,
+            user_image=author.get("picture") or "",
+        )
+        if scores is None:
+            data.append(MessageOut(**fields))
+        else:
+            data.append(SearchResultOut(score=round(scores[m.id], 4), **fields))
+    return data
+
+
 def get_messages(group_id):
+    """Keyset-paginated chat history, always returned oldest-first.
+
+    - no cursor: the newest `limit` messages
+    - before_id: the `limit` messages just older than before_id (scrolling back)
+    - after_id: the `limit` messages just newer than after_id (catching up)
+
+    `next_cursor` is the value to pass back as the same cursor to keep going
+    in that direction, or None once there is nothing left.
+    """
     user = session.get("user")
     if not user:
         return jsonify({"error": "Not logged in"}), 401
 
     group_id = int(group_id)
-    group_msgs = Message.query.filter_by(group_id=group_id).order_by(Message.created_at.asc()).all()
+    if not is_member(current_user_id(), group_id):
+        return jsonify({"error": "You are not a member of this group"}), 403
+    try:
+        before_id = _int_arg("before_id", minimum=1)
+        after_id = _int_arg("after_id", minimum=0)
+        limit = _int_arg("limit", MESSAGES_PAGE_SIZE, minimum=1, maximum=MESSAGES_MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "before_id, after_id and limit must be integers"}), 400
+    if before_id is not None and after_id is not None:
+        return jsonify({"error": "Use either before_id or after_id, not both"}), 400
+
+    if before_id is None and after_id is None:
+        # Newest page: usually answered from the in-memory ring buffer
+        cached = recent_messages.newest(
+            group_id, limit, lambda n: messages_before(group_id, None, n), version=known_version(group_key(group_id))
+        )
+        if cached is not None:
+            page, has_more = cached
+            return json_response({
+                "messages": _serialize_messages(page),
+                "next_cursor": page[0].id if has_more and page else None,
+                "has_more": has_more,
+            })
+
+    # Both directions continue into messages_archive past the hot range (see archive.py)
+    if after_id is not None:
+        rows = messages_after(group_id, after_id, limit + 1)
+        has_more = len(rows) > limit
+        page = rows[:limit]
+        next_cursor = page[-1].id if has_more else None
+    else:
+        rows = messages_before(group_id, before_id, limit + 1)
+        has_more = len(rows) > limit
+        page = rows[:limit][::-1]
+        next_cursor = page[0].id if has_more else None
+
+    return json_response({
+        "messages": _serialize_messages(page),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
+
+SEARCH_PAGE_SIZE = 20
+
+
+def search_messages(group_id):
+    """Ranked full-text search over a group's chat, paginated with offset/limit."""
+    user = session.get("user")
+    if not user:
+        return jsonify({"error": "Not logged in"}), 401
+
+    if not is_member(current_user_id(), group_id):
+        return jsonify({"error": "You are not a member of this group"}), 403
+
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "Query parameter q is required"}), 400
+    try:
+        limit = _int_arg("limit", SEARCH_PAGE_SIZE, minimum=1, maximum=MESSAGES_MAX_PAGE_SIZE)
+        offset = _int_arg("offset", 0, minimum=0)
+    except ValueError:
+        return jsonify({"error": "limit and offset must be integers"}), 400
+
+    hits = search_message_ids(group_id, q, limit + 1, offset)
+    has_more = len(hits) > limit
+    hits = hits[:limit]
+
+    hit_ids = [mid for mid, _ in hits]
+    by_id = {m.id: m for m in Message.query.filter(Message.id.in_(hit_ids)).all()}
+    missing = [mid for mid in hit_ids if mid not in by_id]
+    if missing:
+        by_id.update((m.id, m) for m in MessageArchive.query.filter(MessageArchive.id.in_(missing)).all())
+    ranked = [by_id[mid] for mid, _ in hits if mid in by_id]
+    results = _serialize_messages(ranked, scores=dict(hits))
+
+    return json_response({
+        "query": q,
+        "results": results,
+        "next_offset": offset + limit if has_more else None,
+    })
+
+SYNC_MAX_CHANGES = 500
+
+
+def sync():
+    """Everything that changed in the caller's groups since `since` (a previous token).
+
+    Without `since`, returns only the current token: the client should do its full
+    load and then sync from there.
+    """
+    user = session.get("user")
+    if not user:
+        return jsonify({"error": "Not logged in"}), 401
+
+    try:
+        since = _int_arg("since", minimum=0)
+    except ValueError:
+        return jsonify({"error": "Invalid sync token"}), 400
+
+    user_id = current_user_id()
+    if user_id is None:
+        return jsonify({"error": "User not found"}), 404
+
+    # change_log ids commit in order (changes.py), so any id seen is a safe watermark
+    if since is None:
+        token = db.session.query(db.func.max(ChangeLog.id)).scalar() or 0
+        return jsonify({"token": str(token), "reset": True})
+
+    group_ids = [row.group_id for row in db.session.query(GroupMember.group_id).filter_by(user_id=user_id)]
+    entries = (
+        ChangeLog.query
+        .filter(
+            ChangeLog.id > since,
+            db.or_(ChangeLog.group_id.in_(group_ids), ChangeLog.user_id == user_id),
+        )
+        .order_by(ChangeLog.id.asc())
+        .limit(SYNC_MAX_CHANGES + 1)
+        .all()
+    )
+    has_more = len(entries) > SYNC_MAX_CHANGES
+    entries = entries[:SYNC_MAX_CHANGES]
+
+    created_ids, deleted_ids, completion_ids = [], [], []
+    memberships, deleted_group_ids = [], []
+    for entry in entries:
+        if entry.kind == changes.MESSAGE_CREATED:
+            created_ids.append(entry.entity_id)
+        elif entry.kind == changes.MESSAGE_DELETED:
+            deleted_ids.append(entry.entity_id)
+        elif entry.kind == changes.COMPLETION_CREATED:
+            completion_ids.append(entry.entity_id)
+        elif entry.kind in (changes.MEMBER_JOINED, changes.MEMBER_LEFT):
+            memberships.append({
+                "group_id": entry.group_id,
+                "user_id": entry.user_id,
+                "change": "joined" if entry.kind == changes.MEMBER_JOINED else "left",
+            })
+        elif entry.kind == changes.GROUP_DELETED:
+            deleted_group_ids.append(entry.group_id)
+
+    new_messages = []
+    if created_ids:
+        rows = Message.query.filter(Message.id.in_(created_ids)).order_by(Message.id.asc()).all()
+        new_messages = _serialize_messages(rows)
+
+    completions = []
+    if completion_ids:
+        rows = (
+            db.session.query(
+                UserActivity.id,
+                UserActivity.group_id,
+                UserActivity.user_id,
+                UserActivity.completed_date,
+                UserActivity.completed_at,
+                User.name.label("user_name"),
+                User.picture.label("user_picture"),
+            )
+            .join(User, UserActivity.user_id == User.id)
+            .filter(UserActivity.id.in_(completion_ids))
+            .order_by(UserActivity.id.asc())
+            .all()
+        )
+        completions = [
+            CompletionOut(
+                id=row.id,
+                group_id=row.group_id,
+                user_id=row.user_id,
+                user_name=row.user_name,
+                user_picture=row.user_picture,
+                completed_date=row.completed_date,
+                completed_at=row.completed_at,
+            )
+            for row in rows
+        ]
+
+    token = entries[-1].id if entries else since
+    return json_response({
+        "token": str(token),
+        "has_more": has_more,
+        "messages": new_messages,
+        "deleted_message_ids": deleted_ids,
+        "completions": completions,
+        "memberships": memberships,
+        "deleted_group_ids": deleted_group_ids,
+    })
+
+def dashboard():
+    """Everything the home page needs for the caller's groups, in a fixed number of queries."""
+    user = session.get("user")
+    if not user:
+        return jsonify({"error": "Not logged in"}), 401
+
+    user_id = current_user_id()
+    if user_id is None:
+        return jsonify({"error": "User not found"}), 404
+
+    today = date.today()
+    group_ids = sorted(_joined_group_ids(user_id))
+    # Read after the memberships, so every group joined so far is in it
+    catalog = get_catalog()
+
+    ranked = db.select(
+        GroupMemberStats.group_id,
+        GroupMemberStats.user_id,
+        GroupMemberStats.completion_count,
+        GroupMemberStats.last_completed,
+        GroupMemberStats.current_streak,
+        leaderboard_rank("completions", today, partition_by=GroupMemberStats.group_id).label("rank"),
+    ).where(GroupMemberStats.group_id.in_(group_ids)).subquery()
+    standings = {
+        row.group_id: row
+        for row in db.session.execute(db.select(ranked).where(ranked.c.user_id == user_id))
+    }
+
+    unread = dict(
+        db.session.query(Message.group_id, db.func.count(Message.id))
+        .join(GroupMember, db.and_(GroupMember.group_id == Message.group_id, GroupMember.user_id == user_id))
+        .outerjoin(GroupReadState, db.and_(
+            GroupReadState.group_id == Message.group_id, GroupReadState.user_id == user_id
+        ))
+        .filter(
+            Message.id > db.func.coalesce(GroupReadState.last_read_message_id, 0),
+            db.func.coalesce(Message.user_id, 0) != user_id,  # your own messages are never unread
+        )
+        .group_by(Message.group_id)
+        .all()
+    )
+
+    groups_data = []
+    for group_id in group_ids:
+        entry = find_entry(catalog, group_id)
+        if entry is None:  # deleted since the memberships were read
+            continue
+        standing = standings.get(group_id)
+        groups_data.append(DashboardGroupOut(
+            id=entry.id,
+            name=entry.name,
+            description=entry.description,
+            created_by=entry.created_by,
+            member_count=entry.member_count,
+            is_member=True,
+            member_preview=entry.member_preview,
+            completed_today=bool(standing) and standing.last_completed == today,
+            streak=live_streak(standing.current_streak, standing.last_completed, today) if standing else 0,
+            rank=standing.rank if standing else None,
+            completion_count=standing.completion_count if standing else 0,
+            unread_count=unread.get(group_id, 0),
+        ))
+
+    return json_response({"user": user, "today": today, "groups": groups_data})
+
+
+def mark_group_read(group_id):
+    """Move the caller's read marker forward to `message_id` (default: the newest message)."""
+    user = session.get("user")
+    if not user:
+        return jsonify({"error": "Not logged in"}), 401
+
+    user_id = current_user_id()
+    if user_id is None:
+        return jsonify({"error": "User not found"}), 404
+
+    if not is_member(user_id, group_id):
+        return jsonify({"error": "You are not a member of this group"}), 403
+
+    message_id = (request.get_json(silent=True) or {}).get("message_id")
+    if message_id is not None and not isinstance(message_id, int):
+        return jsonify({"error": "message_id must be an integer"}), 400
+    latest = db.session.query(db.func.max(Message.id)).filter(Message.group_id == group_id).scalar() or 0
+    if message_id is None or message_id > latest:
+        message_id = latest
+
+    state = GroupReadState.query.filter_by(user_id=user_id, group_id=group_id).first()
+    if state is None:
+        state = GroupReadState(user_id=user_id, group_id=group_id, last_read_message_id=message_id)
+        db.session.add(state)
+    elif message_id > state.last_read_message_id:
+        state.last_read_message_id = message_id
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request created the row first; it already holds a marker at least this far.
+        db.session.rollback()
+        state = GroupReadState.query.filter_by(user_id=user_id, group_id=group_id).first()
+
+    return jsonify({"group_id": group_id, "last_read_message_id": state.last_read_message_id})
 
-    messages_data = [
-        {
-            "id": m.id,
-            "user": m.user_name, 
-            "message": m.content,
-            "created_at": m.created_at.isoformat(),
-            "user_image": m.user_image,
-        }
-        for m in group_msgs
-    ]
-    return jsonify({"messages": messages_data})
 
 # New endpoint: tracks all users that have logged in
 def secret_tracking():
@@ -466,6 +1092,10 @@ def handle_join_group(data):
     group_id = int(data.get("group_id"))
     user_name = user["name"]
 
+    if not is_member(current_user_id(), group_id):
+        emit("error", {"error": "You are not a member of this group"})
+        return
+
     join_room(group_id)
     emit("message", {"message": f"{user_name} has joined group {group_id}!"}, room=group_id)
 
@@ -498,16 +1128,46 @@ def handle_send_message(data):
     user_name = user["name"]
     user_picture = user["picture"]
 
-    new_message = Message(
-        group_id=group_id, 
-        user_name=user_name, 
-        content=content,
-        user_image=user_picture
-    )
+    user_id = current_user_id()
+    if user_id is None:
+        emit("error", {"error": "User not found"})
+        return
+    if not is_member(user_id, group_id):
+        emit("error", {"error": "You are not a member of this group"})
+        return
+
+    if message_writer.enabled:
+        # Write-behind: broadcast now, persist with the next batch (see write_behind.py)
+        created_at = datetime.utcnow()
+        temp_id = uuid.uuid4().hex
+        message_writer.enqueue(group_id, user_id, content, created_at, temp_id)
+        broadcaster.publish(group_id, {
+            "id": None,
+            "temp_id": temp_id,
+            "user_id": user_id,
+            "user": user_name,
+            "message": content,
+            "user_image": user_picture,
+            "created_at": created_at.isoformat(),
+        })
+        return
+
+    new_message = Message(group_id=group_id, user_id=user_id, content=content)
     db.session.add(new_message)
+    db.session.flush()
+    index_message(new_message)
+    versions = record_change(group_id, changes.MESSAGE_CREATED, entity_id=new_message.id, user_id=user_id)
     db.session.commit()
+    recent_messages.append(new_message, version=versions.get(group_key(group_id)))
 
-    emit("group_message", {"user": user_name, "message": content}, room=group_id)
+    broadcaster.publish(group_id, {
+        "id": new_message.id,
+        "user_id": user_id,
+        "user": user_name,
+        "message": content,
+        "user_image": user_picture,
+        "created_at": new_message.created_at.isoformat(),
+    })
 
 def check_habit_completion(group_id):
     user = session.get("user")
@@ -516,13 +1176,12 @@ def check_habit_completion(group_id):
 
     today = date.today()
 
-    # Find the user in the database to get their user_id
-    user_obj = User.query.filter_by(email=user_email).first()
-    if not user_obj:
+    user_id = current_user_id()
+    if user_id is None:
         return jsonify({"completed": False})
 
     habit_completed = UserActivity.query.filter_by(
-        user_id=user_obj.id,
+        user_id=user_id,
         group_id=group_id,
         completed_date=today,
     ).first()
@@ -538,19 +1197,29 @@ def delete_group(group_id):
     if not group:
         return jsonify({"error": "Group not found"}), 404
 
-    user_obj = User.query.filter_by(email=user["email"]).first()
-    if not user_obj:
+    user_id = current_user_id()
+    if user_id is None:
         return jsonify({"error": "User not found"}), 404
 
-    first_member = GroupMember.query.filter_by(group_id=group_id).order_by(GroupMember.id.asc()).first()
-    if not first_member or first_member.user_id != user_obj.id:
+    if group.creator_id != user_id:
         return jsonify({"error": "Only the group creator can delete this group"}), 403
 
+    member_ids = group_member_ids(group_id)
     Message.query.filter_by(group_id=group_id).delete()
+    MessageArchive.query.filter_by(group_id=group_id).delete()
+    unindex_group(group_id)
     UserActivity.query.filter_by(group_id=group_id).delete()
+    GroupMemberStats.query.filter_by(group_id=group_id).delete()
+    GroupReadState.query.filter_by(group_id=group_id).delete()
     GroupMember.query.filter_by(group_id=group_id).delete()
     db.session.delete(group)
+    unindex_groups([group_id])
+    record_group_deleted(group_id, member_ids)
     db.session.commit()
+    invalidate_catalog()
+    invalidate_memberships(member_ids)
+    invalidate_leaderboards([group_id])
+    recent_messages.drop(group_id)
 
     return jsonify({"message": f"Group '{group.name}' deleted successfully"})
 
@@ -560,25 +1229,30 @@ def leave_group(group_id):
     if not user:
         return jsonify({"error": "Not logged in"}), 401
 
-    user_obj = User.query.filter_by(email=user["email"]).first()
-    if not user_obj:
+    user_id = current_user_id()
+    if user_id is None:
         return jsonify({"error": "User not found"}), 404
 
     group = Group.query.get(group_id)
     if not group:
         return jsonify({"error": "Group not found"}), 404
 
-    membership = GroupMember.query.filter_by(user_id=user_obj.id, group_id=group_id).first()
+    membership = GroupMember.query.filter_by(user_id=user_id, group_id=group_id).first()
     if not membership:
         return jsonify({"error": "You are not a member of this group"}), 400
 
-    first_member = GroupMember.query.filter_by(group_id=group_id).order_by(GroupMember.id.asc()).first()
-    if first_member and first_member.user_id == user_obj.id:
+    if group.creator_id == user_id:
         return jsonify({"error": "Group creators cannot leave. Delete the group instead."}), 403
 
-    UserActivity.query.filter_by(user_id=user_obj.id, group_id=group_id).delete()
+    UserActivity.query.filter_by(user_id=user_id, group_id=group_id).delete()
+    GroupMemberStats.query.filter_by(user_id=user_id, group_id=group_id).delete()
+    GroupReadState.query.filter_by(user_id=user_id, group_id=group_id).delete()
     db.session.delete(membership)
+    record_change(group_id, changes.MEMBER_LEFT, user_id=user_id)
     db.session.commit()
+    invalidate_catalog()
+    invalidate_memberships([user_id])
+    invalidate_leaderboards([group_id])
 
     return jsonify({"message": f"Left group '{group.name}' successfully"})
 
@@ -588,17 +1262,22 @@ def delete_message(message_id):
     if not user:
         return jsonify({"error": "Not logged in"}), 401
 
-    msg = Message.query.get(message_id)
+    msg = Message.query.get(message_id) or db.session.get(MessageArchive, message_id)
     if not msg:
         return jsonify({"error": "Message not found"}), 404
 
+    user_id = current_user_id()
+
     # Only the message author can delete their own message
-    if msg.user_name != user["name"]:
+    if user_id is None or msg.user_id != user_id:
         return jsonify({"error": "You can only delete your own messages"}), 403
 
     group_id = msg.group_id
     db.session.delete(msg)
+    unindex_messages([message_id])
+    versions = record_change(group_id, changes.MESSAGE_DELETED, entity_id=message_id, user_id=msg.user_id)
     db.session.commit()
+    recent_messages.remove(group_id, message_id, version=versions.get(group_key(group_id)))
 
     # Notify connected clients about the deletion
     socketio.emit(
@@ -721,13 +1400,14 @@ def seed_demo_data():
             created_groups.append(existing)
             continue
 
-        group = Group(name=g["name"], description=g["description"])
+        member_idxs = list(range(g["start"], g["start"] + 10))
+        group = Group(name=g["name"], description=g["description"], creator_id=created_users[member_idxs[0]].id)
         db.session.add(group)
         db.session.flush()
+        index_group(group)
         created_groups.append(group)
         stats["groups"] += 1
 
-        member_idxs = list(range(g["start"], g["start"] + 10))
         for idx in member_idxs:
             user = created_users[idx]
             if not GroupMember.query.filter_by(user_id=user.id, group_id=group.id).first():
@@ -735,6 +1415,8 @@ def seed_demo_data():
                 stats["members"] += 1
 
     db.session.commit()
+    invalidate_catalog()
+    invalidate_memberships(u.id for u in created_users)
 
     now = datetime.utcnow()
 
@@ -748,15 +1430,11 @@ def seed_demo_data():
             convo = CHAT_POOLS[gi % len(CHAT_POOLS)]
             for ci, line in enumerate(convo):
                 member = members[ci % len(members)]
-                user = User.query.get(member.user_id)
-                msg = Message(
-                    group_id=group.id,
-                    user_name=user.name,
-                    content=line,
-                    user_image=user.picture or "",
-                )
+                msg = Message(group_id=group.id, user_id=member.user_id, content=line)
                 msg.created_at = now - timedelta(hours=len(convo) - ci, minutes=random.randint(0, 30))
                 db.session.add(msg)
+                db.session.flush()
+                index_message(msg)
                 stats["messages"] += 1
 
         for member in members:
@@ -768,7 +1446,11 @@ def seed_demo_data():
                     db.session.add(act)
                     stats["activities"] += 1
 
+    rebuild_member_stats([group.id for group in created_groups])
+    # Seeded rows skip the change log; still move the versions so cached responses revalidate.
+    bump_versions([CATALOG_KEY] + [group_key(group.id) for group in created_groups])
     db.session.commit()
+    invalidate_leaderboards([group.id for group in created_groups])
 
     return jsonify({
         "message": "Demo data seeded successfully!",
@@ -807,18 +1489,72 @@ def admin_list_users():
     if err:
         return err
     users = User.query.all()
-    return jsonify({"users": [
-        {
-            "id": u.id,
-            "name": u.name,
-            "email": u.email,
-            "picture": u.picture,
-            "group_count": len(u.memberships),
-        }
+    return json_response({"users": [
+        AdminUserOut(
+            id=u.id,
+            name=u.name,
+            email=u.email,
+            picture=u.picture,
+            group_count=len(u.memberships),
+        )
         for u in users
     ]})
 
 
+def admin_cache_stats():
+    err = _check_admin()
+    if err:
+        return err
+    return jsonify({"caches": cache_stats()})
+
+
+def _admin_membership_pairs():
+    """memberships: [{"user_id", "group_id"}, ...] from the JSON body; raises ValueError on bad input."""
+    items = (request.get_json(silent=True) or {}).get("memberships")
+    if not isinstance(items, list) or not items:
+        raise ValueError("memberships must be a non-empty list")
+    if len(items) > BULK_MAX_PAIRS:
+        raise ValueError(f"At most {BULK_MAX_PAIRS} memberships per request")
+    pairs = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get("user_id"), int) or not isinstance(item.get("group_id"), int):
+            raise ValueError("Each membership needs integer user_id and group_id")
+        pairs.append((item["user_id"], item["group_id"]))
+    return pairs
+
+
+def admin_bulk_join():
+    err = _check_admin()
+    if err:
+        return err
+    try:
+        pairs = _admin_membership_pairs()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        results = bulk_join(pairs)
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "An error occurred while joining the groups."}), 500
+    return jsonify({"results": results, "summary": summarize(results)})
+
+
+def admin_bulk_leave():
+    err = _check_admin()
+    if err:
+        return err
+    try:
+        pairs = _admin_membership_pairs()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    try:
+        results = bulk_leave(pairs)
+    except SQLAlchemyError:
+        db.session.rollback()
+        return jsonify({"error": "An error occurred while leaving the groups."}), 500
+    return jsonify({"results": results, "summary": summarize(results)})
+
+
 def admin_delete_group(group_id):
     err = _check_admin()
     if err:
@@ -827,11 +1563,22 @@ def admin_delete_group(group_id):
     if not group:
         return jsonify({"error": "Group not found"}), 404
     name = group.name
+    member_ids = group_member_ids(group_id)
     Message.query.filter_by(group_id=group_id).delete()
+    MessageArchive.query.filter_by(group_id=group_id).delete()
+    unindex_group(group_id)
     UserActivity.query.filter_by(group_id=group_id).delete()
+    GroupMemberStats.query.filter_by(group_id=group_id).delete()
+    GroupReadState.query.filter_by(group_id=group_id).delete()
     GroupMember.query.filter_by(group_id=group_id).delete()
     db.session.delete(group)
+    unindex_groups([group_id])
+    record_group_deleted(group_id, member_ids)
     db.session.commit()
+    invalidate_catalog()
+    invalidate_memberships(member_ids)
+    invalidate_leaderboards([group_id])
+    recent_messages.drop(group_id)
     return jsonify({"message": f"Deleted group '{name}'"})
 
 
@@ -843,9 +1590,39 @@ def admin_delete_user(user_id):
     if not user:
         return jsonify({"error": "User not found"}), 404
     name = user.name
-    Message.query.filter_by(user_name=user.name).delete()
+    user_messages = db.session.query(Message.id, Message.group_id).filter_by(user_id=user_id).all()
+    group_ids = [row.group_id for row in db.session.query(GroupMember.group_id).filter_by(user_id=user_id)]
+    archived_ids = [row.id for row in db.session.query(MessageArchive.id).filter_by(user_id=user_id)]
+    Message.query.filter_by(user_id=user_id).delete()
+    MessageArchive.query.filter_by(user_id=user_id).delete()
+    unindex_messages([row.id for row in user_messages] + archived_ids)
     UserActivity.query.filter_by(user_id=user_id).delete()
+    GroupMemberStats.query.filter_by(user_id=user_id).delete()
+    GroupReadState.query.filter_by(user_id=user_id).delete()
     GroupMember.query.filter_by(user_id=user_id).delete()
+    # Hand their groups to the longest-standing remaining member (NULL if none is left).
+    db.session.execute(
+        db.update(Group)
+        .where(Group.creator_id == user_id)
+        .values(creator_id=db.select(GroupMember.user_id)
+                .where(GroupMember.group_id == Group.id)
+                .order_by(GroupMember.id)
+                .limit(1)
+                .scalar_subquery()),
+        execution_options={"synchronize_session": False},
+    )
     db.session.delete(user)
+    record_changes(
+        [{"group_id": row.group_id, "kind": changes.MESSAGE_DELETED, "entity_id": row.id, "user_id": user_id}
+         for row in user_messages]
+        + [{"group_id": gid, "kind": changes.MEMBER_LEFT, "entity_id": None, "user_id": user_id}
+           for gid in group_ids]
+    )
     db.session.commit()
+    invalidate_catalog()
+    invalidate_leaderboards(group_ids)
+    invalidate_user(user_id)
+    invalidate_memberships([user_id])
+    for row in user_messages:
+        recent_messages.remove(row.group_id, row.id)
     return jsonify({"message": f"Deleted user '{name}'"})
@@ -0,0 +1,81 @@
+# windows.py
+#
+# Time-windowed leaderboards (?window=7d|30d|month|custom). A window ranks members by the
+# completions dated inside it. user_activity holds at most one row per (group, day, user)
+# (completions.py), so it already is the daily rollup: the covering index on
+# (group_id, completed_date, user_id) turns any window into a range scan over that group's
+# days in the window, never over its whole history. Streak fields on windowed entries are
+# the member's current ones from group_member_stats.
+from datetime import date, timedelta
+
+from .extensions import db
+from .leaderboard_store import Standing
+from .models import GroupMemberStats, UserActivity
+
+LEADERBOARD_WINDOWS = ("all", "7d", "30d", "month", "custom")
+MAX_WINDOW_DAYS = 366
+
+
+def window_bounds(window, today, start=None, end=None):
+    """(first day, last day) of a window, both inclusive, or None for "all".
+
+    `start`/`end` are ISO dates, used by "custom". Raises ValueError on bad input.
+    """
+    if window not in LEADERBOARD_WINDOWS:
+        raise ValueError(f"window must be one of {', '.join(LEADERBOARD_WINDOWS)}")
+    if window == "all":
+        return None
+    if window == "7d":
+        return today - timedelta(days=6), today
+    if window == "30d":
+        return today - timedelta(days=29), today
+    if window == "month":
+        return today.replace(day=1), today
+
+    if not start or not end:
+        raise ValueError("a custom window needs start and end (YYYY-MM-DD)")
+    try:
+        first, last = date.fromisoformat(start), date.fromisoformat(end)
+    except ValueError:
+        raise ValueError("start and end must be dates (YYYY-MM-DD)") from None
+    if first > last:
+        raise ValueError("start must not be after end")
+    if (last - first).days + 1 > MAX_WINDOW_DAYS:
+        raise ValueError(f"a custom window spans at most {MAX_WINDOW_DAYS} days")
+    return first, last
+
+
+def windowed_standings(group_id, user_id, first, last, offset=0, limit=None):
+    """(total, [Standing], the caller's Standing or None) for completions dated first..last."""
+    counts = (
+        db.select(UserActivity.user_id, db.func.count().label("completion_count"))
+        .where(UserActivity.group_id == group_id, UserActivity.completed_date.between(first, last))
+        .group_by(UserActivity.user_id)
+        .subquery()
+    )
+    ranked = (
+        db.select(
+            db.func.row_number().over(
+                order_by=[counts.c.completion_count.desc(), counts.c.user_id]
+            ).label("rank"),
+            counts.c.user_id,
+            counts.c.completion_count,
+            GroupMemberStats.last_completed,
+            GroupMemberStats.current_streak,
+            GroupMemberStats.longest_streak,
+            GroupMemberStats.streak_start,
+        )
+        .join(GroupMemberStats, db.and_(
+            GroupMemberStats.group_id == group_id,
+            GroupMemberStats.user_id == counts.c.user_id,
+        ))
+        .subquery()
+    )
+
+    page = db.select(ranked).order_by(ranked.c.rank).offset(offset)
+    if limit is not None:
+        page = page.limit(limit)
+    standings = [Standing(*row) for row in db.session.execute(page)]
+    mine = db.session.execute(db.select(ranked).where(ranked.c.user_id == user_id)).first()
+    total = db.session.scalar(db.select(db.func.count()).select_from(counts))
+    return total, standings, Standing(*mine) if mine else None
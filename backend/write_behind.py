@@ -0,0 +1,147 @@
+# write_behind.py
+#
+# Optional write-behind mode for chat lines sent over Socket.IO (CHAT_WRITE_BEHIND=1).
+# handle_send_message broadcasts straight away with a temporary id and queues the row here;
+# queued rows are inserted in one multi-row INSERT when the batch fills up or the oldest
+# row has waited CHAT_WRITE_BEHIND_MAX_DELAY_MS, whichever comes first. That delay is the
+# durability bound: it is the most chat a crashed worker can lose. Once a batch is stored,
+# each room gets one `messages_persisted` event mapping temp ids to real ids. A batch that
+# fails is retried row by row straight away; rows that still fail are logged and dropped,
+# so one bad row never holds back the messages queued behind it.
+import atexit
+import logging
+import os
+import threading
+import time
+
+from .changes import MESSAGE_CREATED, record_changes
+from .extensions import db
+from .message_buffer import BufferedMessage, recent_messages
+from .models import Message
+from .search import index_message_rows
+from .socketio_instance import socketio
+from .versions import group_key
+
+logger = logging.getLogger(__name__)
+
+
+class MessageWriteBehind:
+    def __init__(self, sio):
+        self.sio = sio
+        self.app = None
+        self.enabled = False
+        self.max_batch = 100
+        self.max_delay = 0.2
+        self.max_pending = 5000
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._oldest = None
+        self._flusher_started = False
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = os.getenv("CHAT_WRITE_BEHIND", "0") == "1"
+        self.max_batch = max(1, int(os.getenv("CHAT_WRITE_BEHIND_MAX_BATCH", "100")))
+        self.max_delay = max(0.01, int(os.getenv("CHAT_WRITE_BEHIND_MAX_DELAY_MS", "200")) / 1000.0)
+        self.max_pending = max(self.max_batch, int(os.getenv("CHAT_WRITE_BEHIND_MAX_PENDING", "5000")))
+        if self.enabled:
+            atexit.register(self.flush)
+
+    def enqueue(self, group_id, user_id, content, created_at, temp_id):
+        with self._lock:
+            self._pending.append({
+                "group_id": group_id,
+                "user_id": user_id,
+                "content": content,
+                "created_at": created_at,
+                "temp_id": temp_id,
+            })
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._pending) >= self.max_batch
+            if not self._flusher_started:
+                self._flusher_started = True
+                self.sio.start_background_task(self._run_flusher)
+        if full:
+            self.flush()
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def flush(self):
+        """Insert everything queued so far. Safe to call from any thread."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._oldest = None
+            if batch:
+                self._write(batch)
+
+    def _insert(self, batch):
+        """Insert, index and log `batch` in one transaction.
+
+        Returns (the new ids in order, {version key: new version}).
+        """
+        rows = [{k: item[k] for k in ("group_id", "user_id", "content", "created_at")} for item in batch]
+        ids = db.session.scalars(
+            db.insert(Message).returning(Message.id, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        index_message_rows([
+            {"id": mid, "content": row["content"], "group_id": row["group_id"]}
+            for mid, row in zip(ids, rows)
+        ])
+        versions = record_changes([
+            {"group_id": row["group_id"], "kind": MESSAGE_CREATED, "entity_id": mid, "user_id": row["user_id"]}
+            for mid, row in zip(ids, rows)
+        ])
+        db.session.commit()
+        return ids, versions
+
+    def _write(self, batch):
+        with self.app.app_context():
+            try:
+                ids, versions = self._insert(batch)
+            except Exception:
+                db.session.rollback()
+                logger.exception("write-behind flush of %d messages failed; retrying them one at a time",
+                                 len(batch))
+                self._spill(batch)
+                return
+        self._published(ids, batch, versions)
+
+    def _spill(self, items):
+        """Insert rows one at a time, so one bad row cannot hold back the rest; drop and log any that fail."""
+        lost = 0
+        for item in items:
+            try:
+                ids, versions = self._insert([item])
+            except Exception:
+                db.session.rollback()
+                lost += 1
+                continue
+            self._published(ids, [item], versions)
+        if lost:
+            logger.error("write-behind dropped %d of %d messages that could not be stored", lost, len(items))
+
+    def _published(self, ids, batch, versions):
+        persisted = {}
+        for mid, item in zip(ids, batch):
+            recent_messages.append(BufferedMessage(
+                mid, item["group_id"], item["user_id"], item["content"], item["created_at"]
+            ), version=versions.get(group_key(item["group_id"])))
+            persisted.setdefault(item["group_id"], []).append({"temp_id": item["temp_id"], "id": mid})
+        for group_id, mapping in persisted.items():
+            self.sio.emit("messages_persisted", {"group_id": group_id, "messages": mapping}, room=group_id)
+
+    def _run_flusher(self):
+        while True:
+            self.sio.sleep(self.max_delay / 2)
+            oldest = self._oldest
+            overdue = oldest is not None and time.monotonic() - oldest >= self.max_delay
+            if overdue or len(self._pending) >= self.max_pending:
+                self.flush()
+
+
+message_writer = MessageWriteBehind(socketio)
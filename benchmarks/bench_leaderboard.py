@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Leaderboard reads for one large group: group_member_stats in SQL vs the leaderboard store.
+
+Seeds a throwaway SQLite database with one group of --members stats rows, then times a
+top-N page plus the caller's own rank:
+  - ordered from group_member_stats (the database backend)
+  - from the in-process store (LEADERBOARD_BACKEND=local), which the Redis store mirrors
+    with ZREVRANGE/ZREVRANK
+and the cost of one completion increment in the store.
+
+Usage:
+  python benchmarks/bench_leaderboard.py [--members 20000] [--top 20] [--reads 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=20000)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--reads", type=int, default=200)
+    return parser.parse_args()
+
+
+def seed(db, n_members):
+    from backend.models import Group, GroupMemberStats, User
+
+    db.drop_all()
+    db.create_all()
+    db.session.add(User(id=1, email="owner@example.com", name="Owner"))
+    db.session.add(Group(id=1, name="Big group", description="bench", creator_id=1))
+    rng = random.Random(7)
+    today = date.today()
+    db.session.execute(db.insert(GroupMemberStats), [
+        {
+            "group_id": 1,
+            "user_id": user_id,
+            "completion_count": rng.randint(1, 400),
+            "last_completed": today - timedelta(days=rng.randint(0, 5)),
+            "current_streak": rng.randint(1, 30),
+            "longest_streak": 30,
+            "streak_start": today - timedelta(days=30),
+        }
+        for user_id in range(1, n_members + 1)
+    ])
+    db.session.commit()
+
+
+def time_per_call(fn, n):
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    args = parse_args()
+    tmpdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ["LEADERBOARD_BACKEND"] = "local"
+    os.environ.setdefault("SESSION_BACKEND", "cookie")
+
+    from backend import leaderboard_store
+    from backend.app import create_app
+    from backend.extensions import db
+    from backend.leaderboard_store import Details, leaderboard_page
+    from backend.views import _leaderboard_from_stats
+
+    app = create_app()
+    with app.app_context():
+        seed(db, args.members)
+        today = date.today()
+        rng = random.Random(11)
+        callers = [rng.randint(1, args.members) for _ in range(args.reads)]
+
+        sql = time_per_call(
+            lambda i: _leaderboard_from_stats(1, callers[i], "completions", today, 0, args.top), args.reads
+        )
+        start = time.perf_counter()
+        leaderboard_page(1, callers[0], 0, args.top)  # loads the group
+        load = (time.perf_counter() - start) * 1e3
+        store = time_per_call(lambda i: leaderboard_page(1, callers[i], 0, args.top), args.reads)
+        assert leaderboard_page(1, callers[-1], 0, args.top) == _leaderboard_from_stats(
+            1, callers[-1], "completions", today, 0, args.top
+        )
+        details = Details(today, 1, 30, today)
+        increment = time_per_call(
+            lambda i: leaderboard_store.leaderboard_store.increment(1, callers[i], details), args.reads
+        )
+
+    print(f"group of {args.members} members, top {args.top} + caller's rank")
+    print(f"{'operation':<40}{'us/call':>12}")
+    print(f"{'SQL (group_member_stats)':<40}{sql:>12.1f}")
+    print(f"{'local store':<40}{store:>12.1f}")
+    print(f"{'local store increment':<40}{increment:>12.1f}")
+    print(f"one-off load of the group into the store: {load:.1f} ms; store reads are {sql / store:.0f}x faster")
+
+
+if __name__ == "__main__":
+    main()
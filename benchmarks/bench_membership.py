@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Per-message cost of the chat membership check (backend/membership_cache.py).
+
+Seeds a throwaway SQLite database, then times:
+  - is_member() against a warm cache, and the GroupMember query it replaces
+  - POST /api/groups/<id>/send-message end to end, with the check enforced and
+    with it stubbed out, so the difference is the check's share of a real send
+
+Pass --database-url to run against Postgres instead (the tables are dropped and recreated).
+
+Usage:
+  python benchmarks/bench_membership.py [--lookups 20000] [--messages 500] [--groups 200] [--database-url URL]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--groups", type=int, default=200)
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def seed(db, n_groups):
+    from backend.models import Group, GroupMember, User
+    from backend.search import ensure_search_index
+
+    db.drop_all()
+    db.create_all()
+    ensure_search_index()
+    users = [User(email=f"user{i}@example.com", name=f"User {i}") for i in range(20)]
+    db.session.add_all(users)
+    db.session.flush()
+    for g in range(n_groups):
+        group = Group(name=f"Group {g}", description="bench", creator_id=users[g % 20].id)
+        db.session.add(group)
+        db.session.flush()
+        # The bench user (users[0]) is in every other group
+        members = {users[g % 20].id, *(u.id for u in users[1:6])} | ({users[0].id} if g % 2 == 0 else set())
+        db.session.add_all(GroupMember(user_id=uid, group_id=group.id) for uid in members)
+    db.session.commit()
+    return users[0]
+
+
+def time_per_call(fn, n):
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    args = parse_args()
+    tmpdir = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+    os.environ.setdefault("SESSION_BACKEND", "cookie")
+
+    from backend import views
+    from backend.app import create_app
+    from backend.extensions import db
+    from backend.membership_cache import is_member
+    from backend.models import GroupMember
+
+    app = create_app()
+    with app.app_context():
+        user = seed(db, args.groups)
+        user_id = user.id
+        group_ids = list(range(1, args.groups + 1))
+        joined = group_ids[::2]  # matches the seeding above
+
+        is_member(user_id, 1)  # warm
+        cached = time_per_call(lambda i: is_member(user_id, joined[i % len(joined)]), args.lookups)
+        naive = time_per_call(
+            lambda i: db.session.query(GroupMember.id)
+            .filter_by(user_id=user_id, group_id=group_ids[i % len(group_ids)])
+            .first(),
+            min(args.lookups, 5000),
+        )
+
+    client = app.test_client()
+    with client.session_transaction() as s:
+        s["user"] = {"id": user_id, "name": user.name, "email": user.email, "picture": None}
+
+    def send(i):
+        response = client.post("/api/groups/1/send-message", json={"message": f"bench message {i}"})
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    send(-1)  # warm
+    enforced = time_per_call(send, args.messages)
+    real_is_member = views.is_member
+    views.is_member = lambda user_id, group_id: True
+    try:
+        unchecked = time_per_call(send, args.messages)
+    finally:
+        views.is_member = real_is_member
+
+    print(f"{'operation':<40}{'us/call':>10}")
+    print(f"{'is_member (warm cache)':<40}{cached:>10.2f}")
+    print(f"{'GroupMember query (naive check)':<40}{naive:>10.2f}")
+    print(f"{'send-message, check stubbed out':<40}{unchecked:>10.1f}")
+    print(f"{'send-message, membership enforced':<40}{enforced:>10.1f}")
+    print(f"cached check is {cached / unchecked * 100:.3f}% of a send; a per-message query would be "
+          f"{naive / unchecked * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Compare Flask jsonify against the msgspec response layer (backend/schemas.py).
+
+Builds synthetic payloads shaped like get_messages, discover_groups and
+admin_list_users and times encoding each one both ways. No database needed.
+
+Usage:
+  python benchmarks/bench_serialization.py [--messages 5000] [--groups 500] [--users 5000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify  # noqa: E402
+
+from backend.schemas import AdminUserOut, GroupSummaryOut, MemberOut, MessageOut, json_response  # noqa: E402
+
+
+def build_payloads(n_messages: int, n_groups: int, n_users: int):
+    now = datetime.utcnow()
+    messages = [
+        {
+            "id": i,
+            "user_id": i % 100,
+            "user": f"User {i % 100}",
+            "message": f"Message number {i} — let's go 🔥",
+            "created_at": now - timedelta(minutes=i),
+            "user_image": f"https://lh3.googleusercontent.com/a/avatar-{i % 100}=s96-c",
+        }
+        for i in range(n_messages)
+    ]
+    groups = [
+        {
+            "id": g,
+            "name": f"Group {g}",
+            "description": "Build the habit together, every single day.",
+            "created_by": f"user{g}@example.com",
+            "member_count": 10,
+            "is_member": g % 3 == 0,
+            "member_preview": [
+                {"id": m, "name": f"User {m}", "email": f"user{m}@example.com", "user_image": f"/faces/face_{m:03d}.jpg"}
+                for m in range(5)
+            ],
+        }
+        for g in range(n_groups)
+    ]
+    users = [
+        {"id": u, "name": f"User {u}", "email": f"user{u}@example.com", "picture": None, "group_count": u % 7}
+        for u in range(n_users)
+    ]
+
+    as_dicts = {
+        "get_messages": {"messages": [dict(m, created_at=m["created_at"].isoformat()) for m in messages]},
+        "discover_groups": {"groups": groups},
+        "admin_list_users": {"users": users},
+    }
+    as_structs = {
+        "get_messages": {"messages": [MessageOut(**m) for m in messages]},
+        "discover_groups": {
+            "groups": [GroupSummaryOut(**dict(g, member_preview=[MemberOut(**m) for m in g["member_preview"]])) for g in groups]
+        },
+        "admin_list_users": {"users": [AdminUserOut(**u) for u in users]},
+    }
+    return as_dicts, as_structs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--groups", type=int, default=500)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    as_dicts, as_structs = build_payloads(args.messages, args.groups, args.users)
+
+    print(f"{'payload':<18} {'bytes':>10} {'jsonify ms':>12} {'msgspec ms':>12} {'speedup':>8}")
+    with app.app_context():
+        for name in as_dicts:
+            body = json_response(as_structs[name]).get_data()
+            t_jsonify = timeit.timeit(lambda: jsonify(as_dicts[name]).get_data(), number=args.repeat)
+            t_msgspec = timeit.timeit(lambda: json_response(as_structs[name]).get_data(), number=args.repeat)
+            ms_jsonify = t_jsonify / args.repeat * 1000
+            ms_msgspec = t_msgspec / args.repeat * 1000
+            print(
+                f"{name:<18} {len(body):>10} {ms_jsonify:>12.2f} {ms_msgspec:>12.2f} "
+                f"{ms_jsonify / ms_msgspec:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Per-request overhead of each session backend (backend/sessions.py).
+
+Runs a logged-in client against a minimal Flask app whose view only reads
+session["user"], so the time per request is Flask plus the session layer.
+The SQLAlchemy backend uses a throwaway SQLite file; pass --database-url to
+point it at Postgres, and --redis-url to include the Redis backend.
+
+Usage:
+  python benchmarks/bench_sessions.py [--requests 2000] [--database-url URL] [--redis-url URL]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify, session  # noqa: E402
+
+from backend.extensions import db  # noqa: E402
+from backend.sessions import init_sessions  # noqa: E402
+
+
+def build_app(backend: str, database_url: str, read_cache_ttl: str) -> Flask:
+    os.environ["SESSION_READ_CACHE_TTL"] = read_cache_ttl
+    app = Flask(__name__)
+    app.secret_key = "bench"
+    app.config["SQLALCHEMY_DATABASE_URI"] = database_url
+    app.config["SESSION_PERMANENT"] = True
+    app.config["PERMANENT_SESSION_LIFETIME"] = 3600
+    app.config["SESSION_USE_SIGNER"] = True
+    app.config["SESSION_KEY_PREFIX"] = "session:"
+    db.init_app(app)
+    init_sessions(app, backend)
+
+    @app.post("/login")
+    def login():
+        session["user"] = {"id": 1, "name": "Bench User", "email": "bench@example.com", "picture": None}
+        return jsonify({"ok": True})
+
+    @app.get("/me")
+    def me():
+        return jsonify({"user": session.get("user")})
+
+    return app
+
+
+def run(app: Flask, n_requests: int) -> float:
+    client = app.test_client()
+    client.post("/login")
+    for _ in range(50):  # warm up connections and caches
+        client.get("/me")
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        response = client.get("/me")
+    elapsed = time.perf_counter() - start
+    assert response.get_json()["user"]["email"] == "bench@example.com"
+    return elapsed / n_requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp()
+    database_url = args.database_url or f"sqlite:///{os.path.join(tmpdir, 'sessions.db')}"
+
+    cases = [
+        ("sqlalchemy", "sqlalchemy", "0"),
+        ("sqlalchemy + read cache", "sqlalchemy", "2"),
+        ("cookie", "cookie", "0"),
+        ("local", "local", "0"),
+    ]
+    if args.redis_url:
+        os.environ["SESSION_REDIS_URL"] = args.redis_url
+        cases += [("redis", "redis", "0"), ("redis + read cache", "redis", "2")]
+
+    print(f"{'backend':<26}{'us/request':>12}")
+    for label, backend, read_cache_ttl in cases:
+        app = build_app(backend, database_url, read_cache_ttl)
+        print(f"{label:<26}{run(app, args.requests):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,18 +5,32 @@ Usage examples:
   python manual_db_add.py add-user --email "a@b.com" --name "Alex"
   python manual_db_add.py add-group --name "Study Sprint" --description "Daily grind" --creator-email "a@b.com"
   python manual_db_add.py add-member --group-id 1 --user-email "b@c.com"
+  python manual_db_add.py bulk-members join --pair "b@c.com:1" --pair "c@d.com:1" --file memberships.csv
   python manual_db_add.py add-message --group-id 1 --user-email "a@b.com" --content "Let's go!"
   python manual_db_add.py add-activity --group-id 1 --user-email "a@b.com" --date 2026-04-06
+  python manual_db_add.py rebuild-search-index
+  python manual_db_add.py rebuild-member-stats [--group-id 1]
+  python manual_db_add.py archive-messages --older-than-days 90 --batch-size 1000
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
 from datetime import datetime
 
 from backend.app import create_app
 from backend.extensions import db
-from backend.models import Group, GroupMember, Message, User, UserActivity
+from backend.models import Group, GroupMember, Message, User
+from backend.search import index_group, index_message, rebuild_search_index
+from backend.archive import archive_messages
+from backend.catalog import invalidate_catalog
+from backend.changes import MEMBER_JOINED, MESSAGE_CREATED, record_change
+from backend.completions import add_completion
+from backend.leaderboard_store import check_leaderboards, invalidate_leaderboards, rebuild_leaderboards
+from backend.member_stats import rebuild_member_stats
+from backend.streaks import recompute_streaks
+from backend.memberships import USER_NOT_FOUND, bulk_join, bulk_leave, summarize
 
 
 def _get_user_by_email(email: str) -> User:
@@ -40,13 +54,16 @@ def cmd_add_user(args: argparse.Namespace) -> None:
 
 def cmd_add_group(args: argparse.Namespace) -> None:
     creator = _get_user_by_email(args.creator_email)
-    group = Group(name=args.name, description=args.description)
+    group = Group(name=args.name, description=args.description, creator_id=creator.id)
     db.session.add(group)
     db.session.flush()
+    index_group(group)
 
     membership = GroupMember(user_id=creator.id, group_id=group.id)
     db.session.add(membership)
+    record_change(group.id, MEMBER_JOINED, user_id=creator.id)
     db.session.commit()
+    invalidate_catalog()
     print(f"Created group: id={group.id}, name={group.name}, creator={creator.email}")
 
 
@@ -62,23 +79,56 @@ def cmd_add_member(args: argparse.Namespace) -> None:
         return
 
     db.session.add(GroupMember(user_id=user.id, group_id=group.id))
+    record_change(group.id, MEMBER_JOINED, user_id=user.id)
     db.session.commit()
+    invalidate_catalog()
     print(f"Added member: user={user.email} -> group_id={group.id}")
 
 
+def _read_member_pairs(args: argparse.Namespace) -> list[tuple[str, int]]:
+    """(email, group_id) pairs from --pair EMAIL:GROUP_ID and --file (CSV rows: email,group_id)."""
+    pairs = []
+    for raw in args.pair or []:
+        email, _, group_id = raw.rpartition(":")
+        pairs.append((email.strip(), int(group_id)))
+    if args.file:
+        with open(args.file, newline="") as f:
+            for row in csv.reader(f):
+                if not row or row[0].strip().lower() in ("", "email", "user_email"):
+                    continue
+                pairs.append((row[0].strip(), int(row[1])))
+    if not pairs:
+        raise ValueError("No memberships given; use --pair and/or --file")
+    return pairs
+
+
+def cmd_bulk_members(args: argparse.Namespace) -> None:
+    pairs = _read_member_pairs(args)
+    emails = {email for email, _ in pairs}
+    ids = dict(db.session.execute(db.select(User.email, User.id).where(User.email.in_(emails))).all())
+
+    known = [(ids[email], group_id) for email, group_id in pairs if email in ids]
+    results = iter((bulk_join if args.action == "join" else bulk_leave)(known))
+    report = []
+    for email, group_id in pairs:
+        status = next(results)["status"] if email in ids else USER_NOT_FOUND
+        report.append({"status": status})
+        print(f"{status:<16} user={email} group_id={group_id}")
+    summary = ", ".join(f"{status}={count}" for status, count in sorted(summarize(report).items()))
+    print(f"Bulk {args.action}: {summary}")
+
+
 def cmd_add_message(args: argparse.Namespace) -> None:
     user = _get_user_by_email(args.user_email)
     group = Group.query.get(args.group_id)
     if not group:
         raise ValueError(f"Group not found: {args.group_id}")
 
-    msg = Message(
-        group_id=group.id,
-        user_name=user.name,
-        content=args.content,
-        user_image=user.picture or "https://via.placeholder.com/40",
-    )
+    msg = Message(group_id=group.id, user_id=user.id, content=args.content)
     db.session.add(msg)
+    db.session.flush()
+    index_message(msg)
+    record_change(group.id, MESSAGE_CREATED, entity_id=msg.id, user_id=user.id)
     db.session.commit()
     print(f"Added message: id={msg.id}, group_id={group.id}, user={user.email}")
 
@@ -90,19 +140,54 @@ def cmd_add_activity(args: argparse.Namespace) -> None:
         raise ValueError(f"Group not found: {args.group_id}")
 
     completed_date = datetime.strptime(args.date, "%Y-%m-%d").date()
-    exists = UserActivity.query.filter_by(
-        user_id=user.id, group_id=group.id, completed_date=completed_date
-    ).first()
-    if exists:
+    completion = add_completion(group.id, user.id, completed_date)
+    if completion is None:
         print(
             f"Activity already exists: user={user.email}, group_id={group.id}, date={args.date}"
         )
         return
 
-    act = UserActivity(user_id=user.id, group_id=group.id, completed_date=completed_date)
-    db.session.add(act)
+    # The date may be a backfill, which the in-place streak update does not cover.
+    recompute_streaks(pairs=[(group.id, user.id)])
+    db.session.commit()
+    invalidate_leaderboards([group.id])
+    print(f"Added activity: id={completion.id}, user={user.email}, group_id={group.id}, date={args.date}")
+
+
+def cmd_rebuild_search_index(args: argparse.Namespace) -> None:
+    rebuild_search_index()
+    db.session.commit()
+    print("Rebuilt message search index")
+
+
+def cmd_rebuild_member_stats(args: argparse.Namespace) -> None:
+    written, drift = rebuild_member_stats(args.group_id)
     db.session.commit()
-    print(f"Added activity: id={act.id}, user={user.email}, group_id={group.id}, date={args.date}")
+    invalidate_leaderboards(args.group_id or db.session.scalars(db.select(Group.id)).all())
+    scope = f"group_ids={args.group_id}" if args.group_id else "all groups"
+    print(f"Rebuilt leaderboard stats for {scope}: {written} rows, {drift} were out of date")
+
+
+def cmd_rebuild_leaderboards(args: argparse.Namespace) -> None:
+    groups, rows = rebuild_leaderboards(args.group_id)
+    print(f"Loaded {groups} group leaderboards ({rows} members) into the leaderboard store")
+
+
+def cmd_check_leaderboards(args: argparse.Namespace) -> None:
+    drift = check_leaderboards(args.group_id)
+    if not drift:
+        print("Leaderboard store matches the database")
+        return
+    for group_id, members in sorted(drift.items()):
+        print(f"group_id={group_id}: {members} members out of date")
+    if args.fix:
+        rebuild_leaderboards(list(drift))
+        print(f"Reloaded {len(drift)} groups")
+
+
+def cmd_archive_messages(args: argparse.Namespace) -> None:
+    moved = archive_messages(args.older_than_days, batch_size=args.batch_size, max_batches=args.max_batches)
+    print(f"Archived {moved} messages older than {args.older_than_days} days")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -126,6 +211,12 @@ def build_parser() -> argparse.ArgumentParser:
     p_member.add_argument("--user-email", required=True)
     p_member.set_defaults(func=cmd_add_member)
 
+    p_bulk = sub.add_parser("bulk-members", help="Join or leave many (user, group) pairs in one transaction")
+    p_bulk.add_argument("action", choices=["join", "leave"])
+    p_bulk.add_argument("--pair", action="append", help="EMAIL:GROUP_ID (repeatable)")
+    p_bulk.add_argument("--file", default=None, help="CSV with email,group_id rows")
+    p_bulk.set_defaults(func=cmd_bulk_members)
+
     p_msg = sub.add_parser("add-message", help="Add chat message")
     p_msg.add_argument("--group-id", required=True, type=int)
     p_msg.add_argument("--user-email", required=True)
@@ -138,6 +229,28 @@ def build_parser() -> argparse.ArgumentParser:
     p_act.add_argument("--date", required=True, help="YYYY-MM-DD")
     p_act.set_defaults(func=cmd_add_activity)
 
+    p_search = sub.add_parser("rebuild-search-index", help="Re-index all chat messages for search")
+    p_search.set_defaults(func=cmd_rebuild_search_index)
+
+    p_stats = sub.add_parser("rebuild-member-stats", help="Recompute leaderboard counters from user_activity")
+    p_stats.add_argument("--group-id", type=int, action="append", default=None, help="Limit to a group (repeatable)")
+    p_stats.set_defaults(func=cmd_rebuild_member_stats)
+
+    p_board = sub.add_parser("rebuild-leaderboards", help="Load leaderboards into LEADERBOARD_BACKEND from the database")
+    p_board.add_argument("--group-id", type=int, action="append", default=None, help="Limit to a group (repeatable)")
+    p_board.set_defaults(func=cmd_rebuild_leaderboards)
+
+    p_drift = sub.add_parser("check-leaderboards", help="Compare loaded leaderboards with the database")
+    p_drift.add_argument("--group-id", type=int, action="append", default=None, help="Limit to a group (repeatable)")
+    p_drift.add_argument("--fix", action="store_true", help="Reload the groups that drifted")
+    p_drift.set_defaults(func=cmd_check_leaderboards)
+
+    p_archive = sub.add_parser("archive-messages", help="Move old chat messages into messages_archive")
+    p_archive.add_argument("--older-than-days", type=int, default=90)
+    p_archive.add_argument("--batch-size", type=int, default=1000)
+    p_archive.add_argument("--max-batches", type=int, default=None)
+    p_archive.set_defaults(func=cmd_archive_messages)
+
     return parser
 
 
@@ -0,0 +1,34 @@
+"""Add group_read_state table for unread counts
+
+Revision ID: 0a7d3e5b9c21
+Revises: f1c6b92d4a08
+Create Date: 2026-10-18 14:12:36.551087
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a7d3e5b9c21'
+down_revision = 'f1c6b92d4a08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('group_read_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('last_read_message_id', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['group_id'], ['group.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'group_id', name='uq_group_read_state_user_id_group_id')
+    )
+
+
+def downgrade():
+    op.drop_table('group_read_state')
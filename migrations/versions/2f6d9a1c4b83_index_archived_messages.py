@@ -0,0 +1,40 @@
+"""Keep archived messages in the full-text index
+
+Revision ID: 2f6d9a1c4b83
+Revises: 8e4b2d6f0c17
+Create Date: 2026-10-18 21:14:52.604118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2f6d9a1c4b83'
+down_revision = '8e4b2d6f0c17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # Rows archived before this revision were dropped from the index; put them back.
+        op.execute(
+            "INSERT INTO messages_fts (rowid, content, group_id) "
+            "SELECT id, content, group_id FROM messages_archive "
+            "WHERE id NOT IN (SELECT rowid FROM messages_fts)"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_messages_archive_content_fts ON messages_archive "
+            "USING GIN (to_tsvector('english', content))"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DELETE FROM messages_fts WHERE rowid IN (SELECT id FROM messages_archive)")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_messages_archive_content_fts")
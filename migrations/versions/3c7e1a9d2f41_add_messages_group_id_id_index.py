@@ -0,0 +1,26 @@
+"""Add composite (group_id, id) index on messages
+
+Revision ID: 3c7e1a9d2f41
+Revises: ab9f005b7ef2
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7e1a9d2f41'
+down_revision = 'ab9f005b7ef2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.create_index('ix_messages_group_id_id', ['group_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_index('ix_messages_group_id_id')
@@ -0,0 +1,45 @@
+"""Add group_member_stats leaderboard counters
+
+Revision ID: 4d8a1f6c3e52
+Revises: 9b5f2c8e7d14
+Create Date: 2026-10-18 16:21:40.583219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d8a1f6c3e52'
+down_revision = '9b5f2c8e7d14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('group_member_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('completion_count', sa.Integer(), nullable=False),
+    sa.Column('last_completed', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['group_id'], ['group.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('group_id', 'user_id', name='uq_group_member_stats_group_id_user_id')
+    )
+    with op.batch_alter_table('group_member_stats', schema=None) as batch_op:
+        batch_op.create_index('ix_group_member_stats_group_id_completion_count', ['group_id', 'completion_count'], unique=False)
+
+    op.execute(
+        'INSERT INTO group_member_stats (group_id, user_id, completion_count, last_completed) '
+        'SELECT group_id, user_id, COUNT(id), MAX(completed_date) FROM user_activity '
+        'GROUP BY group_id, user_id'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('group_member_stats', schema=None) as batch_op:
+        batch_op.drop_index('ix_group_member_stats_group_id_completion_count')
+
+    op.drop_table('group_member_stats')
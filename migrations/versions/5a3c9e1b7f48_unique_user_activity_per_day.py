@@ -0,0 +1,42 @@
+"""One user_activity row per user, group and day
+
+Revision ID: 5a3c9e1b7f48
+Revises: c6e0a7b3d915
+Create Date: 2026-10-18 17:44:05.271836
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a3c9e1b7f48'
+down_revision = 'c6e0a7b3d915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the earliest row of each duplicated day, then fix the counts that included the rest.
+    op.execute(
+        'DELETE FROM user_activity WHERE id NOT IN ('
+        'SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM user_activity '
+        'GROUP BY user_id, group_id, completed_date) AS keepers)'
+    )
+    op.execute(
+        'UPDATE group_member_stats SET completion_count = ('
+        'SELECT COUNT(*) FROM user_activity '
+        'WHERE user_activity.group_id = group_member_stats.group_id '
+        'AND user_activity.user_id = group_member_stats.user_id)'
+    )
+    with op.batch_alter_table('user_activity', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_user_activity_user_id_group_id_completed_date',
+            ['user_id', 'group_id', 'completed_date'],
+            unique=True,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('user_activity', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_activity_user_id_group_id_completed_date')
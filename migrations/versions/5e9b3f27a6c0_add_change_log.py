@@ -0,0 +1,39 @@
+"""Add change_log table for delta sync
+
+Revision ID: 5e9b3f27a6c0
+Revises: d52f0b7c8e13
+Create Date: 2026-10-18 11:31:52.874410
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9b3f27a6c0'
+down_revision = 'd52f0b7c8e13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('change_log',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.create_index('ix_change_log_group_id_id', ['group_id', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_change_log_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_change_log_user_id'))
+        batch_op.drop_index('ix_change_log_group_id_id')
+
+    op.drop_table('change_log')
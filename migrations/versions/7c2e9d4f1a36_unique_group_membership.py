@@ -0,0 +1,32 @@
+"""Make (user_id, group_id) unique in group_members
+
+Revision ID: 7c2e9d4f1a36
+Revises: 0a7d3e5b9c21
+Create Date: 2026-10-18 15:03:27.904512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2e9d4f1a36'
+down_revision = '0a7d3e5b9c21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the earliest row of any duplicated membership; nothing references membership ids.
+    op.execute(
+        'DELETE FROM group_members WHERE id NOT IN ('
+        'SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM group_members '
+        'GROUP BY user_id, group_id) AS keepers)'
+    )
+    with op.batch_alter_table('group_members', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_group_members_user_id_group_id', ['user_id', 'group_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('group_members', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_group_members_user_id_group_id', type_='unique')
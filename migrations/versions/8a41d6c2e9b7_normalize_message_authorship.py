@@ -0,0 +1,55 @@
+"""Normalize message authorship to user_id
+
+Revision ID: 8a41d6c2e9b7
+Revises: 3c7e1a9d2f41
+Create Date: 2026-10-18 10:03:27.550912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a41d6c2e9b7'
+down_revision = '3c7e1a9d2f41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_messages_user_id', ['user_id'], unique=False)
+        batch_op.create_foreign_key('fk_messages_user_id_user', 'user', ['user_id'], ['id'])
+
+    # Backfill from the denormalized author name. Names are not unique, so ties go to the
+    # oldest account; rows whose author no longer exists keep a NULL user_id.
+    op.execute(
+        'UPDATE messages SET user_id = '
+        '(SELECT MIN("user".id) FROM "user" WHERE "user".name = messages.user_name)'
+    )
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.drop_column('user_image')
+        batch_op.drop_column('user_name')
+
+
+def downgrade():
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_name', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('user_image', sa.String(), nullable=True))
+
+    op.execute(
+        'UPDATE messages SET '
+        'user_name = (SELECT "user".name FROM "user" WHERE "user".id = messages.user_id), '
+        'user_image = (SELECT COALESCE("user".picture, \'\') FROM "user" WHERE "user".id = messages.user_id)'
+    )
+    op.execute("UPDATE messages SET user_name = 'Unknown' WHERE user_name IS NULL")
+    op.execute("UPDATE messages SET user_image = '' WHERE user_image IS NULL")
+
+    with op.batch_alter_table('messages', schema=None) as batch_op:
+        batch_op.alter_column('user_name', existing_type=sa.String(length=100), nullable=False)
+        batch_op.alter_column('user_image', existing_type=sa.String(), nullable=False)
+        batch_op.drop_constraint('fk_messages_user_id_user', type_='foreignkey')
+        batch_op.drop_index('ix_messages_user_id')
+        batch_op.drop_column('user_id')
@@ -0,0 +1,29 @@
+"""Cover windowed leaderboards with a (group_id, completed_date, user_id) index
+
+Revision ID: 8e4b2d6f0c17
+Revises: 5a3c9e1b7f48
+Create Date: 2026-10-18 19:02:37.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4b2d6f0c17'
+down_revision = '5a3c9e1b7f48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Building the index is the rollup backfill: every existing row is indexed by group and day.
+    with op.batch_alter_table('user_activity', schema=None) as batch_op:
+        batch_op.create_index('ix_user_activity_group_id_completed_date_user_id', ['group_id', 'completed_date', 'user_id'], unique=False)
+        batch_op.drop_index('ix_user_activity_group_id_completed_date')
+
+
+def downgrade():
+    with op.batch_alter_table('user_activity', schema=None) as batch_op:
+        batch_op.create_index('ix_user_activity_group_id_completed_date', ['group_id', 'completed_date'], unique=False)
+        batch_op.drop_index('ix_user_activity_group_id_completed_date_user_id')
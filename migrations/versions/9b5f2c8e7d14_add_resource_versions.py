@@ -0,0 +1,29 @@
+"""Add resource_versions counters for conditional GETs
+
+Revision ID: 9b5f2c8e7d14
+Revises: 7c2e9d4f1a36
+Create Date: 2026-10-18 15:48:52.117630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b5f2c8e7d14'
+down_revision = '7c2e9d4f1a36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resource_versions',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade():
+    op.drop_table('resource_versions')
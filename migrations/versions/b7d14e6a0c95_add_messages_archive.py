@@ -0,0 +1,39 @@
+"""Add messages_archive table for cold chat history
+
+Revision ID: b7d14e6a0c95
+Revises: 5e9b3f27a6c0
+Create Date: 2026-10-18 12:20:16.409337
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d14e6a0c95'
+down_revision = '5e9b3f27a6c0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('messages_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('group_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('messages_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_messages_archive_group_id_id', ['group_id', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_messages_archive_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('messages_archive', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_messages_archive_user_id'))
+        batch_op.drop_index('ix_messages_archive_group_id_id')
+
+    op.drop_table('messages_archive')
@@ -0,0 +1,77 @@
+"""Add streak columns to group_member_stats
+
+Revision ID: c6e0a7b3d915
+Revises: 4d8a1f6c3e52
+Create Date: 2026-10-18 17:02:13.640981
+
+"""
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e0a7b3d915'
+down_revision = '4d8a1f6c3e52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('group_member_stats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('current_streak', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('longest_streak', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('streak_start', sa.Date(), nullable=True))
+
+    # Backfill from the distinct completion dates of every (group, user), oldest first.
+    activity = sa.table(
+        'user_activity',
+        sa.column('group_id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('completed_date', sa.Date),
+    )
+    stats = sa.table(
+        'group_member_stats',
+        sa.column('group_id', sa.Integer),
+        sa.column('user_id', sa.Integer),
+        sa.column('current_streak', sa.Integer),
+        sa.column('longest_streak', sa.Integer),
+        sa.column('streak_start', sa.Date),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(activity.c.group_id, activity.c.user_id, activity.c.completed_date)
+        .distinct()
+        .order_by(activity.c.group_id, activity.c.user_id, activity.c.completed_date)
+    )
+    runs = {}
+    for group_id, user_id, day in rows:
+        current, start, longest, previous = runs.get((group_id, user_id), (0, None, 0, None))
+        if previous is not None and day == previous + timedelta(days=1):
+            current += 1
+        else:
+            current, start = 1, day
+        runs[(group_id, user_id)] = (current, start, max(longest, current), day)
+
+    if runs:
+        bind.execute(
+            stats.update()
+            .where(stats.c.group_id == sa.bindparam('g_id'), stats.c.user_id == sa.bindparam('u_id'))
+            .values(
+                current_streak=sa.bindparam('current'),
+                longest_streak=sa.bindparam('longest'),
+                streak_start=sa.bindparam('start'),
+            ),
+            [
+                {"g_id": g, "u_id": u, "current": current, "longest": longest, "start": start}
+                for (g, u), (current, start, longest, _) in runs.items()
+            ],
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('group_member_stats', schema=None) as batch_op:
+        batch_op.drop_column('streak_start')
+        batch_op.drop_column('longest_streak')
+        batch_op.drop_column('current_streak')
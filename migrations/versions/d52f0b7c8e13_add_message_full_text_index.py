@@ -0,0 +1,44 @@
+"""Add full-text index over message content
+
+Revision ID: d52f0b7c8e13
+Revises: 8a41d6c2e9b7
+Create Date: 2026-10-18 10:48:05.203771
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd52f0b7c8e13'
+down_revision = '8a41d6c2e9b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5("
+            "content, group_id UNINDEXED, tokenize = 'porter unicode61')"
+        )
+        # The app may already have created and filled the table at startup (ensure_search_index).
+        op.execute("DELETE FROM messages_fts")
+        op.execute(
+            "INSERT INTO messages_fts (rowid, content, group_id) "
+            "SELECT id, content, group_id FROM messages"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_messages_content_fts ON messages "
+            "USING GIN (to_tsvector('english', content))"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS messages_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_messages_content_fts")
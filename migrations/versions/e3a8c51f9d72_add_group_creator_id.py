@@ -0,0 +1,38 @@
+"""Persist the group creator
+
+Revision ID: e3a8c51f9d72
+Revises: b7d14e6a0c95
+Create Date: 2026-10-18 12:41:09.318244
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a8c51f9d72'
+down_revision = 'b7d14e6a0c95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('group', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('creator_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_group_creator_id', ['creator_id'], unique=False)
+        batch_op.create_foreign_key('fk_group_creator_id_user', 'user', ['creator_id'], ['id'])
+
+    # The creator used to be derived as the earliest membership row of the group.
+    op.execute(
+        'UPDATE "group" SET creator_id = ('
+        'SELECT group_members.user_id FROM group_members '
+        'WHERE group_members.group_id = "group".id '
+        'ORDER BY group_members.id LIMIT 1)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('group', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_group_creator_id_user', type_='foreignkey')
+        batch_op.drop_index('ix_group_creator_id')
+        batch_op.drop_column('creator_id')
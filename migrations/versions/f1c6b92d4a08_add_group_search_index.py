@@ -0,0 +1,50 @@
+"""Add full-text index over groups and an activity index for ranking
+
+Revision ID: f1c6b92d4a08
+Revises: e3a8c51f9d72
+Create Date: 2026-10-18 13:27:44.905118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c6b92d4a08'
+down_revision = 'e3a8c51f9d72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_activity', schema=None) as batch_op:
+        batch_op.create_index('ix_user_activity_group_id_completed_date', ['group_id', 'completed_date'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS groups_fts USING fts5("
+            "name, description, tokenize = 'porter unicode61')"
+        )
+        # The app may already have created and filled the table at startup (ensure_search_index).
+        op.execute("DELETE FROM groups_fts")
+        op.execute(
+            "INSERT INTO groups_fts (rowid, name, description) "
+            "SELECT id, name, coalesce(description, '') FROM \"group\""
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_group_search_fts ON \"group\" "
+            "USING GIN (to_tsvector('english', name || ' ' || coalesce(description, '')))"
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS groups_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_group_search_fts")
+
+    with op.batch_alter_table('user_activity', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_activity_group_id_completed_date')
@@ -14,9 +14,18 @@ interface Group {
   name: string;
   description: string;
   created_by?: string;
-  members: Array<{ email: string; user_image?: string; name?: string }>;
+  member_count: number;
+  is_member: boolean;
+  member_preview: Array<{ email: string; user_image?: string; name?: string }>;
+  // Present on joined groups, which come from /api/me/dashboard
+  completed_today?: boolean;
+  streak?: number;
+  rank?: number | null;
+  completion_count?: number;
+  unread_count?: number;
 }
 
+
 const INTEREST_TAGS = [
   { label: "Fitness", emoji: "💪", keywords: ["workout", "exercise", "gym", "steps", "walk", "run", "cold shower"] },
   { label: "Reading", emoji: "📚", keywords: ["read", "pages", "book"] },
@@ -47,11 +56,17 @@ export default function Profile() {
   const {
     data: allGroups,
     isLoading: allGroupsLoading,
-  } = useQuery<Group[]>({
+  } = useQuery<{ joined: Group[]; notJoined: Group[] }>({
     queryKey: ["allGroups"],
     queryFn: async () => {
-      const response = await axios.get("/api/groups/discover", { withCredentials: true });
-      return response.data.groups || [];
+      const [joined, notJoined] = await Promise.all([
+        axios.get("/api/me/dashboard", { withCredentials: true }),
+        axios.get("/api/groups/discover", {
+          withCredentials: true,
+          params: { membership: "not_joined", limit: 50 },
+        }),
+      ]);
+      return { joined: joined.data.groups || [], notJoined: notJoined.data.groups || [] };
     },
     enabled: !!user,
     staleTime: 60 * 1000,
@@ -61,7 +76,7 @@ export default function Profile() {
 
   const joinedGroups = useMemo(() => {
     if (!allGroups || !user) return undefined;
-    return allGroups.filter((g) => g.members.some((m) => m.email === user.email));
+    return allGroups.joined;
   }, [allGroups, user]);
 
   const groupsError = null;
@@ -77,9 +92,7 @@ export default function Profile() {
 
   const suggestedGroups = useMemo(() => {
     if (!allGroups || !user) return [];
-    const notJoined = allGroups.filter(
-      (g) => !g.members.some((m) => m.email === user.email)
-    );
+    const notJoined = allGroups.notJoined;
     if (selectedTags.length === 0) return notJoined.slice(0, 6);
 
     const activeKeywords = INTEREST_TAGS
@@ -261,7 +274,7 @@ export default function Profile() {
                         <p className="text-xs text-[var(--text-secondary)] line-clamp-2 mb-3">{group.description}</p>
                         <div className="flex items-center gap-1 mb-3">
                           <div className="flex -space-x-1.5">
-                            {group.members.slice(0, 4).map((m, mi) => (
+                            {group.member_preview.slice(0, 4).map((m, mi) => (
                               <img
                                 key={mi}
                                 src={m.user_image || "https://via.placeholder.com/24"}
@@ -271,7 +284,7 @@ export default function Profile() {
                             ))}
                           </div>
                           <span className="text-[10px] text-[var(--text-muted)] ml-1">
-                            {group.members.length} member{group.members.length !== 1 ? "s" : ""}
+                            {group.member_count} member{group.member_count !== 1 ? "s" : ""}
                           </span>
                         </div>
                       </div>
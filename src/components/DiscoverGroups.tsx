@@ -4,7 +4,7 @@
 import React, { useEffect, useState, useCallback, memo } from "react";
 import { useRouter } from "next/navigation";
 import { useQueryClient } from "@tanstack/react-query";
-import { fetchGroups, joinGroup } from "../utils/api";
+import { fetchGroups, joinGroup, searchGroups } from "../utils/api";
 
 type Member = {
   user_image: string | undefined;
@@ -17,7 +17,9 @@ type Group = {
   id: number;
   name: string;
   description: string;
-  members: Member[];
+  member_count: number;
+  is_member: boolean;
+  member_preview: Member[];
 };
 
 export default function DiscoverGroups() {
@@ -28,6 +30,10 @@ export default function DiscoverGroups() {
   const [isLoggedIn, setIsLoggedIn] = useState(false);
   const [error, setError] = useState<string>("");
   const [loading, setLoading] = useState<boolean>(true);
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [query, setQuery] = useState("");
+  const [searchResults, setSearchResults] = useState<Group[] | null>(null);
 
   const isJoined = useCallback((groupId: number) => joinedGroups.has(groupId), [joinedGroups]);
 
@@ -39,6 +45,8 @@ export default function DiscoverGroups() {
         const groupsResponse = await fetchGroups();
         const fetchedGroups = groupsResponse.data.groups;
         setGroups(fetchedGroups);
+        setNextCursor(groupsResponse.data.next_cursor);
+        setJoinedGroups(new Set(fetchedGroups.filter((g: Group) => g.is_member).map((g: Group) => g.id)));
 
         try {
           const profileRes = await fetch("/api/profile", { credentials: "include" });
@@ -46,10 +54,6 @@ export default function DiscoverGroups() {
             const profileData = await profileRes.json();
             if (profileData.user?.email) {
               setIsLoggedIn(true);
-              const joinedIds = fetchedGroups
-                .filter((group: Group) => group.members.some((m) => m.email === profileData.user.email))
-                .map((g: Group) => g.id);
-              setJoinedGroups(new Set(joinedIds));
             }
           }
         } catch {
@@ -65,6 +69,50 @@ export default function DiscoverGroups() {
     fetchData();
   }, []);
 
+  useEffect(() => {
+    const q = query.trim();
+    if (!q) {
+      setSearchResults(null);
+      return;
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const response = await searchGroups(q);
+        const results: Group[] = response.data.results;
+        setSearchResults(results);
+        setJoinedGroups((prev) => {
+          const next = new Set(prev);
+          results.filter((g) => g.is_member).forEach((g) => next.add(g.id));
+          return next;
+        });
+      } catch (err) {
+        console.error("Error searching groups:", err);
+      }
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [query]);
+
+  const handleLoadMore = useCallback(async () => {
+    if (nextCursor === null) return;
+    setLoadingMore(true);
+    try {
+      const response = await fetchGroups({ after_id: nextCursor });
+      const page: Group[] = response.data.groups;
+      setGroups((prev) => [...prev, ...page]);
+      setNextCursor(response.data.next_cursor);
+      setJoinedGroups((prev) => {
+        const next = new Set(prev);
+        page.filter((g) => g.is_member).forEach((g) => next.add(g.id));
+        return next;
+      });
+    } catch (err) {
+      console.error("Error fetching more groups:", err);
+      setError("Failed to fetch more groups.");
+    } finally {
+      setLoadingMore(false);
+    }
+  }, [nextCursor]);
+
   const handleJoin = useCallback(async (groupId: number) => {
     if (!isLoggedIn) {
       router.push("/login");
@@ -102,20 +150,42 @@ export default function DiscoverGroups() {
     );
   }
 
+  const visibleGroups = searchResults ?? groups;
+
   return (
     <div className="max-w-6xl mx-auto px-6 py-8">
-      {groups.length === 0 ? (
+      <input
+        type="search"
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+        placeholder="Search groups..."
+        className="w-full mb-6 px-4 py-2.5 rounded-xl text-sm bg-[var(--surface)] border border-[var(--border)] text-[var(--text-primary)] outline-none focus:border-[var(--primary)]"
+      />
+      {visibleGroups.length === 0 ? (
         <div className="text-center py-20">
           <span className="text-5xl block mb-4">🔍</span>
-          <p className="text-[var(--text-secondary)]">No groups available yet. Create one!</p>
+          <p className="text-[var(--text-secondary)]">
+            {searchResults ? "No groups match your search." : "No groups available yet. Create one!"}
+          </p>
         </div>
       ) : (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {groups.map((group, idx) => (
+          {visibleGroups.map((group, idx) => (
             <GroupItem key={group.id} group={group} isJoined={isJoined} handleJoin={handleJoin} delay={idx * 0.05} isLoggedIn={isLoggedIn} />
           ))}
         </div>
       )}
+      {searchResults === null && nextCursor !== null && (
+        <div className="flex justify-center mt-8">
+          <button
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            className="px-8 py-2.5 rounded-full text-sm font-semibold btn-primary"
+          >
+            {loadingMore ? "Loading..." : "Load more groups"}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
@@ -140,11 +210,11 @@ const GroupItem = memo(function GroupItem({ group, isJoined, handleJoin, delay,
           <svg className="w-3.5 h-3.5" fill="currentColor" viewBox="0 0 24 24">
             <path d="M16 11c1.66 0 2.99-1.34 2.99-3S17.66 5 16 5c-1.66 0-3 1.34-3 3s1.34 3 3 3zm-8 0c1.66 0 2.99-1.34 2.99-3S9.66 5 8 5C6.34 5 5 6.34 5 8s1.34 3 3 3zm0 2c-2.33 0-7 1.17-7 3.5V19h14v-2.5c0-2.33-4.67-3.5-7-3.5zm8 0c-.29 0-.62.02-.97.05 1.16.84 1.97 1.97 1.97 3.45V19h6v-2.5c0-2.33-4.67-3.5-7-3.5z" />
           </svg>
-          {group.members.length} {group.members.length === 1 ? "Member" : "Members"}
+          {group.member_count} {group.member_count === 1 ? "Member" : "Members"}
         </div>
 
         <div className="flex items-center mb-4">
-          {group.members.slice(0, 5).map((member, index) => (
+          {group.member_preview.map((member, index) => (
             <img
               key={index}
               src={member.user_image || "https://via.placeholder.com/32"}
@@ -153,8 +223,8 @@ const GroupItem = memo(function GroupItem({ group, isJoined, handleJoin, delay,
               className="rounded-full object-cover border-2 border-[var(--surface)] -ml-2 first:ml-0"
             />
           ))}
-          {group.members.length > 5 && (
-            <span className="text-xs text-[var(--text-muted)] ml-2">+{group.members.length - 5}</span>
+          {group.member_count > group.member_preview.length && (
+            <span className="text-xs text-[var(--text-muted)] ml-2">+{group.member_count - group.member_preview.length}</span>
           )}
         </div>
 
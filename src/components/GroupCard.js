@@ -20,7 +20,7 @@ const CARD_HEIGHT = 430;
 
 export default function GroupCard({ group, currentUserEmail, onGroupDeleted }) {
   const [activeTab, setActiveTab] = useState("activity");
-  const [alreadyCompleted, setAlreadyCompleted] = useState(false);
+  const [alreadyCompleted, setAlreadyCompleted] = useState(!!group.completed_today);
   const [error, setError] = useState("");
   const [loading, setLoading] = useState(true);
   const [leaderboardData, setLeaderboardData] = useState([]);
@@ -28,6 +28,11 @@ export default function GroupCard({ group, currentUserEmail, onGroupDeleted }) {
   const [isChatOpen, setIsChatOpen] = useState(false);
 
   useEffect(() => {
+    // Dashboard groups already carry today's state
+    if (group.completed_today !== undefined) {
+      setAlreadyCompleted(group.completed_today);
+      return;
+    }
     const run = async () => {
       try {
         const habitStatus = await checkHabitCompletion(group.id);
@@ -38,7 +43,7 @@ export default function GroupCard({ group, currentUserEmail, onGroupDeleted }) {
       }
     };
     run();
-  }, [group.id]);
+  }, [group.id, group.completed_today]);
 
   useEffect(() => {
     const run = async () => {
@@ -73,7 +78,7 @@ export default function GroupCard({ group, currentUserEmail, onGroupDeleted }) {
       await completeDailyTask(group.id);
       triggerHabitConfetti();
       setAlreadyCompleted(true);
-      const me = group.members.find((m) => m.email === currentUserEmail);
+      const me = group.member_preview.find((m) => m.email === currentUserEmail);
       setActivityData((prev) => [
         ...prev,
         { user_name: me?.name || "You", user_picture: me?.user_image, completed_date: new Date().toISOString().split("T")[0], days_ago: 0 },
@@ -131,9 +136,14 @@ export default function GroupCard({ group, currentUserEmail, onGroupDeleted }) {
                 {group.name}
               </h3>
               <div className="flex items-center gap-2 shrink-0">
+                {group.streak > 0 && (
+                  <span className="inline-flex items-center gap-0.5 text-[10px] font-semibold text-orange-500 bg-orange-500/10 rounded-full px-2 py-0.5" title="Your current streak">
+                    🔥 {group.streak}d
+                  </span>
+                )}
                 <span className="inline-flex items-center gap-1 text-[10px] text-[var(--text-muted)] bg-[var(--bg-secondary)] rounded-full px-2 py-0.5">
                   <svg className="w-3 h-3" fill="currentColor" viewBox="0 0 24 24"><path d="M16 11c1.66 0 2.99-1.34 2.99-3S17.66 5 16 5c-1.66 0-3 1.34-3 3s1.34 3 3 3zm-8 0c1.66 0 2.99-1.34 2.99-3S9.66 5 8 5C6.34 5 5 6.34 5 8s1.34 3 3 3zm0 2c-2.33 0-7 1.17-7 3.5V19h14v-2.5c0-2.33-4.67-3.5-7-3.5zm8 0c-.29 0-.62.02-.97.05 1.16.84 1.97 1.97 1.97 3.45V19h6v-2.5c0-2.33-4.67-3.5-7-3.5z"/></svg>
-                  {group.members.length}
+                  {group.member_count}
                 </span>
                 <span className="inline-flex items-center gap-0.5 text-[10px] text-[var(--text-muted)] bg-[var(--bg-secondary)] rounded-full px-2 py-0.5">
                   <svg className="w-3 h-3" fill="none" stroke="currentColor" strokeWidth={1.5} viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" d="M12 21a9.004 9.004 0 008.716-6.747M12 21a9.004 9.004 0 01-8.716-6.747M12 21c2.485 0 4.5-4.03 4.5-9S14.485 3 12 3m0 18c-2.485 0-4.5-4.03-4.5-9S9.515 3 12 3"/></svg>
@@ -153,6 +163,11 @@ export default function GroupCard({ group, currentUserEmail, onGroupDeleted }) {
             >
               <svg className="w-3.5 h-3.5" fill="none" stroke="currentColor" strokeWidth={2} viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" d="M8 12h.01M12 12h.01M16 12h.01M21 12c0 4.418-4.03 8-9 8a9.863 9.863 0 01-4.255-.949L3 20l1.395-3.72C3.512 15.042 3 13.574 3 12c0-4.418 4.03-8 9-8s9 3.582 9 8z"/></svg>
               Open Chat
+              {group.unread_count > 0 && (
+                <span className="ml-1 min-w-[1.25rem] px-1.5 py-0.5 rounded-full bg-[var(--accent)] text-white text-[10px] leading-none">
+                  {group.unread_count > 99 ? "99+" : group.unread_count}
+                </span>
+              )}
             </button>
           </div>
 
@@ -193,16 +208,16 @@ export default function GroupCard({ group, currentUserEmail, onGroupDeleted }) {
                       <svg className="w-3 h-3 shrink-0" fill="none" stroke="currentColor" strokeWidth={1.5} viewBox="0 0 24 24"><path strokeLinecap="round" strokeLinejoin="round" d="M12 21a9.004 9.004 0 008.716-6.747M12 21a9.004 9.004 0 01-8.716-6.747M12 21c2.485 0 4.5-4.03 4.5-9S14.485 3 12 3m0 18c-2.485 0-4.5-4.03-4.5-9S9.515 3 12 3"/></svg>
                       This group is public
                     </div>
-                    <p className="text-sm font-medium text-[var(--text-primary)]">👥 {group.members.length} members</p>
+                    <p className="text-sm font-medium text-[var(--text-primary)]">👥 {group.member_count} members</p>
                     <div className="space-y-1">
-                      {group.members.slice(0, 5).map((member) => (
+                      {group.member_preview.map((member) => (
                         <div key={member.email} className="flex items-center gap-2 py-0.5">
                           <img src={member.user_image || "https://via.placeholder.com/22"} alt={member.name} width={22} height={22} className="rounded-full object-cover shrink-0" />
                           <span className="text-sm text-[var(--text-secondary)] truncate">{member.name}</span>
                         </div>
                       ))}
-                      {group.members.length > 5 && (
-                        <p className="text-xs text-[var(--text-muted)] pl-8">+{group.members.length - 5} more</p>
+                      {group.member_count > group.member_preview.length && (
+                        <p className="text-xs text-[var(--text-muted)] pl-8">+{group.member_count - group.member_preview.length} more</p>
                       )}
                     </div>
 
@@ -279,13 +294,14 @@ function InlineChat({ groupId, onClose }) {
       try {
         const [pRes, gRes] = await Promise.all([
           fetch("/api/profile", { credentials: "include" }),
-          fetch("/api/groups/discover", { credentials: "include" }),
+          fetch(`/api/groups/${groupId}/members?limit=1`, { credentials: "include" }),
         ]);
         if (pRes.ok) { const d = await pRes.json(); setUserName(d.user.name); }
         if (gRes.ok) {
           const d = await gRes.json();
-          const g = d.groups.find((x) => x.id === groupId);
-          setGroupName(g ? g.name : `Group #${groupId}`);
+          setGroupName(d.group.name);
+        } else {
+          setGroupName(`Group #${groupId}`);
         }
       } catch (e) { console.error(e); }
     })();
@@ -296,7 +312,13 @@ function InlineChat({ groupId, onClose }) {
       setLoading(true);
       try {
         const res = await fetch(`/api/groups/${groupId}/messages`, { credentials: "include" });
-        if (res.ok) { const d = await res.json(); setMessages(d.messages || []); }
+        if (res.ok) {
+          const d = await res.json();
+          setMessages(d.messages || []);
+          // Without a message_id the server marks everything up to the newest message read
+          fetch(`/api/groups/${groupId}/read`, { method: "POST", credentials: "include" })
+            .catch((e) => console.error(e));
+        }
       } catch (e) { console.error(e); }
       setLoading(false);
     })();
@@ -310,12 +332,26 @@ function InlineChat({ groupId, onClose }) {
         return [...prev, data];
       });
     };
+    const onBatch = (data) => {
+      setMessages((prev) => {
+        const fresh = data.messages.filter((m) => !(m.id && prev.some((p) => p.id === m.id)));
+        return fresh.length ? [...prev, ...fresh] : prev;
+      });
+    };
+    const onPersisted = (data) => {
+      const ids = new Map(data.messages.map((p) => [p.temp_id, p.id]));
+      setMessages((prev) => prev.map((m) => (m.temp_id && ids.has(m.temp_id) ? { ...m, id: ids.get(m.temp_id) } : m)));
+    };
     const onDel = (data) => setMessages((prev) => prev.filter((m) => m.id !== data.message_id));
     socket.on("group_message", onMsg);
+    socket.on("group_messages", onBatch);
+    socket.on("messages_persisted", onPersisted);
     socket.on("message_deleted", onDel);
     return () => {
       socket.emit("leave_group", { group_id: groupId });
       socket.off("group_message", onMsg);
+      socket.off("group_messages", onBatch);
+      socket.off("messages_persisted", onPersisted);
       socket.off("message_deleted", onDel);
     };
   }, [groupId]);
@@ -6,7 +6,8 @@ import socket from "../utils/socket";
 import Link from "next/link";
 
 type Message = {
-  id?: number;
+  id?: number | null;
+  temp_id?: string;
   user: string;
   message: string;
   user_image?: string;
@@ -35,8 +36,14 @@ export default function GroupChat({ groupId, onClose, isFullPage = false }: Grou
   const [hoveredMsg, setHoveredMsg] = useState<number | null>(null);
   const [loading, setLoading] = useState(true);
   const [isConnected, setIsConnected] = useState(false);
+  // before_id for the next older page; null once the start of the history is loaded
+  const [olderCursor, setOlderCursor] = useState<number | null>(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
 
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const scrollAreaRef = useRef<HTMLDivElement>(null);
+  // Scroll height before older messages were prepended, so the view can stay put
+  const prependedFromRef = useRef<number | null>(null);
   const inputRef = useRef<HTMLInputElement>(null);
   const emojiRef = useRef<HTMLDivElement>(null);
   const pollingRef = useRef<ReturnType<typeof setInterval> | null>(null);
@@ -46,7 +53,15 @@ export default function GroupChat({ groupId, onClose, isFullPage = false }: Grou
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
   }, []);
 
-  useEffect(() => { scrollToBottom(); }, [messages, scrollToBottom]);
+  useEffect(() => {
+    const area = scrollAreaRef.current;
+    if (prependedFromRef.current !== null && area) {
+      area.scrollTop += area.scrollHeight - prependedFromRef.current;
+      prependedFromRef.current = null;
+      return;
+    }
+    scrollToBottom();
+  }, [messages, scrollToBottom]);
 
   useEffect(() => {
     const handleClickOutside = (e: MouseEvent) => {
@@ -61,17 +76,17 @@ export default function GroupChat({ groupId, onClose, isFullPage = false }: Grou
       try {
         const [profileRes, groupsRes] = await Promise.all([
           fetch("/api/profile", { credentials: "include" }),
-          fetch("/api/groups/discover", { credentials: "include" }),
+          fetch(`/api/groups/${groupId}/members?limit=1`, { credentials: "include" }),
         ]);
         if (profileRes.ok) {
           const profileData = await profileRes.json();
           setCurrentUserName(profileData.user.name);
         }
         if (groupsRes.ok) {
-          const groupsData = await groupsRes.json();
-          // eslint-disable-next-line @typescript-eslint/no-explicit-any
-          const group = groupsData.groups.find((g: any) => g.id === groupId);
-          setGroupName(group ? group.name : `Group #${groupId}`);
+          const groupData = await groupsRes.json();
+          setGroupName(groupData.group.name);
+        } else {
+          setGroupName(`Group #${groupId}`);
         }
       } catch (err) { console.error("Error fetching data:", err); }
     };
@@ -93,17 +108,32 @@ export default function GroupChat({ groupId, onClose, isFullPage = false }: Grou
         return [...prev, data];
       });
     };
+    const handleIncomingBatch = (data: { messages: Message[] }) => {
+      setMessages((prev) => {
+        const fresh = data.messages.filter((m) => !(m.id && prev.some((p) => p.id === m.id)));
+        return fresh.length ? [...prev, ...fresh] : prev;
+      });
+    };
+    // Write-behind mode: swap temporary ids for real ones once the batch is stored
+    const handleMessagesPersisted = (data: { messages: { temp_id: string; id: number }[] }) => {
+      const ids = new Map(data.messages.map((p) => [p.temp_id, p.id]));
+      setMessages((prev) => prev.map((m) => (m.temp_id && ids.has(m.temp_id) ? { ...m, id: ids.get(m.temp_id) } : m)));
+    };
     const handleMessageDeleted = (data: { message_id: number }) => {
       setMessages((prev) => prev.filter((m) => m.id !== data.message_id));
     };
 
     socket.emit("join_group", { group_id: groupId });
     socket.on("group_message", handleIncomingMessage);
+    socket.on("group_messages", handleIncomingBatch);
+    socket.on("messages_persisted", handleMessagesPersisted);
     socket.on("message_deleted", handleMessageDeleted);
 
     return () => {
       socket.emit("leave_group", { group_id: groupId });
       socket.off("group_message", handleIncomingMessage);
+      socket.off("group_messages", handleIncomingBatch);
+      socket.off("messages_persisted", handleMessagesPersisted);
       socket.off("message_deleted", handleMessageDeleted);
       socket.off("connect", handleConnect);
       socket.off("disconnect", handleDisconnect);
@@ -119,13 +149,17 @@ export default function GroupChat({ groupId, onClose, isFullPage = false }: Grou
         const data = await res.json();
         const incoming: Message[] = data.messages || [];
         setMessages((prev) => {
+          // The poll returns the newest page only; keep any older pages loaded by scrolling back
+          const oldestIncoming = incoming[0]?.id;
+          const older = oldestIncoming ? prev.filter((m) => m.id && m.id < oldestIncoming) : [];
+          const next = [...older, ...incoming];
           if (
-            incoming.length === prev.length &&
-            incoming.every((m, i) => m.id === prev[i]?.id && m.created_at === prev[i]?.created_at)
+            next.length === prev.length &&
+            next.every((m, i) => m.id === prev[i]?.id && m.created_at === prev[i]?.created_at)
           ) {
             return prev;
           }
-          return incoming;
+          return next;
         });
       } catch (err) { console.error("Polling error:", err); }
     };
@@ -145,13 +179,38 @@ export default function GroupChat({ groupId, onClose, isFullPage = false }: Grou
       try {
         setLoading(true);
         const res = await fetch(`/api/groups/${groupId}/messages`, { credentials: "include" });
-        if (res.ok) { const data = await res.json(); setMessages(data.messages || []); }
+        if (res.ok) {
+          const data = await res.json();
+          setMessages(data.messages || []);
+          setOlderCursor(data.next_cursor ?? null);
+          fetch(`/api/groups/${groupId}/read`, { method: "POST", credentials: "include" })
+            .catch((err) => console.error("Error marking chat read:", err));
+        }
       } catch (err) { console.error("Error fetching messages:", err); }
       finally { setLoading(false); }
     };
     fetchMessages();
   }, [groupId]);
 
+  const loadOlder = useCallback(async () => {
+    if (olderCursor === null || loadingOlder) return;
+    setLoadingOlder(true);
+    try {
+      const res = await fetch(`/api/groups/${groupId}/messages?before_id=${olderCursor}`, { credentials: "include" });
+      if (!res.ok) return;
+      const data = await res.json();
+      const older: Message[] = data.messages || [];
+      prependedFromRef.current = scrollAreaRef.current?.scrollHeight ?? null;
+      setMessages((prev) => [...older.filter((m) => !prev.some((p) => p.id === m.id)), ...prev]);
+      setOlderCursor(data.next_cursor ?? null);
+    } catch (err) { console.error("Error fetching older messages:", err); }
+    finally { setLoadingOlder(false); }
+  }, [groupId, olderCursor, loadingOlder]);
+
+  const handleScroll = () => {
+    if ((scrollAreaRef.current?.scrollTop ?? 1) < 40) loadOlder();
+  };
+
   const handleSend = async () => {
     const text = newMessage.trim();
     if (!text) return;
@@ -184,7 +243,7 @@ export default function GroupChat({ groupId, onClose, isFullPage = false }: Grou
     setNewMessage((prev) => prev + emoji); inputRef.current?.focus();
   };
 
-  const handleDeleteMessage = async (messageId: number | undefined) => {
+  const handleDeleteMessage = async (messageId: number | null | undefined) => {
     if (!messageId) return;
     if (!confirm("Delete this message?")) return;
     try {
@@ -252,8 +311,16 @@ export default function GroupChat({ groupId, onClose, isFullPage = false }: Grou
       </header>
 
       {/* Messages Area */}
-      <div className="flex-1 overflow-y-auto px-4 py-4 chat-wallpaper relative">
+      <div ref={scrollAreaRef} onScroll={handleScroll} className="flex-1 overflow-y-auto px-4 py-4 chat-wallpaper relative">
         <div className="relative z-10">
+          {!loading && olderCursor !== null && (
+            <div className="flex justify-center mb-2">
+              <button onClick={loadOlder} disabled={loadingOlder}
+                className="text-xs font-medium text-[var(--text-muted)] bg-white/80 backdrop-blur-sm px-3 py-1 rounded-full shadow-sm hover:text-[var(--primary-dark)] transition-colors">
+                {loadingOlder ? "Loading..." : "Load earlier messages"}
+              </button>
+            </div>
+          )}
           {loading ? (
             <div className="flex flex-col items-center justify-center h-64 gap-3">
               <div className="w-8 h-8 border-3 border-[var(--primary)] border-t-transparent rounded-full animate-spin" />
@@ -25,6 +25,7 @@ export default function LeaderboardComponent({ leaderboard }) { // Renamed to av
               <span style={styles.userName}>{user.user_name}</span>
               <span style={styles.completionCount}>
                 {user.completion_count} completions Viraj
+                {user.current_streak > 1 && ` · 🔥 ${user.current_streak}-day streak`}
               </span>
             </div>
           </li>
@@ -4,7 +4,11 @@ const api = axios.create({
   withCredentials: true, // To send cookies for session management
 });
 export const fetchProfile = () => api.get("/profile");
-export const fetchGroups = () => api.get("/groups/discover");
+export const fetchGroups = (params) => api.get("/groups/discover", { params });
+export const searchGroups = (q, params) =>
+  api.get("/groups/search", { params: { q, ...params } });
+export const fetchGroupMembers = (groupId, params) =>
+  api.get(`/groups/${groupId}/members`, { params });
 export const createGroup = (data) => api.post("/groups/create", data);
 export const joinGroup = (groupId) => api.post(`/groups/${groupId}/join`);
 export const sendMessage = (groupId, message) =>
@@ -12,8 +16,8 @@ export const sendMessage = (groupId, message) =>
 export const fetchMessages = (groupId) => api.get(`/groups/${groupId}/messages`);
 export const completeDailyTask = (groupId) =>
   api.post(`/groups/${groupId}/complete`);
-export const fetchLeaderboard = (groupId) =>
-  api.get(`/groups/${groupId}/leaderboard`);
+export const fetchLeaderboard = (groupId, params = {}) =>
+  api.get(`/groups/${groupId}/leaderboard`, { params });
 export const fetchActivityFeed = (groupId) =>
   api.get(`/groups/${groupId}/activity`);
 export const checkHabitCompletion = (groupId) =>
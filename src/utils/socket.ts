@@ -1,10 +1,12 @@
 import { io, Socket } from "socket.io-client";
 
 const SOCKET_URL = process.env.NEXT_PUBLIC_SOCKET_URL || "";
+// Multi-worker backends without sticky sessions need websocket-only transport
+const WEBSOCKET_ONLY = process.env.NEXT_PUBLIC_SOCKET_WEBSOCKET_ONLY === "1";
 
 const socket: Socket = io(SOCKET_URL, {
   withCredentials: true,
-  transports: ["polling", "websocket"],
+  transports: WEBSOCKET_ONLY ? ["websocket"] : ["polling", "websocket"],
   reconnectionAttempts: 10,
   reconnectionDelay: 2000,
   reconnectionDelayMax: 10000,
@@ -0,0 +1,53 @@
+# conftest.py
+#
+# Every test gets the app against a fresh SQLite database, empty process-local caches
+# and a `login(client, user)` helper that writes the session the way the OAuth callback does.
+# No app context is left active between requests (views cache the caller on flask.g);
+# tests that touch the database directly open one.
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ["SESSION_BACKEND"] = "cookie"
+
+import pytest
+
+from backend import cache
+from backend.app import app as flask_app
+from backend.extensions import db
+from backend.models import User
+from backend.search import ensure_search_index
+
+
+@pytest.fixture
+def app():
+    with flask_app.app_context():
+        for table in ("messages_fts", "groups_fts"):
+            db.session.execute(db.text(f"DROP TABLE IF EXISTS {table}"))
+        db.session.commit()
+        db.drop_all()
+        db.create_all()
+        ensure_search_index()
+    for registered in cache._registry:
+        if hasattr(registered, "clear"):
+            registered.clear()
+    yield flask_app
+
+
+@pytest.fixture
+def make_user(app):
+    def make(name):
+        with app.app_context():
+            user = User(name=name, email=f"{name.lower()}@example.com")
+            db.session.add(user)
+            db.session.commit()
+            db.session.refresh(user)
+            db.session.expunge(user)
+        return user
+    return make
+
+
+def login(client, user):
+    with client.session_transaction() as s:
+        s["user"] = {"id": user.id, "name": user.name, "email": user.email, "picture": None}
+    return client
@@ -0,0 +1,27 @@
+from backend import memberships
+from backend.views import ADMIN_PASSWORD
+from conftest import login
+
+
+def _create_group(client, name):
+    assert client.post("/api/groups/create", json={"name": name, "description": "d"}).status_code in (200, 201)
+    return client.get("/api/groups/discover").get_json()["groups"][-1]["id"]
+
+
+def test_bulk_join_failure_rolls_back_and_returns_json(app, make_user, monkeypatch):
+    owner = login(app.test_client(), make_user("Owner"))
+    group_id = _create_group(owner, "Runners")
+    # Every pre-check passes, so both insert attempts hit the unique constraint the way
+    # a concurrent join would.
+    monkeypatch.setattr(memberships, "_check_join", lambda pair, groups, members: None)
+
+    response = app.test_client().post(
+        "/api/admin/memberships/bulk-join",
+        headers={"X-Admin-Password": ADMIN_PASSWORD},
+        json={"memberships": [{"user_id": 1, "group_id": group_id}]},
+    )
+
+    assert response.status_code == 500
+    assert response.get_json() == {"error": "An error occurred while joining the groups."}
+    # The session was rolled back: the endpoint keeps serving.
+    assert owner.get(f"/api/groups/{group_id}/leaderboard").status_code == 200
@@ -0,0 +1,25 @@
+from datetime import datetime, timedelta
+
+from conftest import login
+
+from backend.archive import archive_messages
+from backend.extensions import db
+from backend.models import Message, MessageArchive
+
+
+def test_archived_messages_stay_searchable(app, make_user):
+    owner = login(app.test_client(), make_user("Owner"))
+    owner.post("/api/groups/create", json={"name": "Chat", "description": "d"})
+    for text in ("m1 from last year", "m2 from today"):
+        assert owner.post("/api/groups/1/send-message", json={"message": text}).status_code == 200
+    with app.app_context():
+        old = Message.query.filter(Message.content.startswith("m1")).one()
+        old.created_at = datetime.utcnow() - timedelta(days=400)
+        db.session.commit()
+        assert archive_messages(older_than_days=90) == 1
+        assert MessageArchive.query.count() == 1
+
+    results = owner.get("/api/groups/1/messages/search", query_string={"q": "m1"}).get_json()["results"]
+    assert [r["message"] for r in results] == ["m1 from last year"]
+    results = owner.get("/api/groups/1/messages/search", query_string={"q": "from"}).get_json()["results"]
+    assert sorted(r["message"] for r in results) == ["m1 from last year", "m2 from today"]
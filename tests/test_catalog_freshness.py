@@ -0,0 +1,54 @@
+# A write made on another worker commits and bumps the catalog version, but cannot clear
+# this worker's local catalog copy. Views must still see it straight away.
+from conftest import login
+
+from backend import changes
+from backend.catalog import get_catalog
+from backend.changes import record_change
+from backend.extensions import db
+from backend.models import Group, GroupMember
+from backend.search import index_group
+
+
+def _create_group_elsewhere(app, user, name):
+    with app.app_context():
+        get_catalog()  # this worker's copy, from before the write
+        group = Group(name=name, description="from another worker", creator_id=user.id)
+        db.session.add(group)
+        db.session.flush()
+        db.session.add(GroupMember(user_id=user.id, group_id=group.id))
+        index_group(group)
+        record_change(group.id, changes.MEMBER_JOINED, user_id=user.id)
+        db.session.commit()
+        return group.id
+
+
+def test_leaderboard_and_completion_see_new_group(app, make_user):
+    user = make_user("Owner")
+    client = login(app.test_client(), user)
+    group_id = _create_group_elsewhere(app, user, "Swimmers")
+
+    assert client.get(f"/api/groups/{group_id}/leaderboard").status_code == 200
+    response = client.post(f"/api/groups/{group_id}/complete")
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Activity recorded successfully for Swimmers"
+
+
+def test_dashboard_lists_group_created_on_another_worker(app, make_user):
+    user = make_user("Owner")
+    client = login(app.test_client(), user)
+    client.get("/api/me/dashboard")
+    group_id = _create_group_elsewhere(app, user, "Cyclists")
+
+    groups = client.get("/api/me/dashboard").get_json()["groups"]
+    assert [g["id"] for g in groups] == [group_id]
+
+
+def test_group_search_finds_group_created_on_another_worker(app, make_user):
+    user = make_user("Owner")
+    client = login(app.test_client(), user)
+    client.get("/api/groups/search", query_string={"q": "climbers"})
+    group_id = _create_group_elsewhere(app, user, "Climbers")
+
+    results = client.get("/api/groups/search", query_string={"q": "climbers"}).get_json()["results"]
+    assert [r["id"] for r in results] == [group_id]
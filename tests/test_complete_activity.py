@@ -0,0 +1,24 @@
+from backend import views
+from conftest import login
+
+
+def _create_group(client, name):
+    assert client.post("/api/groups/create", json={"name": name, "description": "d"}).status_code in (200, 201)
+    return client.get("/api/groups/discover").get_json()["groups"][-1]["id"]
+
+
+def _no_catalog(*args, **kwargs):
+    raise AssertionError("the completion path must not read the catalog")
+
+
+def test_completion_does_not_read_the_catalog(app, make_user, monkeypatch):
+    owner = login(app.test_client(), make_user("Owner"))
+    outsider = login(app.test_client(), make_user("Outsider"))
+    group_id = _create_group(owner, "Runners")
+    monkeypatch.setattr(views, "get_catalog", _no_catalog)
+
+    response = owner.post(f"/api/groups/{group_id}/complete")
+    assert response.status_code == 200
+    assert response.get_json()["message"] == "Activity recorded successfully for Runners"
+    assert outsider.post(f"/api/groups/{group_id}/complete").status_code == 403
+    assert outsider.post(f"/api/groups/{group_id + 1}/complete").status_code == 404
@@ -0,0 +1,20 @@
+from conftest import login
+
+
+def _create_group(client, name):
+    assert client.post("/api/groups/create", json={"name": name, "description": "d"}).status_code in (200, 201)
+    return client.get("/api/groups/discover").get_json()["groups"][-1]["id"]
+
+
+def test_dashboard_rank_matches_leaderboard_on_ties(app, make_user):
+    owner = login(app.test_client(), make_user("Owner"))
+    member = login(app.test_client(), make_user("Member"))
+    group_id = _create_group(owner, "Runners")
+    assert member.post(f"/api/groups/{group_id}/join").status_code == 200
+    for client in (owner, member):
+        assert client.post(f"/api/groups/{group_id}/complete").status_code == 200
+
+    leaderboard = member.get(f"/api/groups/{group_id}/leaderboard").get_json()
+    [dashboard] = member.get("/api/me/dashboard").get_json()["groups"]
+    assert leaderboard["me"]["rank"] == 2
+    assert dashboard["rank"] == leaderboard["me"]["rank"]
@@ -0,0 +1,20 @@
+from backend import views
+from conftest import login
+
+
+def _create_group(client, name):
+    assert client.post("/api/groups/create", json={"name": name, "description": "d"}).status_code in (200, 201)
+    return client.get("/api/groups/discover").get_json()["groups"][-1]["id"]
+
+
+def _no_catalog(*args, **kwargs):
+    raise AssertionError("the leaderboard must not read the catalog")
+
+
+def test_leaderboard_checks_the_group_without_the_catalog(app, make_user, monkeypatch):
+    owner = login(app.test_client(), make_user("Owner"))
+    group_id = _create_group(owner, "Runners")
+    monkeypatch.setattr(views, "get_catalog", _no_catalog)
+
+    assert owner.get(f"/api/groups/{group_id}/leaderboard").status_code == 200
+    assert owner.get(f"/api/groups/{group_id + 1}/leaderboard").status_code == 404
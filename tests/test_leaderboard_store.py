@@ -0,0 +1,39 @@
+from datetime import date
+
+from backend import leaderboard_store as store_module
+from backend.leaderboard_store import Details, LocalLeaderboardStore, leaderboard_page
+
+DETAILS = Details(date(2026, 3, 1), 1, 1, date(2026, 3, 1))
+
+
+def test_load_raced_by_increment_is_not_installed(monkeypatch):
+    store = LocalLeaderboardStore()
+    monkeypatch.setattr(store_module, "leaderboard_store", store)
+    stale = [(1, 3, DETAILS), (2, 2, DETAILS)]
+
+    def rows_then_completion(group_ids):
+        # The completion commits after the rows were read, while the group is not loaded yet.
+        assert store.increment(7, 2, DETAILS) is False
+        return {7: list(stale)}
+
+    monkeypatch.setattr(store_module, "_stats_rows", rows_then_completion)
+    assert leaderboard_page(7, 1) is None  # the caller reads the database instead
+    assert store.page(7, 1) is None
+
+    monkeypatch.setattr(store_module, "_stats_rows", lambda group_ids: {7: [(1, 3, DETAILS), (2, 3, DETAILS)]})
+    total, standings, me = leaderboard_page(7, 2)
+    assert total == 2
+    assert [(s.user_id, s.completion_count) for s in standings] == [(1, 3), (2, 3)]
+    assert me.rank == 2
+
+
+def test_invalidate_cancels_a_load():
+    store = LocalLeaderboardStore()
+    token = store.start_load(7)
+    store.invalidate([7])
+    assert store.finish_load(7, token, [(1, 1, DETAILS)]) is False
+    assert store.page(7, 1) is None
+
+    token = store.start_load(7)
+    assert store.finish_load(7, token, [(1, 1, DETAILS)]) is True
+    assert store.page(7, 1)[0] == 1
@@ -0,0 +1,40 @@
+from backend.message_buffer import BufferedMessage, RecentMessageBuffer, recent_messages
+from conftest import login
+
+
+def _create_group(client, name):
+    assert client.post("/api/groups/create", json={"name": name, "description": "d"}).status_code in (200, 201)
+    return client.get("/api/groups/discover").get_json()["groups"][-1]["id"]
+
+
+def _messages(client, group_id):
+    response = client.get(f"/api/groups/{group_id}/messages")
+    assert response.status_code == 200
+    return [m["message"] for m in response.get_json()["messages"]]
+
+
+def test_send_keeps_buffer_current(app, make_user):
+    owner = login(app.test_client(), make_user("Owner"))
+    group_id = _create_group(owner, "Runners")
+    assert _messages(owner, group_id) == []
+
+    misses = recent_messages.misses
+    assert owner.post(f"/api/groups/{group_id}/send-message", json={"message": "hi"}).status_code in (200, 201)
+    assert _messages(owner, group_id) == ["hi"]
+    assert recent_messages.misses == misses
+
+
+def _message(mid, group_id=1):
+    return BufferedMessage(mid, group_id, 1, f"m{mid}", None)
+
+
+def test_append_that_skips_a_version_drops_the_buffer():
+    buffer = RecentMessageBuffer(capacity=5, ttl=0)
+    buffer.newest(1, 5, lambda n: [_message(1)], version=3)
+
+    buffer.append(_message(2), version=4)
+    buffer.append(_message(3), version=4)  # same transaction as message 2
+    assert buffer.newest(1, 5, lambda n: [], version=4) == ([_message(1), _message(2), _message(3)], False)
+
+    buffer.append(_message(4), version=6)  # version 5 was written elsewhere
+    assert buffer.newest(1, 5, lambda n: [_message(5)], version=6) == ([_message(5)], False)
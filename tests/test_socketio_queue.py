@@ -0,0 +1,12 @@
+from backend.socketio_instance import LocalPubSubManager, message_queue_options
+
+
+def test_local_queue_is_built_once_per_process(monkeypatch):
+    monkeypatch.setenv("SOCKETIO_MESSAGE_QUEUE", "local://")
+    monkeypatch.setenv("SOCKETIO_CHANNEL", "test-once")
+
+    first = message_queue_options()["client_manager"]
+    second = message_queue_options()["client_manager"]
+
+    assert first is second
+    assert LocalPubSubManager._subscribers["test-once"] == [first._queue]
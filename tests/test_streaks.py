@@ -0,0 +1,75 @@
+from datetime import date, timedelta
+
+from backend.extensions import db
+from backend.member_stats import record_completion
+from backend.models import Group, GroupMemberStats, UserActivity
+from backend.streaks import recompute_streaks, streak_runs
+
+D = date(2026, 3, 1)
+
+
+def day(n):
+    return D + timedelta(days=n)
+
+
+def test_streak_runs():
+    assert streak_runs([]) == (0, None, 0)
+    assert streak_runs([day(0), day(1), day(2)]) == (3, day(0), 3)
+    # A gap restarts the current run but keeps the longest one.
+    assert streak_runs([day(0), day(1), day(2), day(5), day(6)]) == (2, day(5), 3)
+    # Duplicates count once.
+    assert streak_runs([day(0), day(0), day(1), day(1)]) == (2, day(0), 2)
+    # A backdated day that closes the gap joins both runs.
+    assert streak_runs([day(0), day(1), day(2), day(3), day(4), day(5)]) == (6, day(0), 6)
+
+
+def _stats(group_id, user_id):
+    row = db.session.execute(
+        db.select(GroupMemberStats.current_streak, GroupMemberStats.longest_streak, GroupMemberStats.streak_start)
+        .where(GroupMemberStats.group_id == group_id, GroupMemberStats.user_id == user_id)
+    ).one()
+    return tuple(row)
+
+
+def _group(app, make_user):
+    user = make_user("Owner")
+    with app.app_context():
+        group = Group(name="Runners", description="d", creator_id=user.id)
+        db.session.add(group)
+        db.session.commit()
+        return group.id, user.id
+
+
+def test_streak_update_values(app, make_user):
+    group_id, user_id = _group(app, make_user)
+    with app.app_context():
+        record_completion(group_id, user_id, day(0))
+        record_completion(group_id, user_id, day(1))
+        assert _stats(group_id, user_id) == (2, 2, day(0))
+
+        # The same day again does not extend the run.
+        record_completion(group_id, user_id, day(1))
+        assert _stats(group_id, user_id) == (2, 2, day(0))
+
+        # A gap restarts it; the longest run is kept.
+        record_completion(group_id, user_id, day(3))
+        assert _stats(group_id, user_id) == (1, 2, day(3))
+
+
+def _complete(group_id, user_id, completed_date):
+    db.session.add(UserActivity(group_id=group_id, user_id=user_id, completed_date=completed_date))
+    record_completion(group_id, user_id, completed_date)
+
+
+def test_recompute_streaks_after_backdated_completion(app, make_user):
+    group_id, user_id = _group(app, make_user)
+    with app.app_context():
+        for n in (0, 1, 3, 4):
+            _complete(group_id, user_id, day(n))
+        assert _stats(group_id, user_id) == (2, 2, day(3))
+
+        # Backfilling day 2 closes the gap; the in-place update leaves it to recompute_streaks.
+        _complete(group_id, user_id, day(2))
+        assert _stats(group_id, user_id) == (2, 2, day(3))
+        assert recompute_streaks(pairs=[(group_id, user_id)]) == 1
+        assert _stats(group_id, user_id) == (5, 5, day(0))
@@ -0,0 +1,40 @@
+from conftest import login
+
+
+def _sync(client, token):
+    response = client.get("/api/sync", query_string={"since": token})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def _token(client):
+    return client.get("/api/sync").get_json()["token"]
+
+
+def _create_group(client, name):
+    assert client.post("/api/groups/create", json={"name": name, "description": "d"}).status_code in (200, 201)
+    return client.get("/api/groups/discover").get_json()["groups"][-1]["id"]
+
+
+def test_member_sees_group_deleted_by_creator(app, make_user):
+    owner = login(app.test_client(), make_user("Owner"))
+    member = login(app.test_client(), make_user("Member"))
+    group_id = _create_group(owner, "Runners")
+    assert member.post(f"/api/groups/{group_id}/join").status_code == 200
+
+    token = _token(member)
+    assert owner.delete(f"/api/groups/{group_id}/delete").status_code == 200
+
+    assert _sync(member, token)["deleted_group_ids"] == [group_id]
+    assert _sync(owner, token)["deleted_group_ids"] == [group_id]
+
+
+def test_deleted_group_is_not_reported_to_outsiders(app, make_user):
+    owner = login(app.test_client(), make_user("Owner"))
+    outsider = login(app.test_client(), make_user("Outsider"))
+    group_id = _create_group(owner, "Readers")
+
+    token = _token(outsider)
+    assert owner.delete(f"/api/groups/{group_id}/delete").status_code == 200
+
+    assert _sync(outsider, token)["deleted_group_ids"] == []
@@ -0,0 +1,28 @@
+import logging
+from datetime import datetime
+
+from backend.extensions import db
+from backend.models import Message
+from backend.write_behind import message_writer
+
+
+def _item(user, content, temp_id):
+    return {"group_id": 1, "user_id": user.id, "content": content,
+            "created_at": datetime.utcnow(), "temp_id": temp_id}
+
+
+def test_bad_row_is_dropped_without_holding_back_the_batch(app, make_user, monkeypatch, caplog):
+    user = make_user("Writer")
+    monkeypatch.setattr(message_writer, "app", app)
+    monkeypatch.setattr(message_writer, "_pending", [])
+    # content is NOT NULL, so the middle row makes the whole batch fail; far fewer rows than max_pending
+    for temp_id, content in (("t1", "first"), ("t2", None), ("t3", "last")):
+        message_writer._pending.append(_item(user, content, temp_id))
+
+    with caplog.at_level(logging.ERROR, logger="backend.write_behind"):
+        message_writer.flush()
+
+    with app.app_context():
+        assert [m.content for m in Message.query.order_by(Message.id).all()] == ["first", "last"]
+    assert message_writer.pending_count() == 0
+    assert "dropped 1 of 3 messages" in caplog.text